@@ -11,16 +11,23 @@ Usage::
         amiga.ping()
 """
 
+import collections
+import itertools
 import os
+import select
 import socket
-from typing import Callable, Dict, List, Optional, Tuple, Type
+import stat
+from typing import (
+    BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Type,
+    Union,
+)
 
 from .protocol import (
-    BinaryTransferError, ENCODING, ProtocolError, ServerError,
-    TraceStreamReader, _parse_trace_event,
-    read_binary_response,
-    read_exec_response, read_line, read_response, recv_exact, send_command,
-    send_data_chunks,
+    BinaryTransferError, BufferedSocket, ConnectionLostError, ENCODING,
+    ProtocolError, ServerError, TraceStreamReader, _parse_trace_event,
+    cork, iter_payload, read_binary_response, read_binary_response_into,
+    read_exec_response, read_line, read_response, read_status, recv_exact,
+    send_command, send_data_chunks, send_data_stream,
 )
 
 
@@ -29,6 +36,7 @@ __all__ = [
     "AmigactlError",
     "BinaryTransferError",
     "CommandSyntaxError",
+    "ConnectionLostError",
     "NotFoundError",
     "PermissionDeniedError",
     "AlreadyExistsError",
@@ -252,6 +260,90 @@ def read_one_trace_event(sock):
             "Unexpected line during TRACE: {!r}".format(line))
 
 
+# ---------------------------------------------------------------------------
+# Command building
+# ---------------------------------------------------------------------------
+
+def _prefix_command(prefix: str,
+                    command: Union[str, bytes]) -> Union[str, bytes]:
+    """Prepend a protocol verb prefix to a user command.
+
+    Bytes commands stay bytes so callers that pre-encoded the command
+    (the CLI does) avoid a str round-trip before it hits the wire.
+    """
+    if isinstance(command, bytes):
+        return prefix.encode(ENCODING) + command
+    return prefix + command
+
+
+# ---------------------------------------------------------------------------
+# Socket options
+# ---------------------------------------------------------------------------
+
+# TCP keepalive tuning: first probe after 60s idle, then every 15s, give
+# up after 4 unanswered probes.  Long-lived shell sessions otherwise sit
+# on a connection that a NAT or the Amiga's stack dropped silently.
+_KEEPALIVE_IDLE = 60
+_KEEPALIVE_INTERVAL = 15
+_KEEPALIVE_COUNT = 4
+
+
+def _enable_keepalive(sock: socket.socket) -> None:
+    """Enable TCP keepalive on *sock*, tuning timers where supported.
+
+    Best-effort: platforms lacking an option (or refusing it) keep
+    their defaults.
+    """
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    except OSError:
+        return
+    for name, value in (("TCP_KEEPIDLE", _KEEPALIVE_IDLE),
+                        ("TCP_KEEPINTVL", _KEEPALIVE_INTERVAL),
+                        ("TCP_KEEPCNT", _KEEPALIVE_COUNT)):
+        opt = getattr(socket, name, None)
+        if opt is None:
+            continue
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, opt, value)
+        except OSError:
+            pass
+
+
+# Socket buffer sizes requested for each connection.  Large DATA transfers
+# keep more bytes in flight; the kernel clamps these to its own limits.
+_SOCKET_SNDBUF = 4 << 20
+_SOCKET_RCVBUF = 4 << 20
+
+
+def _tune_socket(sock: socket.socket, sndbuf: int = _SOCKET_SNDBUF,
+                 rcvbuf: int = _SOCKET_RCVBUF) -> None:
+    """Apply the client's socket option policy to *sock*.
+
+    Call before connect() so the receive buffer size is reflected in the
+    window scale negotiated during the handshake.  Sets:
+
+    - SO_SNDBUF / SO_RCVBUF to *sndbuf* / *rcvbuf* bytes.
+    - TCP_NODELAY, so short command lines are not held back by Nagle's
+      algorithm while an earlier segment awaits its ACK.
+    - TCP_QUICKACK where available (Linux), so response lines are ACKed
+      without the delayed-ACK timer.  The kernel may clear it again.
+
+    Best-effort: options the platform lacks or refuses are skipped.
+    """
+    for level, opt, value in (
+            (socket.SOL_SOCKET, socket.SO_SNDBUF, sndbuf),
+            (socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf),
+            (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+            (socket.IPPROTO_TCP, getattr(socket, "TCP_QUICKACK", None), 1)):
+        if opt is None:
+            continue
+        try:
+            sock.setsockopt(level, opt, value)
+        except OSError:
+            pass
+
+
 # ---------------------------------------------------------------------------
 # Connection class
 # ---------------------------------------------------------------------------
@@ -283,7 +375,7 @@ class AmigaConnection:
         self.host = host
         self.port = port
         self.timeout = timeout
-        self._sock = None  # type: Optional[socket.socket]
+        self._sock = None  # type: Optional[BufferedSocket]
         self._banner = None  # type: Optional[str]
 
     # -- Context manager ---------------------------------------------------
@@ -307,12 +399,14 @@ class AmigaConnection:
         """Open TCP connection, set timeout, read and validate banner."""
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         sock.settimeout(self.timeout)
+        _tune_socket(sock)
         try:
             sock.connect((self.host, self.port))
         except Exception:
             sock.close()
             raise
-        self._sock = sock
+        _enable_keepalive(sock)
+        self._sock = BufferedSocket(sock)
 
         # Read banner line (single line, no sentinel)
         banner = read_line(self._sock)
@@ -340,6 +434,24 @@ class AmigaConnection:
             pass
         self._sock = None
 
+    def peer_closed(self) -> bool:
+        """Check, without sending anything, whether the daemon hung up.
+
+        Only meaningful between commands: an idle connection has nothing
+        to read, so a readable socket means EOF or a reset is pending.
+        Returns True if not connected.  A silently dropped connection
+        (no FIN or RST received) is not detected.
+        """
+        if self._sock is None:
+            return True
+        sock = self._sock.sock
+        try:
+            if not select.select([sock], [], [], 0)[0]:
+                return False
+            return not sock.recv(1, socket.MSG_PEEK)
+        except (OSError, ValueError):
+            return True
+
     @property
     def banner(self) -> Optional[str]:
         """The banner string received on connect, or None if not connected."""
@@ -347,7 +459,8 @@ class AmigaConnection:
 
     # -- Internal helpers --------------------------------------------------
 
-    def _send_command(self, cmd: str) -> Tuple[str, List[str]]:
+    def _send_command(self,
+                      cmd: Union[str, bytes]) -> Tuple[str, List[str]]:
         """Send a command and read the response.
 
         Returns (info, payload_lines) on OK.  Raises the appropriate
@@ -362,6 +475,33 @@ class AmigaConnection:
             _raise_for_error(info)
         return (info, payload)
 
+    def _send_commands(self, cmds: List[str],
+                       ) -> List[Union[Tuple[str, List[str]], AmigactlError]]:
+        """Send independent commands back to back, then read each response.
+
+        All of cmds go out before any response is read, so the batch
+        costs one round trip instead of len(cmds).  Returns one entry per
+        command, in order: (info, payload_lines) on OK, or the
+        AmigactlError subclass instance for an ERR.  Raises ProtocolError
+        on framing violations.
+        """
+        if self._sock is None:
+            raise ProtocolError("Not connected")
+        with cork(self._sock) as s:
+            for cmd in cmds:
+                send_command(s, cmd)
+        results = []  # type: List[Union[Tuple[str, List[str]], AmigactlError]]
+        for _ in cmds:
+            status, info, payload = read_response(self._sock)
+            if status == "ERR":
+                try:
+                    _raise_for_error(info)
+                except AmigactlError as e:
+                    results.append(e)
+            else:
+                results.append((info, payload))
+        return results
+
     # -- Commands ----------------------------------------------------------
 
     def version(self) -> str:
@@ -448,31 +588,55 @@ class AmigaConnection:
         Returns a list of dicts with keys: type (str, "FILE" or "DIR"),
         name (str), size (int), protection (8-digit hex str), datestamp
         (str, "YYYY-MM-DD HH:MM:SS" in local Amiga time).
+
+        A recursive listing is a single DIR ... RECURSIVE request; the
+        daemon walks the tree and names are relative to path.
         """
+        return list(self.iter_dir(path, recursive=recursive))
+
+    def iter_dir(self, path: str,
+                 recursive: bool = False) -> Iterator[dict]:
+        """Yield directory entries as they arrive from the daemon.
+
+        Same entries as dir(), but parsed one payload line at a time so
+        large recursive listings can be printed without buffering the
+        whole tree.  Abandoning the iterator early drains the rest of
+        the response to keep the connection in sync.
+        """
+        if self._sock is None:
+            raise ProtocolError("Not connected")
         cmd = "DIR {}".format(path)
         if recursive:
             cmd += " RECURSIVE"
-        info, payload = self._send_command(cmd)
-        entries = []
-        for line in payload:
-            parts = line.split("\t")
-            if len(parts) != 5:
-                raise ProtocolError(
-                    "DIR entry has {} fields, expected 5: {!r}".format(
-                        len(parts), line))
-            try:
-                size = int(parts[2])
-            except ValueError:
-                raise ProtocolError(
-                    "DIR entry has non-numeric size: {!r}".format(line))
-            entries.append({
-                "type": parts[0],
-                "name": parts[1],
-                "size": size,
-                "protection": parts[3],
-                "datestamp": parts[4],
-            })
-        return entries
+        send_command(self._sock, cmd)
+        status, info = read_status(self._sock)
+        lines = iter_payload(self._sock)
+        if status == "ERR":
+            for _line in lines:
+                pass
+            _raise_for_error(info)
+        try:
+            for line in lines:
+                parts = line.split("\t")
+                if len(parts) != 5:
+                    raise ProtocolError(
+                        "DIR entry has {} fields, expected 5: {!r}".format(
+                            len(parts), line))
+                try:
+                    size = int(parts[2])
+                except ValueError:
+                    raise ProtocolError(
+                        "DIR entry has non-numeric size: {!r}".format(line))
+                yield {
+                    "type": parts[0],
+                    "name": parts[1],
+                    "size": size,
+                    "protection": parts[3],
+                    "datestamp": parts[4],
+                }
+        finally:
+            for _line in lines:
+                pass
 
     def stat(self, path: str) -> dict:
         """Get file/directory metadata.
@@ -482,6 +646,11 @@ class AmigaConnection:
         Amiga time), comment (str, may be empty).
         """
         info, payload = self._send_command("STAT {}".format(path))
+        return self._parse_stat(payload)
+
+    @staticmethod
+    def _parse_stat(payload: List[str]) -> dict:
+        """Build the stat() dict from STAT payload lines."""
         result = {}
         for line in payload:
             key, _, value = line.partition("=")
@@ -494,13 +663,11 @@ class AmigaConnection:
                     "STAT has non-numeric size: {!r}".format(result["size"]))
         return result
 
-    def read(self, path: str, offset: Optional[int] = None, length: Optional[int] = None) -> bytes:
-        """Download a file (or partial file).
-
-        Returns the file contents as bytes.
+    def _start_read(self, path: str, offset: Optional[int],
+                    length: Optional[int]) -> str:
+        """Send READ and consume its status line.
 
-        offset: Start reading at this byte offset (default: 0).
-        length: Read at most this many bytes (default: entire file).
+        Returns the OK info field (the declared byte count, unparsed).
         """
         if self._sock is None:
             raise ProtocolError("Not connected")
@@ -510,6 +677,13 @@ class AmigaConnection:
         if length is not None:
             cmd += " LENGTH {}".format(length)
         send_command(self._sock, cmd)
+        return self._read_read_status()
+
+    def _read_read_status(self) -> str:
+        """Consume the status line of a READ already sent.
+
+        Returns the OK info field (the declared byte count, unparsed).
+        """
         status_line = read_line(self._sock)
         if status_line == "ERR" or status_line.startswith("ERR "):
             # Read sentinel and raise
@@ -518,35 +692,138 @@ class AmigaConnection:
         if not status_line.startswith("OK"):
             raise ProtocolError(
                 "Expected OK, got: {!r}".format(status_line))
+        return status_line[3:].strip()
 
-        info = status_line[3:].strip()
-        try:
-            data = read_binary_response(self._sock)
-        except BinaryTransferError as e:
-            _raise_for_error(e.err_info)
-            raise  # unreachable; _raise_for_error always raises
-
+    @staticmethod
+    def _check_read_size(info: str, received: int) -> None:
+        """Validate the READ OK byte count against what was received."""
         try:
             declared_size = int(info)
         except ValueError:
             raise ProtocolError(
                 "READ OK line missing numeric size: {!r}".format(info))
-        if len(data) != declared_size:
+        if received != declared_size:
             raise ProtocolError(
                 "Size mismatch: server declared {} bytes but sent {}".format(
-                    declared_size, len(data)))
+                    declared_size, received))
+
+    def read(self, path: str, offset: Optional[int] = None, length: Optional[int] = None) -> bytes:
+        """Download a file (or partial file).
+
+        Returns the file contents as bytes.
+
+        offset: Start reading at this byte offset (default: 0).
+        length: Read at most this many bytes (default: entire file).
+        """
+        return self._finish_read(self._start_read(path, offset, length))
+
+    def _finish_read(self, info: str) -> bytes:
+        """Receive the data of a READ whose status line gave info."""
+        try:
+            data = read_binary_response(self._sock)
+        except BinaryTransferError as e:
+            _raise_for_error(e.err_info)
+            raise  # unreachable; _raise_for_error always raises
+        self._check_read_size(info, len(data))
         return data
 
-    def write(self, path: str, data: bytes) -> int:
-        """Upload a file.
+    def read_many(self, paths: Iterable[str], window: int = 8,
+                  ) -> Iterator[Tuple[str, Union[bytes, AmigactlError]]]:
+        """Download several files, keeping up to window READs in flight.
+
+        Yields (path, result) in the order of paths, where result is the
+        file contents, or the AmigactlError (e.g. NotFoundError) raised
+        for that file.  Later requests are already queued at the daemon
+        while each result is being consumed, so the round trips overlap
+        instead of adding up.  Protocol and connection errors propagate;
+        if READs were still in flight the connection is closed, as their
+        replies cannot be recovered.  Closing the iterator early drains
+        the READs still in flight.
+        """
+        if self._sock is None:
+            raise ProtocolError("Not connected")
+        paths = iter(paths)
+        pending = collections.deque()
 
-        data must be bytes. The file is written atomically on the Amiga.
-        Returns the number of bytes written.
+        def send(count):
+            with cork(self._sock) as s:
+                for path in itertools.islice(paths, count):
+                    send_command(s, "READ {}".format(path))
+                    pending.append(path)
+
+        send(window)
+        try:
+            while pending:
+                path = pending.popleft()
+                try:
+                    result = self._finish_read(self._read_read_status())
+                except AmigactlError as e:
+                    result = e
+                send(1)
+                yield path, result
+        except GeneratorExit:
+            # Consume the responses still owed so the stream stays in sync
+            while pending:
+                pending.popleft()
+                try:
+                    self._finish_read(self._read_read_status())
+                except AmigactlError:
+                    pass
+            raise
+        except ProtocolError:
+            if pending:
+                # The replies still owed can no longer be located in the
+                # stream, so the connection cannot be used again
+                try:
+                    self._sock.close()
+                except OSError:
+                    pass
+                self._sock = None
+            raise
+
+    def read_with_stat(self, path: str) -> Tuple[dict, bytes]:
+        """Fetch a file's metadata and contents in one round trip.
+
+        Sends STAT and READ back to back and then reads both responses,
+        saving a round trip over stat() followed by read().  Returns
+        (stat_dict, data) with stat_dict as returned by stat().  Raises
+        like read() -- NotFoundError if the file does not exist.
         """
         if self._sock is None:
             raise ProtocolError("Not connected")
-        send_command(self._sock,
-                     "WRITE {} {}".format(path, len(data)))
+        with cork(self._sock) as s:
+            send_command(s, "STAT {}".format(path))
+            send_command(s, "READ {}".format(path))
+        status, stat_info, payload = read_response(self._sock)
+        # Always consume the READ response so the stream stays in sync
+        data = self._finish_read(self._read_read_status())
+        if status == "ERR":
+            _raise_for_error(stat_info)
+        return self._parse_stat(payload), data
+
+    def read_stream(self, path: str, fileobj: BinaryIO,
+                    offset: Optional[int] = None,
+                    length: Optional[int] = None) -> int:
+        """Download a file (or partial file) into a writable binary file.
+
+        Like read(), but each chunk is written to fileobj as it arrives,
+        so memory use stays bounded by one chunk.  Returns the number of
+        bytes written.  On error, fileobj may hold a partial download.
+        """
+        info = self._start_read(path, offset, length)
+        try:
+            received = read_binary_response_into(self._sock, fileobj.write)
+        except BinaryTransferError as e:
+            _raise_for_error(e.err_info)
+            raise  # unreachable; _raise_for_error always raises
+        self._check_read_size(info, received)
+        return received
+
+    def _start_upload(self, verb: str, path: str, size: int) -> None:
+        """Send WRITE/APPEND with the byte count and wait for READY."""
+        if self._sock is None:
+            raise ProtocolError("Not connected")
+        send_command(self._sock, "{} {} {}".format(verb, path, size))
 
         # Read READY or ERR
         line = read_line(self._sock)
@@ -557,21 +834,64 @@ class AmigaConnection:
             raise ProtocolError(
                 "Expected READY, got: {!r}".format(line))
 
-        # Send DATA chunks + END
-        send_data_chunks(self._sock, data)
-
-        # Read final response
+    def _finish_upload(self, verb: str) -> int:
+        """Read the final WRITE/APPEND response; return the byte count."""
         status, info, payload = read_response(self._sock)
         if status == "ERR":
             _raise_for_error(info)
         stripped = info.strip()
         if not stripped:
-            raise ProtocolError("WRITE OK line missing byte count")
+            raise ProtocolError("{} OK line missing byte count".format(verb))
         try:
             return int(stripped)
         except ValueError:
             raise ProtocolError(
-                "WRITE OK line missing numeric size: {!r}".format(info))
+                "{} OK line missing numeric size: {!r}".format(verb, info))
+
+    def _upload_stream(self, verb: str, path: str, fileobj: BinaryIO,
+                       size: Optional[int]) -> int:
+        """Upload from a binary file object via WRITE or APPEND.
+
+        fileobj is read in blocks.  A pipe or other non-regular file
+        with no size given is read to EOF first, since its length can't
+        be known upfront.
+        """
+        if size is None:
+            try:
+                is_file = stat.S_ISREG(os.fstat(fileobj.fileno()).st_mode)
+            except (AttributeError, OSError, ValueError):
+                is_file = False
+            if not is_file:
+                data = fileobj.read()
+                self._start_upload(verb, path, len(data))
+                send_data_chunks(self._sock, data)
+                return self._finish_upload(verb)
+            size = os.fstat(fileobj.fileno()).st_size - fileobj.tell()
+        self._start_upload(verb, path, size)
+        send_data_stream(self._sock, fileobj, size)
+        return self._finish_upload(verb)
+
+    def write(self, path: str, data: bytes) -> int:
+        """Upload a file.
+
+        data must be bytes. The file is written atomically on the Amiga.
+        Returns the number of bytes written.
+        """
+        self._start_upload("WRITE", path, len(data))
+        send_data_chunks(self._sock, data)
+        return self._finish_upload("WRITE")
+
+    def write_stream(self, path: str, fileobj: BinaryIO,
+                     size: Optional[int] = None) -> int:
+        """Upload a file from a readable binary file object.
+
+        Like write(), but reads fileobj in blocks while sending, so the
+        whole file is never held in memory.  size defaults to the bytes
+        remaining in a regular file; anything else (a pipe, say) is read
+        to EOF first when size is not given.
+        Returns the number of bytes written.
+        """
+        return self._upload_stream("WRITE", path, fileobj, size)
 
     def append(self, path: str, data: bytes) -> int:
         """Append data to an existing file on the Amiga.
@@ -579,35 +899,18 @@ class AmigaConnection:
         data must be bytes. The file must already exist.
         Returns the number of bytes appended.
         """
-        if self._sock is None:
-            raise ProtocolError("Not connected")
-        send_command(self._sock,
-                     "APPEND {} {}".format(path, len(data)))
-
-        # Read READY or ERR
-        line = read_line(self._sock)
-        if line == "ERR" or line.startswith("ERR "):
-            read_line(self._sock)  # sentinel
-            _raise_for_error(line[4:])
-        if line != "READY":
-            raise ProtocolError(
-                "Expected READY, got: {!r}".format(line))
-
-        # Send DATA chunks + END
+        self._start_upload("APPEND", path, len(data))
         send_data_chunks(self._sock, data)
+        return self._finish_upload("APPEND")
 
-        # Read final response
-        status, info, payload = read_response(self._sock)
-        if status == "ERR":
-            _raise_for_error(info)
-        stripped = info.strip()
-        if not stripped:
-            raise ProtocolError("APPEND OK line missing byte count")
-        try:
-            return int(stripped)
-        except ValueError:
-            raise ProtocolError(
-                "APPEND OK line missing numeric size: {!r}".format(info))
+    def append_stream(self, path: str, fileobj: BinaryIO,
+                      size: Optional[int] = None) -> int:
+        """Append from a readable binary file object to an existing file.
+
+        Streaming counterpart of append(); see write_stream().
+        Returns the number of bytes appended.
+        """
+        return self._upload_stream("APPEND", path, fileobj, size)
 
     def delete(self, path: str) -> None:
         """Delete a file or empty directory."""
@@ -694,7 +997,7 @@ class AmigaConnection:
 
     # -- Execution and process management ----------------------------------
 
-    def execute(self, command: str,
+    def execute(self, command: Union[str, bytes],
                 timeout: Optional[int] = None,
                 cd: Optional[str] = None) -> Tuple[int, str]:
         """Execute a CLI command synchronously.
@@ -702,6 +1005,8 @@ class AmigaConnection:
         Returns (rc, output) where rc is the AmigaOS return code (int)
         and output is the captured stdout decoded from ISO-8859-1.
 
+        command may be str or ISO-8859-1 encoded bytes.
+
         If timeout is specified, sets the socket timeout for this command
         (restores the original timeout afterward).
 
@@ -710,10 +1015,10 @@ class AmigaConnection:
         if self._sock is None:
             raise ProtocolError("Not connected")
 
-        cmd = "EXEC "
+        prefix = "EXEC "
         if cd is not None:
-            cmd += "CD={} ".format(cd)
-        cmd += command
+            prefix += "CD={} ".format(cd)
+        cmd = _prefix_command(prefix, command)
 
         if timeout is not None:
             old_timeout = self._sock.gettimeout()
@@ -735,16 +1040,17 @@ class AmigaConnection:
         output = data.decode(ENCODING)
         return (rc, output)
 
-    def execute_async(self, command: str,
+    def execute_async(self, command: Union[str, bytes],
                       cd: Optional[str] = None) -> int:
         """Launch a command asynchronously.
 
-        Returns the daemon-assigned process ID (int).
+        Returns the daemon-assigned process ID (int).  command may be
+        str or ISO-8859-1 encoded bytes.
         """
-        cmd = "EXEC ASYNC "
+        prefix = "EXEC ASYNC "
         if cd is not None:
-            cmd += "CD={} ".format(cd)
-        cmd += command
+            prefix += "CD={} ".format(cd)
+        cmd = _prefix_command(prefix, command)
 
         info, _payload = self._send_command(cmd)
         try:
@@ -829,6 +1135,29 @@ class AmigaConnection:
         """Force-terminate a tracked process."""
         self._send_command("KILL {}".format(proc_id))
 
+    def signal_many(self, proc_ids: List[int], sig: str = "CTRL_C",
+                    ) -> List[Optional[AmigactlError]]:
+        """Send a break signal to several tracked processes at once.
+
+        Returns one entry per ID, in order: None if the signal was sent,
+        otherwise the error for that ID (e.g. NotFoundError).
+        """
+        suffix = "" if sig == "CTRL_C" else " {}".format(sig)
+        results = self._send_commands(
+            ["SIGNAL {}{}".format(proc_id, suffix) for proc_id in proc_ids])
+        return [r if isinstance(r, AmigactlError) else None
+                for r in results]
+
+    def kill_many(self, proc_ids: List[int]) -> List[Optional[AmigactlError]]:
+        """Force-terminate several tracked processes at once.
+
+        Returns one entry per ID, in order, as for signal_many().
+        """
+        results = self._send_commands(
+            ["KILL {}".format(proc_id) for proc_id in proc_ids])
+        return [r if isinstance(r, AmigactlError) else None
+                for r in results]
+
     # -- System information ------------------------------------------------
 
     def sysinfo(self) -> dict:
@@ -1118,13 +1447,14 @@ class AmigaConnection:
 
     # -- ARexx and file streaming ------------------------------------------
 
-    def arexx(self, port: str, command: str,
+    def arexx(self, port: str, command: Union[str, bytes],
               timeout: int = 35) -> Tuple[int, str]:
         """Send an ARexx command to a named port.
 
         Returns (rc, result_string) where rc is the ARexx return code
         (0=success) and result_string is the RESULT string decoded from
-        ISO-8859-1 (empty if the target returned no result).
+        ISO-8859-1 (empty if the target returned no result).  command
+        may be str or ISO-8859-1 encoded bytes.
 
         The daemon has a 30-second timeout for ARexx replies.  The
         default socket timeout of 35 seconds gives the daemon time to
@@ -1133,7 +1463,7 @@ class AmigaConnection:
         if self._sock is None:
             raise ProtocolError("Not connected")
 
-        cmd = "AREXX {} {}".format(port, command)
+        cmd = _prefix_command("AREXX {} ".format(port), command)
 
         old_timeout = self._sock.gettimeout()
         self._sock.settimeout(timeout)
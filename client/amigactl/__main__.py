@@ -7,12 +7,55 @@ Usage::
     amigactl shutdown
 """
 
-import argparse
-import configparser
 import os
 import sys
 
 from . import AmigaConnection, AmigactlError, NotFoundError, ProtocolError
+from .protocol import ENCODING
+
+
+# Prebound row formatters for the tab-separated listings.
+_ROW2 = "{}\t{}\n".format
+_ROW4 = "{}\t{}\t{}\t{}\n".format
+_ROW5 = "{}\t{}\t{}\t{}\t{}\n".format
+
+# Rows per encoded block in _write_rows().  Big enough that encode and
+# write overhead is amortised, small enough that streaming listings
+# still appear promptly and memory stays bounded.
+_ROW_BATCH = 512
+
+
+def _join_batches(rows, size=_ROW_BATCH):
+    """Yield *rows* concatenated into strings of at most *size* rows."""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield "".join(batch)
+            batch = []
+    if batch:
+        yield "".join(batch)
+
+
+def _write_rows(rows):
+    """Write an iterable of newline-terminated text rows to stdout.
+
+    Rows are joined into blocks, each block is encoded once, and the
+    blocks go to a single ``writelines`` call on the binary buffer, so
+    large listings take the stdout lock once instead of once per
+    ``print``.
+    """
+    out = sys.stdout
+    buf = getattr(out, "buffer", None)
+    if buf is None:
+        out.writelines(_join_batches(rows))
+        return
+    encoding = out.encoding or "utf-8"
+    errors = out.errors or "strict"
+    out.flush()
+    buf.writelines(block.encode(encoding, errors)
+                   for block in _join_batches(rows))
+    buf.flush()
 
 
 def cmd_version(conn, args):
@@ -68,11 +111,10 @@ def cmd_uptime(conn, args):
 
 def cmd_ls(conn, args):
     """Handle the 'ls' subcommand."""
-    entries = conn.dir(args.path, recursive=args.recursive)
-    for entry in entries:
-        print("{}\t{}\t{}\t{}\t{}".format(
-            entry["type"], entry["name"], entry["size"],
-            entry["protection"], entry["datestamp"]))
+    entries = conn.iter_dir(args.path, recursive=args.recursive)
+    _write_rows(_ROW5(
+        entry["type"], entry["name"], entry["size"],
+        entry["protection"], entry["datestamp"]) for entry in entries)
 
 
 def cmd_stat(conn, args):
@@ -83,15 +125,45 @@ def cmd_stat(conn, args):
             print("{}={}".format(key, info[key]))
 
 
+class _FdWriter:
+    """Minimal binary file-like object writing straight to a descriptor.
+
+    Bypasses the BufferedWriter layer (its internal copy and lock) for
+    bulk binary output such as 'cat' of a large file.
+    """
+
+    def __init__(self, fd):
+        self.fd = fd
+
+    def write(self, data):
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self.fd, view):]
+        return len(data)
+
+
+def _binary_stdout():
+    """Return a writable for raw bytes on stdout.
+
+    Uses the file descriptor directly when stdout has one, otherwise
+    (e.g. stdout replaced by an in-memory stream) its binary buffer.
+    """
+    try:
+        fd = sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        return sys.stdout.buffer
+    sys.stdout.flush()
+    return _FdWriter(fd)
+
+
 def cmd_cat(conn, args):
     """Handle the 'cat' subcommand."""
-    data = conn.read(args.path, offset=args.offset, length=args.length)
-    sys.stdout.buffer.write(data)
+    conn.read_stream(args.path, _binary_stdout(),
+                     offset=args.offset, length=args.length)
 
 
 def cmd_get(conn, args):
     """Handle the 'get' subcommand."""
-    data = conn.read(args.remote, offset=args.offset, length=args.length)
     local = args.local
     if local is None:
         # Extract basename from Amiga path
@@ -100,18 +172,18 @@ def cmd_get(conn, args):
         name = name.rsplit(":", 1)[-1] if ":" in name else name
         local = name or args.remote.rstrip(":/")  # volume root fallback
     with open(local, "wb") as f:
-        f.write(data)
-    print("Downloaded {} bytes to {}".format(len(data), local))
+        received = conn.read_stream(args.remote, f, offset=args.offset,
+                                    length=args.length)
+    print("Downloaded {} bytes to {}".format(received, local))
 
 
 def cmd_put(conn, args):
     """Handle the 'put' subcommand."""
-    with open(args.local, "rb") as f:
-        data = f.read()
     remote = args.remote
     if remote is None:
         remote = os.path.basename(args.local)
-    written = conn.write(remote, data)
+    with open(args.local, "rb") as f:
+        written = conn.write_stream(remote, f)
     print("Uploaded {} bytes to {}".format(written, remote))
 
 
@@ -148,7 +220,7 @@ def cmd_exec(conn, args):
     if not parts:
         print("Error: no command specified", file=sys.stderr)
         sys.exit(1)
-    command = " ".join(parts)
+    command = b" ".join(p.encode(ENCODING) for p in parts)
     rc, output = conn.execute(command, timeout=args.timeout, cd=args.C)
     if output:
         sys.stdout.write(output)
@@ -164,7 +236,7 @@ def cmd_run(conn, args):
     if not parts:
         print("Error: no command specified", file=sys.stderr)
         sys.exit(1)
-    command = " ".join(parts)
+    command = b" ".join(p.encode(ENCODING) for p in parts)
     proc_id = conn.execute_async(command, cd=args.C)
     print(proc_id)
 
@@ -174,11 +246,11 @@ def cmd_ps(conn, args):
     procs = conn.proclist()
     if not procs:
         return
-    print("{}\t{}\t{}\t{}".format("ID", "COMMAND", "STATUS", "RC"))
+    rows = [_ROW4("ID", "COMMAND", "STATUS", "RC")]
     for p in procs:
         rc_str = str(p["rc"]) if p["rc"] is not None else "-"
-        print("{}\t{}\t{}\t{}".format(
-            p["id"], p["command"], p["status"], rc_str))
+        rows.append(_ROW4(p["id"], p["command"], p["status"], rc_str))
+    _write_rows(rows)
 
 
 def cmd_status(conn, args):
@@ -214,8 +286,7 @@ def cmd_sysinfo(conn, args):
 def cmd_assigns(conn, args):
     """Handle the 'assigns' subcommand."""
     assigns = conn.assigns()
-    for name, path in assigns.items():
-        print("{}\t{}".format(name, path))
+    _write_rows(_ROW2(name, path) for name, path in assigns.items())
 
 
 def cmd_assign(conn, args):
@@ -244,12 +315,11 @@ def cmd_volumes(conn, args):
     vols = conn.volumes()
     if not vols:
         return
-    print("{}\t{}\t{}\t{}\t{}".format(
-        "NAME", "USED", "FREE", "CAPACITY", "BLOCKSIZE"))
-    for v in vols:
-        print("{}\t{}\t{}\t{}\t{}".format(
-            v["name"], v["used"], v["free"],
-            v["capacity"], v["blocksize"]))
+    rows = [_ROW5("NAME", "USED", "FREE", "CAPACITY", "BLOCKSIZE")]
+    rows.extend(_ROW5(
+        v["name"], v["used"], v["free"],
+        v["capacity"], v["blocksize"]) for v in vols)
+    _write_rows(rows)
 
 
 def cmd_tasks(conn, args):
@@ -257,12 +327,11 @@ def cmd_tasks(conn, args):
     tasks = conn.tasks()
     if not tasks:
         return
-    print("{}\t{}\t{}\t{}\t{}".format(
-        "NAME", "TYPE", "PRI", "STATE", "STACK"))
-    for t in tasks:
-        print("{}\t{}\t{}\t{}\t{}".format(
-            t["name"], t["type"], t["priority"],
-            t["state"], t["stacksize"]))
+    rows = [_ROW5("NAME", "TYPE", "PRI", "STATE", "STACK")]
+    rows.extend(_ROW5(
+        t["name"], t["type"], t["priority"],
+        t["state"], t["stacksize"]) for t in tasks)
+    _write_rows(rows)
 
 
 def cmd_touch(conn, args):
@@ -300,7 +369,7 @@ def cmd_arexx(conn, args):
     if not parts:
         print("Error: no command specified", file=sys.stderr)
         sys.exit(1)
-    command = " ".join(parts)
+    command = b" ".join(p.encode(ENCODING) for p in parts)
     rc, result = conn.arexx(args.rexx_port, command)
     if result:
         print(result)
@@ -486,8 +555,7 @@ def cmd_cp(conn, args):
 def cmd_append(conn, args):
     """Handle the 'append' subcommand."""
     with open(args.local, "rb") as f:
-        data = f.read()
-    written = conn.append(args.remote, data)
+        written = conn.append_stream(args.remote, f)
     print("Appended {} bytes to {}".format(written, args.remote))
 
 
@@ -532,9 +600,9 @@ def cmd_devices(conn, args):
     devs = conn.devices()
     if not devs:
         return
-    print("{}\t{}".format("NAME", "VERSION"))
-    for d in devs:
-        print("{}\t{}".format(d["name"], d["version"]))
+    rows = [_ROW2("NAME", "VERSION")]
+    rows.extend(_ROW2(d["name"], d["version"]) for d in devs)
+    _write_rows(rows)
 
 
 def cmd_capabilities(conn, args):
@@ -544,6 +612,46 @@ def cmd_capabilities(conn, args):
         print("{}={}".format(key, value))
 
 
+def _run_batch(conn, parser, script):
+    """Run CLI subcommand lines from *script* over one connection.
+
+    Each non-blank, non-comment line is split shell-style and parsed
+    with the already-built *parser*, so neither the parser nor the TCP
+    connection is rebuilt per command.  Processing stops at the first
+    failing line (handlers exit, errors propagate to main()).
+    """
+    import shlex
+
+    f = sys.stdin if script == "-" else open(script, "r")
+    try:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                argv = shlex.split(line)
+            except ValueError as e:
+                print("Error: {}: {}".format(e, line), file=sys.stderr)
+                sys.exit(1)
+            args = parser.parse_args(argv)
+            if (args.host is not None or args.port is not None
+                    or args.config is not None):
+                # The connection is already open; these would be ignored
+                print("Error: --host, --port and --config cannot be used "
+                      "in a batch: {}".format(line), file=sys.stderr)
+                sys.exit(1)
+            func = getattr(args, "func", None)
+            if func is None:
+                print("Error: '{}' cannot be used in a batch".format(
+                    args.command or ""), file=sys.stderr)
+                sys.exit(1)
+            func(conn, args)
+            sys.stdout.flush()
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
 def _default_config_path(host=None, port=None):
     """Return the path to amigactl.conf in the client directory.
 
@@ -599,6 +707,8 @@ def _load_config(path, explicit):
             sys.exit(1)
         return {}
 
+    import configparser
+
     config = configparser.ConfigParser()
     try:
         config.read(path)
@@ -641,75 +751,61 @@ def _load_config(path, explicit):
     return result
 
 
-def main() -> None:
-    """Parse arguments and dispatch to the appropriate subcommand."""
-    DEFAULT_HOST = "192.168.6.200"
-    DEFAULT_PORT = 6800
+def _register_version(subparsers):
+    """Register the 'version' subcommand parser."""
+    p_version = subparsers.add_parser("version", help="Print daemon version")
+    p_version.set_defaults(func=cmd_version)
 
-    # --- Pre-parse: resolve env vars for help string defaults ---
-    env_host = os.environ.get("AMIGACTL_HOST") or None
-    env_port_str = os.environ.get("AMIGACTL_PORT")
-    env_port = None
-    if env_port_str:
-        try:
-            env_port = int(env_port_str)
-        except ValueError:
-            print(
-                "Error: AMIGACTL_PORT must be an integer, got: {!r}".format(
-                    env_port_str
-                ),
-                file=sys.stderr,
-            )
-            sys.exit(1)
 
-    parser = argparse.ArgumentParser(
-        prog="amigactl",
-        description="Amiga remote access client",
-    )
-    parser.add_argument(
-        "--host",
-        default=None,
-        help="Daemon hostname or IP (default: {})".format(
-            env_host if env_host is not None else DEFAULT_HOST),
-    )
-    parser.add_argument(
-        "--port",
-        type=int,
-        default=None,
-        help="Daemon port (default: {})".format(
-            env_port if env_port is not None else DEFAULT_PORT),
-    )
-    parser.add_argument(
-        "--config",
-        default=None,
-        metavar="PATH",
-        help="Path to config file (default: client/amigactl.conf)",
-    )
+def _register_ping(subparsers):
+    """Register the 'ping' subcommand parser."""
+    p_ping = subparsers.add_parser("ping", help="Ping the daemon")
+    p_ping.set_defaults(func=cmd_ping)
+
+
+def _register_shutdown(subparsers):
+    """Register the 'shutdown' subcommand parser."""
+    p_shutdown = subparsers.add_parser("shutdown", help="Shut down the daemon (sends SHUTDOWN CONFIRM)")
+    p_shutdown.set_defaults(func=cmd_shutdown)
 
-    subparsers = parser.add_subparsers(dest="command")
-    subparsers.required = False
 
-    subparsers.add_parser("version", help="Print daemon version")
-    subparsers.add_parser("ping", help="Ping the daemon")
-    subparsers.add_parser("shutdown", help="Shut down the daemon (sends SHUTDOWN CONFIRM)")
-    subparsers.add_parser("reboot", help="Reboot the Amiga (sends REBOOT CONFIRM)")
+def _register_reboot(subparsers):
+    """Register the 'reboot' subcommand parser."""
+    p_reboot = subparsers.add_parser("reboot", help="Reboot the Amiga (sends REBOOT CONFIRM)")
+    p_reboot.set_defaults(func=cmd_reboot)
 
+
+def _register_ls(subparsers):
+    """Register the 'ls' subcommand parser."""
     p_ls = subparsers.add_parser("ls", help="List directory contents")
+    p_ls.set_defaults(func=cmd_ls)
     p_ls.add_argument("path", help="Amiga path to list")
     p_ls.add_argument("-r", "--recursive", action="store_true",
                       help="Recurse into subdirectories")
 
+
+def _register_stat(subparsers):
+    """Register the 'stat' subcommand parser."""
     p_stat = subparsers.add_parser("stat", help="Show file/directory metadata")
+    p_stat.set_defaults(func=cmd_stat)
     p_stat.add_argument("path", help="Amiga path")
 
+
+def _register_cat(subparsers):
+    """Register the 'cat' subcommand parser."""
     p_cat = subparsers.add_parser("cat", help="Print file contents to stdout")
+    p_cat.set_defaults(func=cmd_cat)
     p_cat.add_argument("path", help="Amiga file path")
     p_cat.add_argument("--offset", type=int, default=None,
                        help="Start reading at byte offset")
     p_cat.add_argument("--length", type=int, default=None,
                        help="Read at most this many bytes")
 
+
+def _register_get(subparsers):
+    """Register the 'get' subcommand parser."""
     p_get = subparsers.add_parser("get", help="Download a file")
+    p_get.set_defaults(func=cmd_get)
     p_get.add_argument("remote", help="Amiga file path")
     p_get.add_argument("local", nargs="?", default=None,
                        help="Local file path (default: same name in "
@@ -719,25 +815,45 @@ def main() -> None:
     p_get.add_argument("--length", type=int, default=None,
                        help="Read at most this many bytes")
 
+
+def _register_put(subparsers):
+    """Register the 'put' subcommand parser."""
     p_put = subparsers.add_parser("put", help="Upload a file")
+    p_put.set_defaults(func=cmd_put)
     p_put.add_argument("local", help="Local file path")
     p_put.add_argument("remote", nargs="?", default=None,
                        help="Amiga file path (default: same name in "
                             "current Amiga directory)")
 
+
+def _register_append(subparsers):
+    """Register the 'append' subcommand parser."""
     p_append = subparsers.add_parser("append",
                                       help="Append local file to remote file")
+    p_append.set_defaults(func=cmd_append)
     p_append.add_argument("local", help="Local file to append")
     p_append.add_argument("remote", help="Amiga file to append to")
 
+
+def _register_rm(subparsers):
+    """Register the 'rm' subcommand parser."""
     p_rm = subparsers.add_parser("rm", help="Delete a file or empty directory")
+    p_rm.set_defaults(func=cmd_rm)
     p_rm.add_argument("path", help="Amiga path")
 
+
+def _register_mv(subparsers):
+    """Register the 'mv' subcommand parser."""
     p_mv = subparsers.add_parser("mv", help="Rename/move a file or directory")
+    p_mv.set_defaults(func=cmd_mv)
     p_mv.add_argument("old", help="Current Amiga path")
     p_mv.add_argument("new", help="New Amiga path")
 
+
+def _register_cp(subparsers):
+    """Register the 'cp' subcommand parser."""
     p_cp = subparsers.add_parser("cp", help="Copy a file on the Amiga")
+    p_cp.set_defaults(func=cmd_cp)
     p_cp.add_argument("source", help="Source Amiga path")
     p_cp.add_argument("dest", help="Destination Amiga path")
     p_cp.add_argument("-P", "--no-clone", action="store_true",
@@ -745,24 +861,46 @@ def main() -> None:
     p_cp.add_argument("-n", "--no-replace", action="store_true",
                       help="Fail if destination already exists")
 
+
+def _register_mkdir(subparsers):
+    """Register the 'mkdir' subcommand parser."""
     p_mkdir = subparsers.add_parser("mkdir", help="Create a directory")
+    p_mkdir.set_defaults(func=cmd_mkdir)
     p_mkdir.add_argument("path", help="Amiga path")
 
+
+def _register_chmod(subparsers):
+    """Register the 'chmod' subcommand parser."""
     p_chmod = subparsers.add_parser("chmod", help="Get or set protection bits")
+    p_chmod.set_defaults(func=cmd_chmod)
     p_chmod.add_argument("path", help="Amiga path")
     p_chmod.add_argument("value", nargs="?", default=None,
                          help="Hex protection value to set (omit to get)")
 
+
+def _register_checksum(subparsers):
+    """Register the 'checksum' subcommand parser."""
     p_checksum = subparsers.add_parser("checksum",
                                         help="Compute CRC32 checksum of a file")
+    p_checksum.set_defaults(func=cmd_checksum)
     p_checksum.add_argument("path", help="Amiga file path")
 
+
+def _register_setcomment(subparsers):
+    """Register the 'setcomment' subcommand parser."""
     p_setcomment = subparsers.add_parser("setcomment",
                                           help="Set file comment")
+    p_setcomment.set_defaults(func=cmd_setcomment)
     p_setcomment.add_argument("path", help="Amiga file path")
     p_setcomment.add_argument("comment", help="Comment string (use '' to clear)")
 
+
+def _register_exec(subparsers):
+    """Register the 'exec' subcommand parser."""
+    import argparse
+
     p_exec = subparsers.add_parser("exec", help="Execute a CLI command")
+    p_exec.set_defaults(func=cmd_exec)
     p_exec.add_argument("-C", metavar="DIR", default=None,
                         help="Working directory for the command")
     p_exec.add_argument("--timeout", type=int, default=None, metavar="SECS",
@@ -770,52 +908,98 @@ def main() -> None:
     p_exec.add_argument("cmd", nargs=argparse.REMAINDER,
                         help="Command to execute (use -- before flags)")
 
+
+def _register_run(subparsers):
+    """Register the 'run' subcommand parser."""
+    import argparse
+
     p_run = subparsers.add_parser("run",
                                   help="Launch a command asynchronously")
+    p_run.set_defaults(func=cmd_run)
     p_run.add_argument("-C", metavar="DIR", default=None,
                        help="Working directory for the command")
     p_run.add_argument("cmd", nargs=argparse.REMAINDER,
                        help="Command to launch (use -- before flags)")
 
-    subparsers.add_parser("ps", help="List daemon-launched processes")
 
+def _register_ps(subparsers):
+    """Register the 'ps' subcommand parser."""
+    p_ps = subparsers.add_parser("ps", help="List daemon-launched processes")
+    p_ps.set_defaults(func=cmd_ps)
+
+
+def _register_status(subparsers):
+    """Register the 'status' subcommand parser."""
     p_status = subparsers.add_parser("status",
                                      help="Get status of a tracked process")
+    p_status.set_defaults(func=cmd_status)
     p_status.add_argument("id", type=int, help="Process ID")
 
+
+def _register_signal(subparsers):
+    """Register the 'signal' subcommand parser."""
     p_signal = subparsers.add_parser("signal",
                                      help="Send break signal to a process")
+    p_signal.set_defaults(func=cmd_signal)
     p_signal.add_argument("id", type=int, help="Process ID")
     p_signal.add_argument("sig", nargs="?", default="CTRL_C",
                           help="Signal name (default: CTRL_C)")
 
+
+def _register_kill(subparsers):
+    """Register the 'kill' subcommand parser."""
     p_kill = subparsers.add_parser("kill",
                                    help="Force-terminate a tracked process")
+    p_kill.set_defaults(func=cmd_kill)
     p_kill.add_argument("id", type=int, help="Process ID")
 
-    subparsers.add_parser("sysinfo", help="Show system information")
 
+def _register_sysinfo(subparsers):
+    """Register the 'sysinfo' subcommand parser."""
+    p_sysinfo = subparsers.add_parser("sysinfo", help="Show system information")
+    p_sysinfo.set_defaults(func=cmd_sysinfo)
+
+
+def _register_libver(subparsers):
+    """Register the 'libver' subcommand parser."""
     p_libver = subparsers.add_parser("libver",
                                       help="Get library or device version")
+    p_libver.set_defaults(func=cmd_libver)
     p_libver.add_argument("name",
                            help="Library or device name (e.g. exec.library)")
 
+
+def _register_env(subparsers):
+    """Register the 'env' subcommand parser."""
     p_env = subparsers.add_parser("env",
                                    help="Get an environment variable")
+    p_env.set_defaults(func=cmd_env)
     p_env.add_argument("name", help="Variable name")
 
+
+def _register_setenv(subparsers):
+    """Register the 'setenv' subcommand parser."""
     p_setenv = subparsers.add_parser("setenv",
                                       help="Set or delete an environment variable")
+    p_setenv.set_defaults(func=cmd_setenv)
     p_setenv.add_argument("-v", "--volatile", action="store_true",
                           help="Volatile only (not persisted to ENVARC:)")
     p_setenv.add_argument("name", help="Variable name")
     p_setenv.add_argument("value", nargs="?", default=None,
                            help="Value to set (omit to delete)")
 
-    subparsers.add_parser("assigns", help="List logical assigns")
 
+def _register_assigns(subparsers):
+    """Register the 'assigns' subcommand parser."""
+    p_assigns = subparsers.add_parser("assigns", help="List logical assigns")
+    p_assigns.set_defaults(func=cmd_assigns)
+
+
+def _register_assign(subparsers):
+    """Register the 'assign' subcommand parser."""
     p_assign = subparsers.add_parser("assign",
                                       help="Create, modify, or remove an assign")
+    p_assign.set_defaults(func=cmd_assign)
     mode_group = p_assign.add_mutually_exclusive_group()
     mode_group.add_argument("--late", action="store_true",
                             help="Late-binding assign (path resolved on access)")
@@ -825,32 +1009,81 @@ def main() -> None:
     p_assign.add_argument("path", nargs="?", default=None,
                           help="Target path (omit to remove the assign)")
 
-    subparsers.add_parser("ports", help="List active Exec message ports")
-    subparsers.add_parser("volumes", help="List mounted volumes")
-    subparsers.add_parser("tasks", help="List running tasks/processes")
-    subparsers.add_parser("devices", help="List Exec devices")
-    subparsers.add_parser("capabilities",
-                           help="Show daemon capabilities")
-    subparsers.add_parser("uptime", help="Show daemon uptime")
 
+def _register_ports(subparsers):
+    """Register the 'ports' subcommand parser."""
+    p_ports = subparsers.add_parser("ports", help="List active Exec message ports")
+    p_ports.set_defaults(func=cmd_ports)
+
+
+def _register_volumes(subparsers):
+    """Register the 'volumes' subcommand parser."""
+    p_volumes = subparsers.add_parser("volumes", help="List mounted volumes")
+    p_volumes.set_defaults(func=cmd_volumes)
+
+
+def _register_tasks(subparsers):
+    """Register the 'tasks' subcommand parser."""
+    p_tasks = subparsers.add_parser("tasks", help="List running tasks/processes")
+    p_tasks.set_defaults(func=cmd_tasks)
+
+
+def _register_devices(subparsers):
+    """Register the 'devices' subcommand parser."""
+    p_devices = subparsers.add_parser("devices", help="List Exec devices")
+    p_devices.set_defaults(func=cmd_devices)
+
+
+def _register_capabilities(subparsers):
+    """Register the 'capabilities' subcommand parser."""
+    p_capabilities = subparsers.add_parser("capabilities",
+                                           help="Show daemon capabilities")
+    p_capabilities.set_defaults(func=cmd_capabilities)
+
+
+def _register_uptime(subparsers):
+    """Register the 'uptime' subcommand parser."""
+    p_uptime = subparsers.add_parser("uptime", help="Show daemon uptime")
+    p_uptime.set_defaults(func=cmd_uptime)
+
+
+def _register_touch(subparsers):
+    """Register the 'touch' subcommand parser."""
     p_touch = subparsers.add_parser("touch", help="Set file datestamp (creates file if missing)")
+    p_touch.set_defaults(func=cmd_touch)
     p_touch.add_argument("path", help="Amiga path")
     p_touch.add_argument("datetime", nargs="*", metavar="DATETIME",
                          help="Date (YYYY-MM-DD) and time (HH:MM:SS). "
                               "Default: current time")
 
+
+def _register_arexx(subparsers):
+    """Register the 'arexx' subcommand parser."""
+    import argparse
+
     p_arexx = subparsers.add_parser("arexx",
                                      help="Send ARexx command to named port")
+    p_arexx.set_defaults(func=cmd_arexx)
     p_arexx.add_argument("rexx_port", metavar="PORT", help="ARexx port name")
     p_arexx.add_argument("cmd", nargs=argparse.REMAINDER,
                           help="ARexx command string (use -- before flags)")
 
+
+def _register_tail(subparsers):
+    """Register the 'tail' subcommand parser."""
     p_tail = subparsers.add_parser("tail",
                                     help="Stream file appends (Ctrl-C to stop)")
+    p_tail.set_defaults(func=cmd_tail)
     p_tail.add_argument("path", help="Amiga file path to tail")
 
+
+def _register_trace(subparsers):
+    """Register the 'trace' subcommand parser."""
+    import argparse
+
     p_trace = subparsers.add_parser("trace",
                                      help="Control library call tracing")
+    p_trace.set_defaults(func=cmd_trace)
     trace_sub = p_trace.add_subparsers(dest="trace_cmd")
 
     p_trace_start = trace_sub.add_parser("start", help="Start tracing")
@@ -911,8 +1144,162 @@ def main() -> None:
         "funcs", nargs="*",
         help="Function names to disable (all if omitted)")
 
+
+def _register_shell(subparsers):
+    """Register the 'shell' subcommand parser."""
     subparsers.add_parser("shell", help="Interactive shell mode")
 
+
+def _register_batch(subparsers):
+    """Register the 'batch' subcommand parser."""
+    p_batch = subparsers.add_parser(
+        "batch", help="Run CLI subcommands from a file over one connection")
+    p_batch.add_argument("script", nargs="?", default="-",
+                         help="File of subcommands, one per line "
+                              "(default: stdin)")
+
+
+# Subcommand parser registrars, in help-listing order.  main() registers
+# only the parser for the requested subcommand unless help is wanted.
+_REGISTRARS = {
+    "version": _register_version,
+    "ping": _register_ping,
+    "shutdown": _register_shutdown,
+    "reboot": _register_reboot,
+    "ls": _register_ls,
+    "stat": _register_stat,
+    "cat": _register_cat,
+    "get": _register_get,
+    "put": _register_put,
+    "append": _register_append,
+    "rm": _register_rm,
+    "mv": _register_mv,
+    "cp": _register_cp,
+    "mkdir": _register_mkdir,
+    "chmod": _register_chmod,
+    "checksum": _register_checksum,
+    "setcomment": _register_setcomment,
+    "exec": _register_exec,
+    "run": _register_run,
+    "ps": _register_ps,
+    "status": _register_status,
+    "signal": _register_signal,
+    "kill": _register_kill,
+    "sysinfo": _register_sysinfo,
+    "libver": _register_libver,
+    "env": _register_env,
+    "setenv": _register_setenv,
+    "assigns": _register_assigns,
+    "assign": _register_assign,
+    "ports": _register_ports,
+    "volumes": _register_volumes,
+    "tasks": _register_tasks,
+    "devices": _register_devices,
+    "capabilities": _register_capabilities,
+    "uptime": _register_uptime,
+    "touch": _register_touch,
+    "arexx": _register_arexx,
+    "tail": _register_tail,
+    "trace": _register_trace,
+    "shell": _register_shell,
+    "batch": _register_batch,
+}
+
+
+def _select_registrars(argv):
+    """Return the registrar functions needed to parse *argv*.
+
+    Peeks at the first positional argument (skipping the global options
+    and their values) to find the subcommand.  Only that subcommand's
+    parser is built; when help is requested or the subcommand is missing
+    or unknown, every parser is registered so argparse can produce the
+    full listing or its usual "invalid choice" error.
+    """
+    command = None
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg in ("--host", "--port", "--config"):
+            i += 2
+            continue
+        if not arg.startswith("-"):
+            command = arg
+            break
+        i += 1
+    if command == "batch":
+        # Batch lines may name any subcommand
+        return list(_REGISTRARS.values())
+    if command in _REGISTRARS and "-h" not in argv and "--help" not in argv:
+        return [_REGISTRARS[command]]
+    return list(_REGISTRARS.values())
+
+
+def _build_parser(default_host, default_port, argv):
+    """Build the top-level parser with the subcommands *argv* needs.
+
+    *default_host* and *default_port* only appear in the help text; the
+    options themselves default to None so config and environment values
+    can be layered underneath.
+    """
+    # Deferred so the env-var error path in main() never pays for
+    # argparse (and its gettext/re/shutil imports).
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="amigactl",
+        description="Amiga remote access client",
+    )
+    parser.add_argument(
+        "--host",
+        default=None,
+        help="Daemon hostname or IP (default: {})".format(default_host),
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=None,
+        help="Daemon port (default: {})".format(default_port),
+    )
+    parser.add_argument(
+        "--config",
+        default=None,
+        metavar="PATH",
+        help="Path to config file (default: client/amigactl.conf)",
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = False
+
+    for register in _select_registrars(argv):
+        register(subparsers)
+    return parser
+
+
+def main() -> None:
+    """Parse arguments and dispatch to the appropriate subcommand."""
+    DEFAULT_HOST = "192.168.6.200"
+    DEFAULT_PORT = 6800
+
+    # --- Pre-parse: resolve env vars for help string defaults ---
+    env_host = os.environ.get("AMIGACTL_HOST") or None
+    env_port_str = os.environ.get("AMIGACTL_PORT")
+    env_port = None
+    if env_port_str:
+        try:
+            env_port = int(env_port_str)
+        except ValueError:
+            print(
+                "Error: AMIGACTL_PORT must be an integer, got: {!r}".format(
+                    env_port_str
+                ),
+                file=sys.stderr,
+            )
+            sys.exit(1)
+
+    parser = _build_parser(
+        env_host if env_host is not None else DEFAULT_HOST,
+        env_port if env_port is not None else DEFAULT_PORT,
+        sys.argv[1:])
     args = parser.parse_args()
 
     # --- Load config file ---
@@ -950,48 +1337,6 @@ def main() -> None:
     if args.command is None:
         args.command = "shell"
 
-    dispatch = {
-        "append": cmd_append,
-        "arexx": cmd_arexx,
-        "assign": cmd_assign,
-        "assigns": cmd_assigns,
-        "capabilities": cmd_capabilities,
-        "cat": cmd_cat,
-        "checksum": cmd_checksum,
-        "chmod": cmd_chmod,
-        "cp": cmd_cp,
-        "devices": cmd_devices,
-        "env": cmd_env,
-        "exec": cmd_exec,
-        "get": cmd_get,
-        "kill": cmd_kill,
-        "libver": cmd_libver,
-        "ls": cmd_ls,
-        "mkdir": cmd_mkdir,
-        "mv": cmd_mv,
-        "ping": cmd_ping,
-        "ports": cmd_ports,
-        "ps": cmd_ps,
-        "put": cmd_put,
-        "reboot": cmd_reboot,
-        "rm": cmd_rm,
-        "run": cmd_run,
-        "setcomment": cmd_setcomment,
-        "setenv": cmd_setenv,
-        "shutdown": cmd_shutdown,
-        "signal": cmd_signal,
-        "stat": cmd_stat,
-        "status": cmd_status,
-        "sysinfo": cmd_sysinfo,
-        "tail": cmd_tail,
-        "tasks": cmd_tasks,
-        "trace": cmd_trace,
-        "touch": cmd_touch,
-        "uptime": cmd_uptime,
-        "version": cmd_version,
-        "volumes": cmd_volumes,
-    }
-
     # Shell subcommand manages its own connection lifecycle
     if args.command == "shell":
         from .shell import AmigaShell
@@ -1004,7 +1349,10 @@ def main() -> None:
 
     try:
         with AmigaConnection(host, port) as conn:
-            dispatch[args.command](conn, args)
+            if args.command == "batch":
+                _run_batch(conn, parser, args.script)
+            else:
+                args.func(conn, args)
     except ConnectionRefusedError:
         print(
             "Error: could not connect to {}:{}".format(host, port),
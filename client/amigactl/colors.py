@@ -39,6 +39,32 @@ def _supports_color():
     return True
 
 
+# Cached _supports_color() result; None until first needed.  Detection
+# touches the environment and, on Windows, makes console-mode syscalls,
+# so it runs once per process rather than once per ColorWriter.
+_color_supported = None
+
+
+def _default_color():
+    """Return the cached _supports_color() result, detecting on first use."""
+    global _color_supported
+    if _color_supported is None:
+        _color_supported = _supports_color()
+    return _color_supported
+
+
+def refresh_color_support():
+    """Re-run terminal color detection and return the new default.
+
+    For callers (and tests) that change NO_COLOR, AMIGACTL_COLOR or
+    stdout after the first ColorWriter was created.  Existing writers
+    keep their setting.
+    """
+    global _color_supported
+    _color_supported = _supports_color()
+    return _color_supported
+
+
 # ANSI escape sequences
 RESET = "\033[0m"
 BOLD = "\033[1m"
@@ -51,6 +77,15 @@ BLUE = "\033[34m"
 CYAN = "\033[36m"
 
 
+def combine_codes(*codes):
+    """Merge ANSI SGR sequences into one, e.g. BOLD, RED -> "\\033[1;31m".
+
+    A single sequence is fewer bytes for the terminal to parse than
+    the same attributes emitted back to back.
+    """
+    return "\033[" + ";".join(code[2:-1] for code in codes) + "m"
+
+
 # Library color palette for trace events.
 # Known libraries get fixed colors. Unknown libraries are
 # auto-assigned from a rotating palette.
@@ -106,6 +141,26 @@ def get_lib_color(lib_name):
     return _lib_color_assignments[lib_name]
 
 
+# ColorWriter style methods and the ANSI code each one wraps text in.
+_STYLES = (
+    ("error", RED),
+    ("success", GREEN),
+    ("directory", BLUE),
+    ("key", CYAN),
+    ("bold", BOLD),
+    ("warning", YELLOW),
+    ("dim", DIM),
+    ("reverse", REVERSE),
+    ("yellow", YELLOW),
+    ("cyan", CYAN),
+    ("green", GREEN),
+)
+
+
+def _plain(text):
+    return text
+
+
 class ColorWriter:
     """Write colorized text, falling back to plain text if unsupported.
 
@@ -117,57 +172,55 @@ class ColorWriter:
         cw.key("size")                    # cyan
         cw.bold("HEADER")                # bold
         cw.write("plain text")           # default color
+
+    The style methods listed in _STYLES are bound per instance when
+    ``enabled`` is set, so a call costs one template format when color
+    is on and nothing when it is off.
     """
 
     def __init__(self, force_color=None):
         if force_color is not None:
             self.enabled = force_color
         else:
-            self.enabled = _supports_color()
+            self.enabled = _default_color()
+
+    @property
+    def enabled(self):
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, value):
+        # Rebind the style methods whenever color is switched so each
+        # call is a single prebuilt-template format (or a no-op).
+        self._enabled = value
+        for name, code in _STYLES:
+            if value:
+                setattr(self, name, (code + "{}" + RESET).format)
+            else:
+                setattr(self, name, _plain)
+
+    def style(self, text, *codes):
+        """Wrap text in several attributes with a single escape sequence.
+
+        Use this instead of nesting style methods, e.g.
+        cw.style("x", BOLD, RED) rather than cw.bold(cw.error("x")).
+        """
+        if not self._enabled or not codes:
+            return text
+        return combine_codes(*codes) + text + RESET
 
-    def _wrap(self, code, text):
-        if self.enabled:
-            return "{}{}{}".format(code, text, RESET)
+    def write(self, text):
         return text
 
-    def error(self, text):
-        return self._wrap(RED, text)
-
-    def success(self, text):
-        return self._wrap(GREEN, text)
-
-    def directory(self, text):
-        return self._wrap(BLUE, text)
-
-    def key(self, text):
-        return self._wrap(CYAN, text)
-
-    def bold(self, text):
-        return self._wrap(BOLD, text)
 
-    def warning(self, text):
-        return self._wrap(YELLOW, text)
+# Column layout shared by the header and uncolored event rows.
+_PLAIN_ROW = "{:<10s} {:>13s}  {:<28s} {:<20s} {:<40s} {}".format
 
-    def dim(self, text):
-        return self._wrap(DIM, text)
+# Colored event rows: the colored columns are padded by hand (escape
+# codes have no visible width), so they take separate pad arguments.
+_COLOR_ROW = "{}{} {:>13s}  {}{} {}{} {:<40s} {}".format
 
-    def reverse(self, text):
-        return self._wrap(REVERSE, text)
-
-    def yellow(self, text):
-        return self._wrap(YELLOW, text)
-
-    def cyan(self, text):
-        return self._wrap(CYAN, text)
-
-    def green(self, text):
-        return self._wrap(GREEN, text)
-
-    def write(self, text):
-        return text
-
-
-TRACE_HEADER = "{:<10s} {:>13s}  {:<28s} {:<20s} {:<40s} {}".format(
+TRACE_HEADER = _PLAIN_ROW(
     "SEQ", "TIME", "FUNCTION", "TASK", "ARGS", "RESULT")
 
 
@@ -202,6 +255,20 @@ def format_trace_event(event, cw, handle_resolver=None):
 
     retval = event.get("retval", "")
     status = event.get("status", "-")
+    seq_raw = str(event.get("seq", ""))
+    lib_str = event.get("lib", "")
+    func_str = event.get("func", "")
+    task_raw = event.get("task", "")
+
+    args_str = event.get("args", "")
+    if annotation:
+        args_str = "{} [{}]".format(args_str, annotation)
+
+    if not cw.enabled:
+        # No escape codes, so the C formatter can do all the padding.
+        return _PLAIN_ROW(seq_raw, event.get("time", ""),
+                          "{}.{}".format(lib_str, func_str), task_raw,
+                          args_str, retval)
 
     # Color retval based on daemon-provided status classification
     if status == "E":
@@ -211,29 +278,17 @@ def format_trace_event(event, cw, handle_resolver=None):
     else:
         retval_formatted = retval  # neutral: no color
 
-    seq_str = cw.dim(str(event.get("seq", "")))
-    lib_str = event.get("lib", "")
-    func_str = event.get("func", "")
     lib_func = "{}.{}".format(cw.cyan(lib_str), cw.yellow(func_str))
-    task_str = cw.green(event.get("task", ""))
-
-    args_str = event.get("args", "")
-    if annotation:
-        args_str = "{} [{}]".format(args_str, annotation)
-
-    # For column alignment, compute visible widths and pad manually
-    # since ANSI escape codes add invisible characters.
-    seq_vis = len(str(event.get("seq", "")))
-    lib_func_vis = len(lib_str) + 1 + len(func_str)
-    task_vis = len(event.get("task", ""))
 
-    return "{}{} {:>13s}  {}{} {}{} {:<40s} {}".format(
-        seq_str,
-        " " * max(0, 10 - seq_vis),
+    # ANSI escape codes add invisible characters, so pad by visible
+    # width.  A negative repeat count yields "", so no clamping needed.
+    return _COLOR_ROW(
+        cw.dim(seq_raw),
+        " " * (10 - len(seq_raw)),
         event.get("time", ""),
         lib_func,
-        " " * max(0, 28 - lib_func_vis),
-        task_str,
-        " " * max(0, 20 - task_vis),
+        " " * (28 - len(lib_str) - 1 - len(func_str)),
+        cw.green(task_raw),
+        " " * (20 - len(task_raw)),
         args_str,
         retval_formatted)
@@ -6,10 +6,18 @@ All wire communication uses ISO-8859-1 encoding.
 """
 
 import socket
-from typing import List, Tuple
+from contextlib import contextmanager
+from typing import (
+    BinaryIO, Callable, Iterator, List, Optional, Tuple, Union,
+)
 
 ENCODING = "iso-8859-1"
 
+# Pre-encoded framing lines, so the send paths never build them per call
+_LF = b"\n"
+_END_LINE = b"END\n"
+_DATA_HEADER = b"DATA %d\n"
+
 
 class ProtocolError(Exception):
     """Raised on wire protocol violations (unexpected EOF, malformed
@@ -43,12 +51,194 @@ class ServerError(ProtocolError):
         super().__init__("ERR {}".format(err_info))
 
 
-def read_line(sock: socket.socket) -> str:
-    """Read a single line from the socket, byte-by-byte until LF.
+class ConnectionLostError(ProtocolError):
+    """Raised when the connection fails or closes while reading a response.
+
+    The daemon (or something in between) dropped the connection; the
+    request that was in flight may or may not have been carried out.
+    """
+
+
+class _MidLineEOFError(ConnectionLostError):
+    """Connection closed with a partial line buffered.
+
+    The partial data is kept as bytes and only repr()'d if the error is
+    actually displayed.
+    """
+
+    def __init__(self, partial: bytes) -> None:
+        super().__init__()
+        self.partial = partial
+
+    def __str__(self) -> str:
+        return "Connection closed mid-line (partial data: {!r})".format(
+            self.partial)
+
+
+def _socket_error(exc: OSError) -> ConnectionLostError:
+    """Build the ConnectionLostError for an OSError raised by recv()."""
+    return ConnectionLostError("Socket error: {}".format(exc))
+
+
+def _eof_error(partial: bytes = b"") -> ConnectionLostError:
+    """Build the ConnectionLostError for EOF, with any partial line read."""
+    if partial:
+        return _MidLineEOFError(partial)
+    return ConnectionLostError("Connection closed by server")
+
+
+class BufferedSocket:
+    """Socket wrapper with a receive buffer for line-oriented reads.
+
+    read_line() pulls data from the kernel in large recv() calls and
+    scans for LF with bytearray.find(), instead of one recv(1) syscall
+    per byte.  recv() serves buffered bytes first, so recv_exact() and
+    other raw readers see the stream in order.  Every other attribute
+    (sendall, settimeout, fileno, ...) is delegated to the socket, so
+    the wrapper works with select() and the existing helpers.
+    """
+
+    def __init__(self, sock: socket.socket, bufsize: int = 65536) -> None:
+        self._sock = sock
+        self._bufsize = bufsize
+        self._buf = bytearray()
+        self._pos = 0       # start of unconsumed data in _buf
+        self._scan = 0      # where the next LF search resumes
+
+    def __getattr__(self, name):
+        return getattr(self._sock, name)
+
+    @property
+    def sock(self) -> socket.socket:
+        """The wrapped socket."""
+        return self._sock
+
+    def _consume(self, end: int, skip: int = 0) -> bytes:
+        """Return _buf[_pos:end] and consume through end + skip."""
+        data = bytes(self._buf[self._pos:end])
+        self._advance(end + skip)
+        return data
+
+    def _advance(self, end: int) -> None:
+        """Mark _buf[_pos:end] consumed without copying it."""
+        if end >= len(self._buf):
+            self._buf.clear()
+            self._pos = 0
+        else:
+            self._pos = end
+            # Compact occasionally rather than on every line
+            if self._pos > self._bufsize:
+                del self._buf[:self._pos]
+                self._pos = 0
+        self._scan = self._pos
+
+    def read_line_bytes(self) -> bytes:
+        """Read one raw line; same contract as read_line_bytes()."""
+        buf = self._buf
+        while True:
+            idx = buf.find(b"\n", self._scan)
+            if idx >= 0:
+                raw = self._consume(idx, 1)
+                break
+            # Only the bytes appended by the next recv need scanning
+            self._scan = len(buf)
+            self._fill()
+
+        # Strip trailing CR (telnet compatibility)
+        if raw.endswith(b"\r"):
+            raw = raw[:-1]
+        return raw
+
+    def _fill(self) -> None:
+        """Append the result of one recv() to the buffer.
+
+        A timeout propagates only when nothing is buffered; with partial
+        data buffered it returns so the caller can retry.
+        """
+        try:
+            chunk = self._sock.recv(self._bufsize)
+        except socket.timeout:
+            if self._pos == len(self._buf):
+                raise  # No partial data -- let caller handle
+            return  # Mid-line data -- keep reading
+        except OSError as e:
+            raise _socket_error(e)
+        if not chunk:
+            raise _eof_error(self._consume(len(self._buf)))
+        self._buf.extend(chunk)
+
+    def take_response(self) -> Optional[List[bytes]]:
+        """Consume a complete text response if it is already buffered.
+
+        If nothing is buffered, one recv() is made first, since a short
+        response usually arrives whole.  When the buffer then holds
+        everything up to the "." sentinel line, the response is removed
+        with one bytes.split() and its raw lines (status line first,
+        sentinel excluded, still dot-stuffed) are returned.  Otherwise
+        nothing is consumed and None is returned.
+        """
+        if self._pos == len(self._buf):
+            self._fill()
+        # A payload line of "." is always stuffed to "..", so the first
+        # "." line after the status line ends this response.
+        end = self._buf.find(b"\n.\n", self._pos)
+        skip = 3
+        crlf_end = self._buf.find(b"\n.\r\n", self._pos,
+                                  end if end >= 0 else len(self._buf))
+        if crlf_end >= 0:
+            end, skip = crlf_end, 4
+        if end < 0:
+            return None
+        block = self._consume(end, skip)
+        if b"\r" in block:
+            # Strip trailing CR (telnet compatibility)
+            return [line[:-1] if line.endswith(b"\r") else line
+                    for line in block.split(b"\n")]
+        return block.split(b"\n")
+
+    def read_line(self) -> str:
+        """Read one line; same contract as the module-level read_line()."""
+        return self.read_line_bytes().decode(ENCODING)
+
+    def recv(self, bufsize: int, *flags) -> bytes:
+        """Return buffered bytes if any, else read from the socket."""
+        avail = len(self._buf) - self._pos
+        if avail:
+            return self._consume(self._pos + min(bufsize, avail))
+        return self._sock.recv(bufsize, *flags)
+
+    def recv_into(self, buffer, nbytes: int = 0, *flags) -> int:
+        """Fill *buffer* from buffered bytes if any, else from the socket."""
+        avail = len(self._buf) - self._pos
+        if avail:
+            n = min(nbytes or len(buffer), avail)
+            with memoryview(self._buf) as view:
+                buffer[:n] = view[self._pos:self._pos + n]
+            self._advance(self._pos + n)
+            return n
+        return self._sock.recv_into(buffer, nbytes, *flags)
+
+    def read_buffered(self, nbytes: int) -> bytes:
+        """Return up to nbytes of already-buffered data, without a syscall."""
+        return self._consume(
+            self._pos + min(nbytes, len(self._buf) - self._pos))
+
+    def take_buffered(self) -> bytes:
+        """Remove and return all buffered, unconsumed bytes."""
+        return self._consume(len(self._buf))
+
+
+def read_line_bytes(sock: socket.socket) -> bytes:
+    """Read a single line from the socket as raw bytes.
 
     Strips trailing CR LF or bare LF.  Raises ProtocolError on EOF
     (connection closed before LF) or socket timeout.
+
+    A BufferedSocket reads in large blocks; a plain socket is read
+    byte-by-byte until LF so no bytes past the line are consumed.
     """
+    if isinstance(sock, BufferedSocket):
+        return sock.read_line_bytes()
     buf = bytearray()
     while True:
         try:
@@ -58,26 +248,29 @@ def read_line(sock: socket.socket) -> str:
                 raise  # No partial data -- let caller handle
             continue  # Mid-line data -- keep reading
         except OSError as e:
-            raise ProtocolError("Socket error: {}".format(e))
+            raise _socket_error(e)
 
         if not b:
-            if buf:
-                raise ProtocolError(
-                    "Connection closed mid-line (partial data: {!r})".format(
-                        bytes(buf)
-                    )
-                )
-            raise ProtocolError("Connection closed by server")
+            raise _eof_error(bytes(buf))
 
         if b == b"\n":
             break
         buf.extend(b)
 
     # Strip trailing CR (telnet compatibility)
-    line = buf.decode(ENCODING)
-    if line.endswith("\r"):
-        line = line[:-1]
-    return line
+    if buf.endswith(b"\r"):
+        del buf[-1]
+    return bytes(buf)
+
+
+def read_line(sock: socket.socket) -> str:
+    """Read a single line from the socket, decoded from ISO-8859-1.
+
+    See read_line_bytes() for the framing and error behaviour.
+    """
+    if isinstance(sock, BufferedSocket):
+        return sock.read_line()
+    return read_line_bytes(sock).decode(ENCODING)
 
 
 def read_response(sock: socket.socket) -> Tuple[str, str, List[str]]:
@@ -96,101 +289,295 @@ def read_response(sock: socket.socket) -> Tuple[str, str, List[str]]:
       QUIT    -> ("OK", "Goodbye", [])
       error   -> ("ERR", "100 Unknown command", [])
     """
-    status_line = read_line(sock)
+    lines = None
+    if isinstance(sock, BufferedSocket):
+        lines = sock.take_response()
+    if lines is not None:
+        # Whole response was buffered: classify, then unstuff in one pass
+        status, info = _parse_status(lines[0])
+        raw_lines = [line[1:] if line.startswith(b"..") else line
+                     for line in lines[1:]]
+    else:
+        status, info = read_status(sock)
+        raw_lines = list(_iter_payload_bytes(sock))
+    # Decode the whole payload in one call; lines cannot contain LF, so
+    # splitting the joined text restores them.
+    if not raw_lines:
+        return (status, info, [])
+    payload_lines = b"\n".join(raw_lines).decode(
+        ENCODING).split("\n")  # type: List[str]
+    return (status, info, payload_lines)
+
 
-    if status_line == "OK" or status_line.startswith("OK "):
+def read_status(sock: socket.socket) -> Tuple[str, str]:
+    """Read a response status line.
+
+    Returns (status, info) as described for read_response.  The caller
+    must then consume the payload (see iter_payload).
+    """
+    return _parse_status(read_line_bytes(sock))
+
+
+def _parse_status(status_line: bytes) -> Tuple[str, str]:
+    """Split a raw status line into (status, info).
+
+    Classification is done on bytes; only the info field is decoded.
+    """
+    if status_line == b"OK" or status_line.startswith(b"OK "):
         status = "OK"
         info = status_line[3:]  # empty if just "OK", rest after "OK "
-    elif status_line == "ERR" or status_line.startswith("ERR "):
+    elif status_line == b"ERR" or status_line.startswith(b"ERR "):
         status = "ERR"
         info = status_line[4:]  # rest after "ERR "
     else:
         raise ProtocolError(
-            "Expected OK or ERR, got: {!r}".format(status_line)
+            "Expected OK or ERR, got: {!r}".format(
+                status_line.decode(ENCODING))
         )
+    return (status, info.decode(ENCODING))
 
-    # Read payload lines until sentinel
-    payload_lines = []  # type: List[str]
+
+def _iter_payload_bytes(sock: socket.socket) -> Iterator[bytes]:
+    """Yield raw dot-unstuffed payload lines up to the sentinel."""
     while True:
-        line = read_line(sock)
-        if line == ".":
+        line = read_line_bytes(sock)
+        if line == b".":
             # Sentinel -- response complete
-            break
-        if line.startswith(".."):
+            return
+        if line.startswith(b".."):
             # Dot-unstuff: remove leading dot
             line = line[1:]
-        payload_lines.append(line)
+        yield line
 
-    return (status, info, payload_lines)
+
+def iter_payload(sock: socket.socket) -> Iterator[str]:
+    """Yield dot-unstuffed payload lines up to (not including) the sentinel.
+
+    Lines are yielded as they are read, so large listings can be
+    processed without holding the whole payload in memory.  Lines are
+    unstuffed as bytes and decoded once on the way out.
+    """
+    for line in _iter_payload_bytes(sock):
+        yield line.decode(ENCODING)
 
 
-def send_command(sock: socket.socket, command: str) -> None:
+def send_command(sock: socket.socket, command: Union[str, bytes]) -> None:
     """Send a command line to the server.
 
-    Appends LF and encodes as ISO-8859-1.
+    Encodes as ISO-8859-1 and appends LF.  A command that is already
+    bytes is sent as-is (plus LF) without a decode/encode round-trip;
+    a str is encoded directly, never concatenated with "\n" first.
+    """
+    if not isinstance(command, bytes):
+        command = command.encode(ENCODING)
+    sock.sendall(command + _LF)
+
+
+class _SendBuffer:
+    """Socket stand-in that collects sendall() data until flush().
+
+    Used by cork() where TCP_CORK is unavailable.  Every other
+    attribute is delegated to the wrapped socket.
     """
-    data = (command + "\n").encode(ENCODING)
-    sock.sendall(data)
+
+    def __init__(self, sock: socket.socket) -> None:
+        self._sock = sock
+        self._parts = []  # type: List[bytes]
+
+    def __getattr__(self, name):
+        return getattr(self._sock, name)
+
+    def sendall(self, data: bytes, *flags) -> None:
+        self._parts.append(bytes(data))
+
+    def flush(self) -> None:
+        """Send everything collected so far in one sendall()."""
+        if self._parts:
+            data = b"".join(self._parts)
+            self._parts.clear()
+            self._sock.sendall(data)
+
+
+@contextmanager
+def cork(sock: socket.socket) -> Iterator[socket.socket]:
+    """Coalesce the commands sent inside the block into as few segments
+    as possible.
+
+    On Linux this sets TCP_CORK for the duration of the block and yields
+    *sock* itself.  Elsewhere it yields a buffer whose sendall() output
+    is sent in one call when the block exits.  Send through the yielded
+    object::
+
+        with cork(sock) as s:
+            send_command(s, "PING")
+            send_command(s, "VERSION")
+        status, info, payload = read_response(sock)
+
+    Nothing is guaranteed to reach the server before the block exits, so
+    the commands must not depend on each other's responses -- read them
+    all afterwards.
+    """
+    opt = getattr(socket, "TCP_CORK", None)
+    if opt is not None:
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, opt, 1)
+        except OSError:
+            opt = None
+    if opt is not None:
+        try:
+            yield sock
+        finally:
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, opt, 0)
+            except OSError:
+                pass
+        return
+    buf = _SendBuffer(sock)
+    try:
+        yield buf  # type: ignore
+    finally:
+        buf.flush()
 
 
 def recv_exact(sock: socket.socket, nbytes: int) -> bytes:
     """Receive exactly nbytes from sock.
 
+    The buffer is allocated up front and filled with recv_into(), so
+    the payload is copied once out of the kernel and once into the
+    returned bytes.
+
+    A BufferedSocket's DATA body is sliced straight out of its buffer;
+    only a shortfall is read from the socket, directly into the result
+    and without going through the line buffer.
+
     Raises ProtocolError on EOF or socket timeout.
     """
-    buf = bytearray()
-    while len(buf) < nbytes:
-        try:
-            chunk = sock.recv(nbytes - len(buf))
-        except socket.timeout:
-            if not buf:
-                raise  # No partial data -- let caller handle
-            continue  # Partial transfer -- keep reading
-        except OSError as e:
-            raise ProtocolError("Socket error: {}".format(e))
-        if not chunk:
-            raise ProtocolError(
-                "Connection closed after {}/{} bytes".format(
-                    len(buf), nbytes))
-        buf.extend(chunk)
+    head = b""
+    if isinstance(sock, BufferedSocket):
+        head = sock.read_buffered(nbytes)
+        if len(head) == nbytes:
+            return head
+        sock = sock.sock
+    buf = bytearray(nbytes)
+    buf[:len(head)] = head
+    recv_exact_into(sock, buf, len(head))
     return bytes(buf)
 
 
-def _read_data_chunks(sock: socket.socket) -> bytes:
-    """Read DATA/END chunks from the socket.
+def recv_exact_into(sock: socket.socket, buffer, filled: int = 0) -> None:
+    """Fill the writable *buffer* (bytearray, memoryview, ...) from sock.
+
+    *filled* bytes at the start of *buffer* are already present; the
+    rest are received with recv_into() directly into the caller's
+    memory, so no intermediate bytes objects are created.  A
+    BufferedSocket serves its buffered bytes first.
+
+    Raises ProtocolError on EOF or socket timeout.
+    """
+    if isinstance(sock, (socket.socket, BufferedSocket)):
+        recv_into = sock.recv_into
+    else:
+        # Objects that only provide recv() (wrappers, test doubles)
+        def recv_into(target, size):
+            chunk = sock.recv(size)
+            target[:len(chunk)] = chunk
+            return len(chunk)
+
+    with memoryview(buffer) as view:
+        nbytes = len(view)
+        got = filled
+        while got < nbytes:
+            try:
+                n = recv_into(view[got:], nbytes - got)
+            except socket.timeout:
+                if not got:
+                    raise  # No partial data -- let caller handle
+                continue  # Partial transfer -- keep reading
+            except OSError as e:
+                raise _socket_error(e)
+            if not n:
+                raise ConnectionLostError(
+                    "Connection closed after {}/{} bytes".format(
+                        got, nbytes))
+            got += n
+
+
+def _copy_data_chunks(sock: socket.socket,
+                      write: Callable[[bytes], object],
+                      scratch: Optional[bytearray] = None) -> int:
+    """Read DATA/END chunks from the socket, passing each to *write*.
 
     Reads DATA <len> / raw-chunk pairs until END.  If the server sends
-    an ERR line mid-stream, raises BinaryTransferError with any partial
-    data.
+    an ERR line mid-stream, raises BinaryTransferError (partial_data is
+    empty -- the chunks already went to *write*).
 
-    Returns the concatenated bytes.  The caller is responsible for
-    reading the sentinel line that follows END.
+    Without *scratch*, each chunk is passed as a new bytes object.  With
+    a *scratch* bytearray, every chunk is received into it (growing it
+    if needed) and passed as a memoryview that is only valid during the
+    call, so *write* must copy it rather than keep it.
+
+    Returns the total number of bytes received.  The caller is
+    responsible for reading the sentinel line that follows END.
     """
-    data = bytearray()
+    total = 0
     while True:
-        line = read_line(sock)
-        if line == "END":
+        # Frame headers stay bytes; only error paths decode them
+        line = read_line_bytes(sock)
+        if line == b"END":
             break
-        if line == "ERR" or line.startswith("ERR "):
-            err_info = line[4:]
+        if line.startswith(b"DATA "):
+            try:
+                chunk_len = int(line[5:])
+            except ValueError:
+                raise ProtocolError(
+                    "Invalid DATA chunk length: {!r}".format(
+                        line.decode(ENCODING)))
+            if scratch is None:
+                write(recv_exact(sock, chunk_len))
+            else:
+                if chunk_len > len(scratch):
+                    scratch.extend(bytes(chunk_len - len(scratch)))
+                with memoryview(scratch) as view, \
+                        view[:chunk_len] as chunk:
+                    recv_exact_into(sock, chunk)
+                    write(chunk)
+            total += chunk_len
+            continue
+        if line == b"ERR" or line.startswith(b"ERR "):
+            err_info = line[4:].decode(ENCODING)
             # Read sentinel after ERR
             sentinel = read_line(sock)
             if sentinel != ".":
                 raise ProtocolError(
                     "Expected sentinel after ERR, got: {!r}".format(
                         sentinel))
-            raise BinaryTransferError(err_info, bytes(data))
-        if not line.startswith("DATA "):
-            raise ProtocolError(
-                "Expected DATA or END, got: {!r}".format(line))
-        try:
-            chunk_len = int(line[5:])
-        except ValueError:
-            raise ProtocolError(
-                "Invalid DATA chunk length: {!r}".format(line))
-        chunk = recv_exact(sock, chunk_len)
-        data.extend(chunk)
-    return bytes(data)
+            raise BinaryTransferError(err_info, b"")
+        raise ProtocolError(
+            "Expected DATA or END, got: {!r}".format(line.decode(ENCODING)))
+    return total
+
+
+def _read_data_chunks(sock: socket.socket) -> bytes:
+    """Read DATA/END chunks from the socket.
+
+    Reads DATA <len> / raw-chunk pairs until END.  If the server sends
+    an ERR line mid-stream, raises BinaryTransferError with any partial
+    data.
+
+    Returns the concatenated bytes.  The caller is responsible for
+    reading the sentinel line that follows END.
+
+    Chunks are collected in a list and joined once at the end, so each
+    byte is copied a single time rather than through a growing
+    bytearray and a final bytes() conversion.
+    """
+    chunks = []  # type: List[bytes]
+    try:
+        _copy_data_chunks(sock, chunks.append)
+    except BinaryTransferError as e:
+        e.partial_data = b"".join(chunks)
+        raise
+    return b"".join(chunks)
 
 
 def read_binary_response(sock: socket.socket) -> bytes:
@@ -220,6 +607,32 @@ def read_binary_response(sock: socket.socket) -> bytes:
     return data
 
 
+def read_binary_response_into(sock: socket.socket,
+                              write: Callable[[bytes], object]) -> int:
+    """Stream DATA/END chunks + sentinel after an OK status line.
+
+    Like read_binary_response, but hands each chunk to *write* as it
+    arrives instead of accumulating the whole body, so memory use is
+    bounded by one chunk.  Returns the number of bytes received.
+
+    Chunks are received with recv_into() into one reused buffer and
+    passed to *write* as memoryviews, so *write* (typically a file's
+    write method) must copy the data before returning.
+
+    On a mid-stream ERR, raises BinaryTransferError with empty
+    partial_data (everything received was already passed to *write*).
+    """
+    total = _copy_data_chunks(sock, write, bytearray(4096))
+
+    # Read sentinel
+    sentinel = read_line(sock)
+    if sentinel != ".":
+        raise ProtocolError(
+            "Expected sentinel, got: {!r}".format(sentinel))
+
+    return total
+
+
 def read_exec_response(sock: socket.socket) -> "Tuple[int, bytes]":
     """Read a full EXEC response: status line + DATA/END chunks + sentinel.
 
@@ -271,19 +684,65 @@ def read_exec_response(sock: socket.socket) -> "Tuple[int, bytes]":
     return (rc, data)
 
 
-def send_data_chunks(sock: socket.socket, data: bytes, chunk_size: int = 4096) -> None:
+def _send_frames(sock: socket.socket, block: bytes, chunk_size: int,
+                 last: bool) -> None:
+    """Send *block* as DATA frames of at most *chunk_size* bytes.
+
+    All frames of the block (and END, if *last*) go out in a single
+    sendall() instead of one call per frame.
+    """
+    view = memoryview(block)
+    parts = []
+    for offset in range(0, len(view), chunk_size):
+        chunk = view[offset:offset + chunk_size]
+        parts.append(_DATA_HEADER % len(chunk))
+        parts.append(chunk)
+    if last:
+        parts.append(_END_LINE)
+    sock.sendall(b"".join(parts))
+
+
+def send_data_chunks(sock: socket.socket, data: bytes, chunk_size: int = 4096,
+                     block_size: int = 65536) -> None:
     """Send data as DATA/END chunks to the server.
 
     data must be bytes. Sends DATA <len> header + raw bytes for each
-    chunk, then sends END.
+    chunk, then sends END.  Frames are batched *block_size* bytes of
+    payload per send.
     """
-    offset = 0
-    while offset < len(data):
-        chunk = data[offset:offset + chunk_size]
-        header = "DATA {}\n".format(len(chunk)).encode(ENCODING)
-        sock.sendall(header + chunk)
-        offset += len(chunk)
-    sock.sendall(b"END\n")
+    if not data:
+        sock.sendall(_END_LINE)
+        return
+    view = memoryview(data)
+    for offset in range(0, len(view), block_size):
+        _send_frames(sock, view[offset:offset + block_size], chunk_size,
+                     offset + block_size >= len(view))
+
+
+def send_data_stream(sock: socket.socket, fileobj: BinaryIO, size: int,
+                     chunk_size: int = 4096,
+                     read_size: int = 65536) -> None:
+    """Send exactly *size* bytes read from *fileobj* as DATA/END chunks.
+
+    The file is read *read_size* bytes at a time and each block is sent
+    as DATA frames of at most *chunk_size* bytes (the daemon's limit),
+    so memory use is bounded by one block rather than the whole file.
+
+    Raises ProtocolError if the file ends before *size* bytes were read;
+    the transfer is then incomplete and the connection should be closed.
+    """
+    if size <= 0:
+        sock.sendall(_END_LINE)
+        return
+    remaining = size
+    while remaining > 0:
+        block = fileobj.read(min(read_size, remaining))
+        if not block:
+            raise ProtocolError(
+                "Local file ended after {}/{} bytes".format(
+                    size - remaining, size))
+        remaining -= len(block)
+        _send_frames(sock, block, chunk_size, remaining <= 0)
 
 
 def _parse_trace_event(text):
@@ -372,6 +831,11 @@ class TraceStreamReader:
         self._state = "header"     # "header" or "chunk"
         self._chunk_remaining = 0
         self._chunk_data = bytearray()
+        if isinstance(sock, BufferedSocket):
+            # Events may have arrived in the same recv() as the OK line.
+            # select() cannot see them, so take them over as buffered
+            # data for drain_buffered().
+            self._buf.extend(sock.take_buffered())
 
     def try_read_event(self):
         """Try to read one complete trace event.
@@ -392,10 +856,10 @@ class TraceStreamReader:
         except socket.timeout:
             return None  # Timeout during drain, no data yet
         except OSError as e:
-            raise ProtocolError("Socket error: {}".format(e))
+            raise _socket_error(e)
 
         if not data:
-            raise ProtocolError("Connection closed by server")
+            raise _eof_error()
 
         self._buf.extend(data)
 
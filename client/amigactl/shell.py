@@ -1,17 +1,24 @@
 """Interactive shell for amigactl."""
 
 import cmd
+import collections
 import difflib
 import fnmatch
+import functools
+import io
 import os
 import re
+import select
 import shlex
 import shutil
+import subprocess
 import sys
+import tempfile
 import time
 
 from . import (
-    AmigaConnection, AmigactlError, NotFoundError, ProtocolError,
+    AmigaConnection, AmigactlError, ConnectionLostError, NotFoundError,
+    ProtocolError,
 )
 from .colors import ColorWriter, TRACE_HEADER, format_trace_event
 from .trace_ui import HandleResolver
@@ -21,6 +28,13 @@ from .trace_ui import HandleResolver
 # Utility functions
 # ---------------------------------------------------------------------------
 
+_SIZE_UNITS = ("", "K", "M", "G", "T")
+
+# Default for dict.get() where a stored None is meaningful
+_MISSING = object()
+
+
+@functools.lru_cache(maxsize=4096, typed=True)
 def format_size(nbytes):
     """Format a byte count as a human-readable string.
 
@@ -31,15 +45,39 @@ def format_size(nbytes):
     """
     if nbytes < 1024:
         return str(nbytes)
-    for unit in ("K", "M", "G", "T"):
-        nbytes = nbytes / 1024.0
-        if nbytes < 999.95 or unit == "T":
-            if nbytes == int(nbytes):
-                return "{:.0f}{}".format(int(nbytes), unit)
-            return "{:.1f}{}".format(nbytes, unit)
-    return str(nbytes)
+    # The unit follows from the bit length; one division gives the value
+    k = min((int(nbytes).bit_length() - 1) // 10, 4)
+    value = nbytes / float(1 << (10 * k))
+    if value >= 999.95 and k < 4:
+        k += 1
+        value = nbytes / float(1 << (10 * k))
+    if value == int(value):
+        return "{:.0f}{}".format(int(value), _SIZE_UNITS[k])
+    return "{:.1f}{}".format(value, _SIZE_UNITS[k])
+
+
+def _protection_string(bits):
+    """Render the low 8 protection bits as an hsparwed string."""
+    result = []
+    for i, ch in enumerate("hspa"):
+        if bits & (1 << (7 - i)):
+            result.append(ch)
+        else:
+            result.append("-")
+    # RWED bits are inverted
+    for i, ch in enumerate("rwed"):
+        if bits & (1 << (3 - i)):
+            result.append("-")  # set = denied
+        else:
+            result.append(ch)  # clear = allowed
+    return "".join(result)
+
 
+# hsparwed string for every value of the low protection byte
+_PROT_TABLE = tuple(_protection_string(bits) for bits in range(256))
 
+
+@functools.lru_cache(maxsize=1024)
 def _format_protection(hex_str):
     """Convert raw fib_Protection hex to hsparwed display string.
 
@@ -54,27 +92,12 @@ def _format_protection(hex_str):
       bit 0: d (delete)   -- INVERTED: set = denied
     """
     try:
-        bits = int(hex_str, 16)
+        return _PROT_TABLE[int(hex_str, 16) & 0xFF]
     except (ValueError, TypeError):
         return hex_str  # Can't parse, show raw
 
-    flags = "hspa"
-    result = []
-    for i, ch in enumerate(flags):
-        if bits & (1 << (7 - i)):
-            result.append(ch)
-        else:
-            result.append("-")
-    # RWED bits are inverted
-    inv_flags = "rwed"
-    for i, ch in enumerate(inv_flags):
-        if bits & (1 << (3 - i)):
-            result.append("-")  # set = denied
-        else:
-            result.append(ch)  # clear = allowed
-    return "".join(result)
-
 
+@functools.lru_cache(maxsize=1024)
 def _join_amiga_path(base, relative):
     """Join an Amiga base directory path with a relative path.
 
@@ -134,20 +157,46 @@ def _amiga_basename(path):
         RAM:test.txt -> test.txt
         Work: -> Work  (volume root -- unusual but handle it)
     """
-    if "/" in path:
-        return path.rsplit("/", 1)[1]
-    if ":" in path:
-        return path.rsplit(":", 1)[1] or path.rstrip(":")
+    head, sep, name = path.rpartition("/")
+    if sep:
+        return name
+    head, sep, name = path.rpartition(":")
+    if sep:
+        return name or path.rstrip(":")
     return path
 
 
+def _amiga_dirname(path):
+    """Return the directory containing an Amiga path.
+
+    Examples:
+        SYS:S/Startup-Sequence -> SYS:S
+        RAM:test.txt -> RAM:
+        Work: -> Work:  (volume root is its own parent)
+    """
+    head, sep, _ = path.rpartition("/")
+    if sep:
+        return head
+    head, sep, _ = path.rpartition(":")
+    if sep:
+        return head + sep
+    return ""
+
+
+@functools.lru_cache(maxsize=1024)
 def _normalize_dotdot(path):
     """Resolve .. segments in a relative path for Amiga compatibility.
 
     Leading .. segments become Amiga / parent navigation.
     Mid-path .. segments are resolved by popping the preceding segment.
     Single . segments are removed.
+
+    A path with no . or .. segment is returned unchanged (including any
+    leading / Amiga parent navigation).
     """
+    bounded = "/" + path + "/"
+    if "/./" not in bounded and "/../" not in bounded:
+        return path
     parts = path.split("/")
     resolved = []
     leading_parents = 0
@@ -172,12 +221,55 @@ def _normalize_dotdot(path):
     return prefix + "/".join(resolved)
 
 
+# The characters shlex splits on.  str.split() would also split on
+# others, such as the no-break space, which can appear in Amiga names.
+_ARG_SEP_RE = re.compile("[ \t\r\n]+")
+
+
+def _split_args(arg):
+    """Split a command argument string like shlex.split().
+
+    Arguments without quotes or backslashes -- nearly all of them --
+    are split on whitespace directly instead of going through shlex's
+    character-by-character lexer.
+    """
+    if '"' in arg or "'" in arg or "\\" in arg:
+        return shlex.split(arg)
+    arg = arg.strip(" \t\r\n")
+    if not arg:
+        return []
+    return _ARG_SEP_RE.split(arg)
+
+
+def _write_lines(lines):
+    """Write a list of output lines to stdout in a single call."""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+
 _ANSI_RE = re.compile(r'\033\[[0-9;]*m')
 
 
 def _visible_len(s):
     """Return display width of string, ignoring ANSI escape codes."""
-    return len(_ANSI_RE.sub('', s))
+    if "\033" not in s:
+        return len(s)
+    # Subtract the escape sequences rather than building a stripped copy
+    escapes = 0
+    for m in _ANSI_RE.finditer(s):
+        escapes += m.end() - m.start()
+    return len(s) - escapes
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_glob(pattern):
+    """Compile a glob pattern to a case-insensitive regex, memoized.
+
+    Matching an entry is then a single .match() on the compiled regex
+    instead of fnmatch.fnmatch()'s per-call cache lookup, and the regex
+    engine folds case, so names need not be lowercased first.
+    """
+    return re.compile(fnmatch.translate(pattern), re.IGNORECASE)
 
 
 def _find_filter(entries, pattern, type_filter=None):
@@ -189,22 +281,36 @@ def _find_filter(entries, pattern, type_filter=None):
 
     Returns matching entries. Matching is case-insensitive.
     """
-    pattern_lower = pattern.lower()
-    result = []
+    return list(_iter_find_filter(entries, pattern, type_filter))
+
+
+def _iter_find_filter(entries, pattern, type_filter=None):
+    """Yield the entries _find_filter() would return, as they are seen.
+
+    entries may be any iterable, such as conn.iter_dir(), so matches
+    can be reported while a recursive listing is still arriving.
+    """
+    match = _compile_glob(pattern).match
     for entry in entries:
         if type_filter == "f" and entry["type"].lower() == "dir":
             continue
         if type_filter == "d" and entry["type"].lower() != "dir":
             continue
-        name = entry["name"]
-        # Match against basename only (last component)
-        if "/" in name:
-            basename = name.rsplit("/", 1)[1]
-        else:
-            basename = name
-        if fnmatch.fnmatch(basename.lower(), pattern_lower):
-            result.append(entry)
-    return result
+        # Match against basename only (last component); rpartition
+        # returns the whole name when there is no "/"
+        if match(entry["name"].rpartition("/")[2]) is not None:
+            yield entry
+
+
+class _TreeNode:
+    """One file or directory in a tree built by _build_tree()."""
+
+    __slots__ = ("name", "type", "children")
+
+    def __init__(self, name, type_):
+        self.name = name
+        self.type = type_
+        self.children = []
 
 
 def _build_tree(entries):
@@ -212,58 +318,55 @@ def _build_tree(entries):
 
     entries     List of dir entry dicts with relative path names.
 
-    Returns a list of root-level nodes. Each node is a dict:
-        {'name': str, 'type': str, 'children': []}
+    Returns a list of root-level _TreeNode objects, each with name,
+    type (lowercased) and children (a list of _TreeNode).
+
+    Entries are inserted in a single pass, in any order; children are
+    left unsorted (_format_tree orders them for display).
     """
     root_children = []
     # Map from directory path to its children list for fast lookup
-    dir_map = {}
-    dir_map[""] = root_children
-
-    # Sort entries so directories come before their contents
-    sorted_entries = sorted(entries, key=lambda e: e["name"].lower())
+    dir_map = {"": root_children}
 
-    for entry in sorted_entries:
+    for entry in entries:
         name = entry["name"]
-        if "/" in name:
-            parent_path, basename = name.rsplit("/", 1)
-        else:
-            parent_path = ""
-            basename = name
-
-        node = {
-            "name": basename,
-            "type": entry["type"].lower(),
-            "children": [],
-        }
-
-        # Ensure parent exists in dir_map
-        if parent_path not in dir_map:
-            # Create intermediate directory nodes as needed
-            parts = parent_path.split("/")
-            current = ""
-            for part in parts:
-                prev = current
-                current = part if not current else current + "/" + part
-                if current not in dir_map:
-                    intermediate = {
-                        "name": part,
-                        "type": "dir",
-                        "children": [],
-                    }
-                    dir_map[current] = intermediate["children"]
-                    parent_list = dir_map.get(prev, root_children)
-                    parent_list.append(intermediate)
-
-        parent_list = dir_map.get(parent_path, root_children)
+        parent_path, _, basename = name.rpartition("/")
+        node_type = entry["type"].lower()
+
+        if node_type == "dir" and name in dir_map:
+            continue  # Already created as an intermediate directory
+
+        parent_list = dir_map.get(parent_path)
+        if parent_list is None:
+            # Create missing intermediate directories, nearest existing
+            # ancestor first
+            missing = []
+            path = parent_path
+            while path not in dir_map:
+                missing.append(path)
+                path = path.rpartition("/")[0]
+            for path in reversed(missing):
+                head, _, tail = path.rpartition("/")
+                intermediate = _TreeNode(tail, "dir")
+                dir_map[head].append(intermediate)
+                dir_map[path] = intermediate.children
+            parent_list = dir_map[parent_path]
+
+        node = _TreeNode(basename, node_type)
         parent_list.append(node)
 
-        if node["type"] == "dir":
-            dir_map[name] = node["children"]
+        if node_type == "dir":
+            dir_map[name] = node.children
 
     return root_children
 
 
+# Tree-drawing strings: (branch, last_branch, vertical, blank)
+_TREE_UNICODE = ("\u251c\u2500\u2500 ", "\u2514\u2500\u2500 ",
+                 "\u2502   ", "    ")
+_TREE_ASCII = ("|-- ", "`-- ", "|   ", "    ")
+
+
 def _format_tree(root_name, tree, dirs_only=False, ascii_mode=False):
     """Render a tree structure as a list of display lines.
 
@@ -275,68 +378,191 @@ def _format_tree(root_name, tree, dirs_only=False, ascii_mode=False):
     Returns (lines, dir_count, file_count) where lines is a list of
     strings and the counts are totals across the entire tree.
     """
-    if ascii_mode:
-        branch = "|-- "
-        last_branch = "`-- "
-        vertical = "|   "
-        blank = "    "
-    else:
-        branch = "\u251c\u2500\u2500 "
-        last_branch = "\u2514\u2500\u2500 "
-        vertical = "\u2502   "
-        blank = "    "
+    branch, last_branch, vertical, blank = (
+        _TREE_ASCII if ascii_mode else _TREE_UNICODE)
 
     lines = [root_name]
     dir_count = 0
     file_count = 0
 
-    def _walk(children, prefix):
-        nonlocal dir_count, file_count
-        # Filter if dirs_only
+    # Depth-first walk with an explicit stack of (node, prefix, is_last).
+    # Each directory's children are pushed in reverse so they pop in
+    # display order.
+    stack = []
+
+    def _push(children, prefix):
         if dirs_only:
-            visible = [c for c in children if c["type"] == "dir"]
+            visible = [c for c in children if c.type == "dir"]
         else:
             visible = list(children)
+        visible.sort(key=lambda c: c.name.lower())
+        visible.reverse()
+        if visible:
+            stack.append((visible[0], prefix, True))
+            stack.extend((node, prefix, False) for node in visible[1:])
+
+    _push(tree, "")
+    while stack:
+        node, prefix, is_last = stack.pop()
+        connector = last_branch if is_last else branch
+        lines.append(prefix + connector + node.name)
+
+        if node.type == "dir":
+            dir_count += 1
+            _push(node.children, prefix + (blank if is_last else vertical))
+        else:
+            file_count += 1
 
-        for i, node in enumerate(visible):
-            is_last = (i == len(visible) - 1)
-            connector = last_branch if is_last else branch
+    return lines, dir_count, file_count
 
-            lines.append(prefix + connector + node["name"])
 
-            if node["type"] == "dir":
-                dir_count += 1
-                child_prefix = prefix + (blank if is_last else vertical)
-                _walk(node["children"], child_prefix)
-            else:
-                file_count += 1
+# Line breaks other than LF that str.splitlines() also splits on
+_OTHER_EOL_RE = re.compile("[\r\x0b\x0c\x1c-\x1e\x85\u2028\u2029]")
 
-    _walk(tree, "")
-    return lines, dir_count, file_count
+# Regex constructs whose meaning depends on whether the text beyond the
+# current line is visible to the matcher
+_LINE_SENSITIVE_RE = ("\\A", "\\Z", "(?=", "(?!", "(?<")
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_grep(pattern, is_regex=False, ignore_case=False,
+                  multiline=False):
+    """Compile a grep pattern, caching it across files and commands.
+
+    Raises re.error if a regex pattern is invalid.
+    """
+    flags = re.IGNORECASE if ignore_case else 0
+    if multiline:
+        flags |= re.MULTILINE
+    if not is_regex:
+        pattern = re.escape(pattern)
+    return re.compile(pattern, flags)
+
+
+# grep flag character -> the options it turns on
+_GREP_FLAGS = {
+    "E": ("regex",),
+    "i": ("ignore_case",),
+    "r": ("recursive",),
+    "n": ("show_lines",),
+    "c": ("count_only",),
+    "l": ("list_only", "recursive"),  # -l implies -r
+}
+
+# _OTHER_EOL_RE for undecoded ISO-8859-1 text
+_OTHER_EOL_BYTES_RE = re.compile(b"[\r\x0b\x0c\x1c-\x1e\x85]")
 
 
 def _grep_lines(text, pattern, is_regex=False, ignore_case=False):
     """Search text for lines matching a pattern.
 
-    text         Content as a string.
+    text         Content as a string, or raw ISO-8859-1 bytes.
     pattern      Search pattern (literal string or regex).
     is_regex     If True, compile pattern as regex; otherwise escape it.
     ignore_case  If True, match case-insensitively.
 
     Returns list of (line_number, line_text) tuples. line_number is
-    1-based.
+    1-based.  See _iter_grep_lines() to consume matches lazily.
     """
-    flags = re.IGNORECASE if ignore_case else 0
-    if is_regex:
-        compiled = re.compile(pattern, flags)
-    else:
-        compiled = re.compile(re.escape(pattern), flags)
+    return list(_iter_grep_lines(text, pattern, is_regex, ignore_case))
+
+
+def _iter_grep_lines(text, pattern, is_regex=False, ignore_case=False):
+    """Yield (line_number, line_text) for each line matching a pattern.
+
+    Arguments are as for _grep_lines().  Matches are found lazily, so
+    a caller that stops early (grep -l) never scans the rest of text.
 
-    results = []
-    for i, line in enumerate(text.splitlines(), 1):
-        if compiled.search(line):
-            results.append((i, line))
-    return results
+    For LF-delimited text the pattern is run over the whole string in
+    MULTILINE mode and only the lines holding a hit are sliced out, so
+    non-matching lines are never split into separate strings.  A
+    case-sensitive literal pattern is located with str.find() instead
+    of the regex engine.  Given bytes and a literal pattern, the search
+    runs on the bytes and only matching lines are decoded.
+    """
+    if isinstance(text, bytes):
+        needle = None
+        # Regex classes and case folding differ between bytes and str
+        # patterns, so only literals (ASCII ones when ignoring case)
+        # are searched undecoded
+        if not is_regex and _OTHER_EOL_BYTES_RE.search(text) is None:
+            try:
+                needle = pattern.encode(
+                    "ascii" if ignore_case else "iso-8859-1")
+            except UnicodeEncodeError:
+                pass
+        if needle is None:
+            text = text.decode("iso-8859-1")
+        else:
+            for lineno, line in _grep_scan(
+                    text, needle, False, ignore_case, b"\n"):
+                yield lineno, line.decode("iso-8859-1")
+            return
+
+    if (_OTHER_EOL_RE.search(text) is not None
+            or (is_regex and any(tok in pattern
+                                 for tok in _LINE_SENSITIVE_RE))):
+        # Fall back to matching line by line
+        lines = enumerate(text.splitlines(), 1)
+        if not is_regex and not ignore_case:
+            for i, line in lines:
+                if pattern in line:
+                    yield i, line
+        else:
+            search = _compile_grep(pattern, is_regex, ignore_case).search
+            for i, line in lines:
+                if search(line):
+                    yield i, line
+        return
+
+    yield from _grep_scan(text, pattern, is_regex, ignore_case, "\n")
+
+
+def _grep_scan(text, pattern, is_regex, ignore_case, nl):
+    """Run the whole-text line search for _iter_grep_lines.
+
+    text and pattern are both str or both bytes; nl is the matching LF.
+    Yields (line_number, line) pairs.
+    """
+    literal = not is_regex and not ignore_case
+    if literal:
+        find = text.find
+        plen = len(pattern)
+    else:
+        search = _compile_grep(
+            pattern, is_regex, ignore_case, multiline=True).search
+    end_of_text = len(text)
+    lineno = 1
+    counted = 0  # newlines before this offset are included in lineno
+    pos = 0
+    while pos < end_of_text:
+        if literal:
+            hit = find(pattern, pos)
+            if hit < 0:
+                break
+            hit_end = hit + plen
+        else:
+            m = search(text, pos)
+            if m is None:
+                break
+            hit, hit_end = m.span()
+        # The line containing the hit; a hit on an LF belongs to the
+        # line that LF terminates
+        start = max(text.rfind(nl, pos, hit) + 1, pos)
+        if start == end_of_text:
+            break  # Empty "line" after a trailing LF
+        end = text.find(nl, hit)
+        if end < 0:
+            end = end_of_text
+        lineno += text.count(nl, counted, start)
+        counted = start
+        line = text[start:end]
+        # A hit that runs past the end of the line must be confirmed on
+        # the line alone
+        if hit_end <= end or (pattern in line if literal
+                              else search(line) is not None):
+            yield lineno, line
+        pos = end + 1
 
 
 def _du_accumulate(entries):
@@ -348,39 +574,19 @@ def _du_accumulate(entries):
     (directory_path, size) tuples with per-directory subtotals
     (including all descendants), and total is the grand total.
     """
-    dir_totals = {}  # directory path -> accumulated size
-    dir_totals["."] = 0  # root directory
+    # directory path -> size of everything beneath it; each entry's
+    # size is added to every ancestor in one walk up its path
+    propagated = {".": 0}
 
     for entry in entries:
         name = entry["name"]
         size = entry["size"]
 
-        if "/" in name:
-            parent = name.rsplit("/", 1)[0]
-        else:
-            parent = "."
-
-        if parent not in dir_totals:
-            dir_totals[parent] = 0
-        dir_totals[parent] += size
-
-    # Build result: propagate subdirectory sizes upward
-    # Sort by depth (deepest first) so children are processed before parents
-    sorted_dirs = sorted(dir_totals.keys(),
-                         key=lambda d: d.count("/"), reverse=True)
-
-    # Propagate: add each dir's total into its parent
-    propagated = dict(dir_totals)
-    for d in sorted_dirs:
-        if d == ".":
-            continue
-        if "/" in d:
-            parent = d.rsplit("/", 1)[0]
-        else:
-            parent = "."
-        if parent not in propagated:
-            propagated[parent] = 0
-        propagated[parent] += propagated[d]
+        parent = name.rpartition("/")[0]
+        while parent:
+            propagated[parent] = propagated.get(parent, 0) + size
+            parent = parent.rpartition("/")[0]
+        propagated["."] += size
 
     # Build output list sorted alphabetically, "." first
     result = []
@@ -405,40 +611,148 @@ class _DirCache:
     def __init__(self, ttl=5.0, max_entries=100):
         self.ttl = ttl
         self.max_entries = max_entries
-        self._cache = {}  # resolved_path -> (timestamp, entries)
+        # resolved_path -> (timestamp, entries), least recently used first
+        self._cache = collections.OrderedDict()
+        # resolved_path -> (entries, names) for get_names()
+        self._names = {}
+        # (resolved_path, prefix_lower) -> (names, matches) for
+        # get_matches(), least recently used first
+        self._matches = collections.OrderedDict()
+        # Lowercased names of mounted volumes, or None if not known
+        self.volumes = None
 
     def get(self, conn, resolved_path):
         """Return DIR entries for resolved_path, using cache if fresh.
 
         resolved_path must be an absolute Amiga path (volume-qualified).
         """
-        import time
         now = time.monotonic()
-        if resolved_path in self._cache:
-            ts, entries = self._cache[resolved_path]
-            if now - ts < self.ttl:
-                return entries
+        cached = self._cache.get(resolved_path)
+        if cached is not None and now - cached[0] < self.ttl:
+            self._cache.move_to_end(resolved_path)
+            return cached[1]
         try:
             entries = conn.dir(resolved_path)
-            # Evict oldest entry if cache is full
+            # Evict the least recently used entry if cache is full
+            self._cache.pop(resolved_path, None)
             if len(self._cache) >= self.max_entries:
-                oldest_key = min(
-                    self._cache, key=lambda k: self._cache[k][0])
-                del self._cache[oldest_key]
+                evicted, _ = self._cache.popitem(last=False)
+                self._names.pop(evicted, None)
             self._cache[resolved_path] = (now, entries)
             return entries
         except Exception:
             return []
 
-    def invalidate(self):
-        """Clear the entire cache."""
-        self._cache.clear()
+    def get_names(self, conn, resolved_path):
+        """Return (name, name_lower, is_dir) for each entry of resolved_path.
+
+        The lowercased names are computed once per DIR result and kept
+        alongside it, so repeated completions in the same directory
+        only compare prefixes.
+        """
+        entries = self.get(conn, resolved_path)
+        cached = self._names.get(resolved_path)
+        if cached is not None and cached[0] is entries:
+            return cached[1]
+        names = []
+        for entry in entries:
+            name = entry.get("name", "")
+            names.append((name, name.lower(),
+                          entry.get("type", "").lower() == "dir"))
+        if resolved_path in self._cache:
+            self._names[resolved_path] = (entries, names)
+        return names
+
+    def get_matches(self, conn, resolved_path, prefix_lower):
+        """Return (name, is_dir) for entries starting with prefix_lower.
+
+        prefix_lower must already be lowercased.  Results are kept for
+        the last 32 (directory, prefix) pairs and reused while the
+        directory's cached entries are unchanged, so pressing TAB again
+        on the same word does not rescan the directory.
+        """
+        names = self.get_names(conn, resolved_path)
+        key = (resolved_path, prefix_lower)
+        cached = self._matches.get(key)
+        if cached is not None and cached[0] is names:
+            self._matches.move_to_end(key)
+            return cached[1]
+        matches = [(name, is_dir) for name, name_lower, is_dir in names
+                   if name_lower.startswith(prefix_lower)]
+        if resolved_path in self._cache:
+            self._matches[key] = (names, matches)
+            self._matches.move_to_end(key)
+            if len(self._matches) > 32:
+                self._matches.popitem(last=False)
+        return matches
+
+    def invalidate(self, path=None):
+        """Drop cached listings affected by a change to path.
+
+        With a path, only the listing of its parent directory and of
+        path itself (and anything below it, in case it is a directory)
+        are dropped.  Without one the entire cache is cleared.
+
+        Scoping by path only works between names of real volumes: C:foo
+        and SYS:C/foo may be the same file.  So if path is on an assign
+        or device name, or volumes is not known, everything is cleared,
+        and listings cached under such names are always dropped.
+        """
+        if path is None or not self._on_volume(path):
+            self._cache.clear()
+            self._names.clear()
+            self._matches.clear()
+            if path is None:
+                self.volumes = None
+            return
+        target = path.rstrip("/").lower()
+        parent = _amiga_dirname(target)
+        if target.endswith(":"):
+            below = target
+        else:
+            below = target + "/"
+
+        def affected(key):
+            if not self._on_volume(key):
+                return True
+            key = key.rstrip("/").lower()
+            return (key == parent or key == target
+                    or key.startswith(below))
+
+        for key in [k for k in self._cache if affected(k)]:
+            del self._cache[key]
+            self._names.pop(key, None)
+        for key in [k for k in self._matches if affected(k[0])]:
+            del self._matches[key]
+
+    def _on_volume(self, path):
+        """Return True if path starts with the name of a known volume."""
+        name, sep, _ = path.partition(":")
+        return bool(sep) and self.volumes is not None \
+            and name.lower() in self.volumes
 
 
 # ---------------------------------------------------------------------------
 # Interactive shell
 # ---------------------------------------------------------------------------
 
+# Line breaks in pasted text.  readline clears ICRNL, so lines pasted
+# while it is reading arrive with bare CR terminators
+_PASTE_LINE_RE = re.compile("\r\n?|\n")
+
+# Bytes taken from the terminal per read() when draining a paste
+_PASTE_READ_SIZE = 1024
+
+# AmigaConnection queries that only read state.  Repeating one after the
+# connection dropped mid-request cannot apply anything twice.
+_RETRY_SAFE = frozenset((
+    "assigns", "capabilities", "checksum", "devices", "dir", "env",
+    "libver", "ping", "ports", "proclist", "procstat", "read",
+    "read_with_stat", "stat", "sysinfo", "tasks", "trace_status",
+    "uptime", "version", "volumes",
+))
+
+
 class AmigaShell(cmd.Cmd):
     """Interactive shell for communicating with an amigactld daemon."""
 
@@ -455,6 +769,16 @@ class AmigaShell(cmd.Cmd):
         self.cwd = None  # Current working directory (Amiga path)
         self._dir_cache = _DirCache()
         self._editor = editor  # from config file; None = use env/default
+        # Connection on which SYS: was last confirmed to be a directory;
+        # a new or lost connection no longer matches it
+        self._sys_verified = None
+        # Query method name -> (conn, timestamp, result) for _cached_run
+        self._cmd_cache = {}
+        # readline module once preloop() has configured it, else None
+        self._readline = None
+        # One flag per line this shell put on cmdqueue: True if the line
+        # was never displayed and must be echoed when it is dispatched
+        self._paste_echo = collections.deque()
 
     # -- Lifecycle ---------------------------------------------------------
 
@@ -480,6 +804,7 @@ class AmigaShell(cmd.Cmd):
                 pass
             import atexit
             atexit.register(readline.write_history_file, histfile)
+            self._readline = readline
         except ImportError:
             pass
 
@@ -492,8 +817,12 @@ class AmigaShell(cmd.Cmd):
             info = self.conn.stat("SYS:")
             if info.get("type", "").lower() == "dir":
                 self.cwd = "SYS:"
+                self._sys_verified = self.conn
         except Exception:
             pass  # Leave cwd as None if SYS: unreachable
+        if self.cwd is not None:
+            # Warm the completion cache so the first TAB needs no DIR
+            self._dir_cache.get(self.conn, self.cwd)
         self._update_prompt()
 
     def postloop(self):
@@ -503,6 +832,73 @@ class AmigaShell(cmd.Cmd):
             self.conn = None
         print("Disconnected.")
 
+    def precmd(self, line):
+        """Split pasted input into one command per line.
+
+        A bracketed paste makes input() return several lines at once, and
+        without one the lines after the first are left unread on the
+        terminal.  Both kinds are put on cmdqueue, so cmd.Cmd dispatches
+        a whole paste without a readline round trip per line.
+        """
+        if len(self._paste_echo) > len(self.cmdqueue):
+            # This line was just taken off cmdqueue
+            if self._paste_echo.popleft():
+                print(self.prompt + line)
+            if self._readline is not None and line:
+                self._readline.add_history(line)
+        if line == "EOF":
+            return line
+        lines = _PASTE_LINE_RE.split(line)
+        line = lines[0]
+        self._queue_paste(lines[1:], echo=False)
+        # libedit builds may lack the hook that re-displays a partial line
+        if hasattr(self._readline, "set_pre_input_hook"):
+            self._drain_paste()
+        return line
+
+    def _queue_paste(self, lines, echo):
+        """Append pasted lines to cmdqueue, dropping a final empty one."""
+        if lines and not lines[-1]:
+            lines = lines[:-1]
+        self.cmdqueue.extend(lines)
+        self._paste_echo.extend([echo] * len(lines))
+
+    def _drain_paste(self):
+        """Queue complete lines already waiting on an interactive stdin.
+
+        Reads the terminal directly in _PASTE_READ_SIZE chunks for as
+        long as input is pending.  A trailing partial line is placed in
+        the next prompt's edit buffer.
+        """
+        try:
+            if not sys.stdin.isatty():
+                return
+            fd = sys.stdin.fileno()
+            chunks = []
+            while select.select([fd], [], [], 0)[0]:
+                chunk = os.read(fd, _PASTE_READ_SIZE)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        except (OSError, ValueError):
+            return
+        if not chunks:
+            return
+        text = b"".join(chunks).decode(
+            sys.stdin.encoding or "utf-8", errors="replace")
+        lines = _PASTE_LINE_RE.split(text)
+        partial = lines.pop()
+        self._queue_paste(lines, echo=True)
+        if partial:
+            readline = self._readline
+
+            def prefill():
+                readline.insert_text(partial)
+                readline.redisplay()
+                readline.set_pre_input_hook()
+
+            readline.set_pre_input_hook(prefill)
+
     def _update_prompt(self):
         """Update the prompt to reflect connection state and CWD."""
         if self.conn is None:
@@ -521,14 +917,38 @@ class AmigaShell(cmd.Cmd):
         For functions that return None on success (e.g. delete, makedir),
         returns the sentinel string "ok" to distinguish from error.
         """
+        conn = self.conn
+        bound = conn is not None and getattr(func, "__self__", None) is conn
         try:
-            result = func(*args, **kwargs)
+            if conn is not None and conn.peer_closed():
+                # The daemon (or something in between) closed the idle
+                # connection.  Nothing has been sent yet, so replace it
+                # quietly and run the command on the new one.
+                if self._reconnect() and bound:
+                    func = getattr(self.conn, func.__name__)
+            try:
+                result = func(*args, **kwargs)
+            except (BrokenPipeError, ConnectionResetError,
+                    ConnectionLostError):
+                # Dropped without notice, so it was only found out by this
+                # request.  A read-only query is safe to repeat; anything
+                # else may have been partly carried out, and a closure may
+                # already have printed output.
+                if not (bound and func.__name__ in _RETRY_SAFE
+                        and self._reconnect()):
+                    raise
+                result = getattr(self.conn, func.__name__)(*args, **kwargs)
             if result is None:
                 return "ok"
             return result
         except AmigactlError as e:
             print(self.cw.error("Error: {}".format(e.message)))
             return None
+        except ConnectionLostError as e:
+            print(self.cw.error("Connection error: {}".format(e)))
+            self.conn = None
+            self._update_prompt()
+            return None
         except ProtocolError as e:
             print(self.cw.error("Protocol error: {}".format(e)))
             return None
@@ -539,6 +959,68 @@ class AmigaShell(cmd.Cmd):
             self._update_prompt()
             return None
 
+    def _cached_run(self, name, ttl=1.0):
+        """Like _run for the argument-less, read-only query method name.
+
+        A result fetched from the same connection within the last ttl
+        seconds is reused instead of making another round trip.
+        Commands that change system state clear the cache.
+        """
+        cached = self._cmd_cache.get(name)
+        now = time.monotonic()
+        if (cached is not None and cached[0] is self.conn
+                and now - cached[1] < ttl):
+            return cached[2]
+        result = self._run(getattr(self.conn, name))
+        if result is not None:
+            self._cmd_cache[name] = (self.conn, now, result)
+        return result
+
+    def _reconnect(self):
+        """Silently replace a dropped connection with a fresh one.
+
+        Returns True on success.  On failure the old connection object is
+        left in place so the caller's error handling runs unchanged.
+        """
+        conn = AmigaConnection(self.host, self.port, self.timeout)
+        try:
+            conn.connect()
+        except Exception:
+            return False
+        # The old socket is already dead; close it directly rather than
+        # waiting on a QUIT round-trip.
+        old_sock = getattr(self.conn, "_sock", None)
+        if old_sock is not None:
+            try:
+                old_sock.close()
+            except OSError:
+                pass
+            self.conn._sock = None
+        self.conn = conn
+        self._dir_cache.invalidate()
+        return True
+
+    def _invalidate(self, path):
+        """Drop cached state that a change to path may have made stale.
+
+        Besides the listings under path, cached query results such as
+        volume free space are cleared.
+        """
+        if self._dir_cache.volumes is None:
+            # Volume names scope the invalidation; see _DirCache
+            cached = self._cmd_cache.get("volumes")
+            try:
+                if cached is not None and cached[0] is self.conn:
+                    volumes = cached[2]
+                else:
+                    volumes = self.conn.volumes()
+                self._dir_cache.volumes = {
+                    v["name"].lower() for v in volumes}
+            except Exception:
+                pass
+        self._dir_cache.invalidate(path)
+        self._cmd_cache.clear()
+
     # -- Helpers -----------------------------------------------------------
 
     def _check_connected(self):
@@ -561,6 +1043,8 @@ class AmigaShell(cmd.Cmd):
 
     def _validate_path(self, path):
         """Validate that a path can be encoded to ISO-8859-1."""
+        if path.isascii():
+            return True  # ASCII is a subset; skip the encode
         try:
             path.encode("iso-8859-1")
         except UnicodeEncodeError as e:
@@ -599,9 +1083,7 @@ class AmigaShell(cmd.Cmd):
             return user_path  # Let daemon reject it
 
         # Translate Unix .. and . to Amiga path conventions
-        segments = user_path.split("/")
-        if any(s == ".." or s == "." for s in segments):
-            user_path = _normalize_dotdot(user_path)
+        user_path = _normalize_dotdot(user_path)
 
         return _join_amiga_path(self.cwd, user_path)
 
@@ -653,21 +1135,12 @@ class AmigaShell(cmd.Cmd):
             # Absolute path
             resolved_dir = dir_to_query
 
-        # Query directory (cache uses resolved absolute path as key)
-        entries = self._dir_cache.get(self.conn, resolved_dir)
-
-        # Filter by name prefix (case-insensitive, Amiga FS)
-        prefix_lower = name_prefix.lower()
-        results = []
-        for entry in entries:
-            name = entry.get("name", "")
-            if name.lower().startswith(prefix_lower):
-                if entry.get("type", "").lower() == "dir":
-                    results.append(dir_prefix + name + "/")
-                else:
-                    results.append(dir_prefix + name)
-
-        return results
+        # Query directory and filter by name prefix (case-insensitive,
+        # Amiga FS); the cache uses resolved absolute path as key
+        matches = self._dir_cache.get_matches(
+            self.conn, resolved_dir, name_prefix.lower())
+        return [dir_prefix + name + "/" if is_dir else dir_prefix + name
+                for name, is_dir in matches]
 
     def _complete_local_path(self, text):
         """Tab-complete a local filesystem path."""
@@ -777,10 +1250,15 @@ class AmigaShell(cmd.Cmd):
         if not path:
             if not self._check_connected():
                 return
+            if self._sys_verified is self.conn:
+                self.cwd = "SYS:"
+                self._update_prompt()
+                return
             try:
                 info = self.conn.stat("SYS:")
                 if info.get("type", "").lower() == "dir":
                     self.cwd = "SYS:"
+                    self._sys_verified = self.conn
                     self._update_prompt()
                     return
             except Exception:
@@ -857,7 +1335,7 @@ class AmigaShell(cmd.Cmd):
         ls S*"""
         if not self._check_connected():
             return
-        parts = shlex.split(arg) if arg.strip() else []
+        parts = _split_args(arg)
         recursive = False
         long_format = False
         path_parts = []
@@ -897,23 +1375,22 @@ class AmigaShell(cmd.Cmd):
         if has_glob:
             # Glob mode: split resolved path into parent directory + pattern
             # and filter the parent's contents.
-            if "/" in path:
-                parent, pattern = path.rsplit("/", 1)
-            elif ":" in path:
-                parent, pattern = path.split(":", 1)
-                parent += ":"
-            else:
-                # Relative pattern with no separator -- list CWD
-                parent = self.cwd if self.cwd is not None else ""
-                pattern = path
+            parent, sep, pattern = path.rpartition("/")
+            if not sep:
+                if ":" in path:
+                    parent, pattern = path.split(":", 1)
+                    parent += ":"
+                else:
+                    # Relative pattern with no separator -- list CWD
+                    parent = self.cwd if self.cwd is not None else ""
 
             all_entries = self._run(self.conn.dir, parent)
             if all_entries is None:
                 return
-            pattern_lower = pattern.lower()
+            match = _compile_glob(pattern).match
             entries = [
                 e for e in all_entries
-                if fnmatch.fnmatch(e["name"].lower(), pattern_lower)
+                if match(e["name"]) is not None
             ]
             if not entries:
                 print("No match.")
@@ -950,86 +1427,72 @@ class AmigaShell(cmd.Cmd):
             return
 
         if long_format:
-            # Detailed format (existing behavior)
-            max_name = 0
-            max_size = 0
-            max_prot = 0
-            for entry in entries:
-                name_len = len(entry["name"])
-                if name_len > max_name:
-                    max_name = name_len
-                size_str = format_size(entry["size"])
-                size_len = len(size_str)
-                if size_len > max_size:
-                    max_size = size_len
-                prot_str = _format_protection(entry["protection"])
-                prot_len = len(prot_str)
-                if prot_len > max_prot:
-                    max_prot = prot_len
-
+            # Detailed format (existing behavior).  Format each entry
+            # once; directory sizes still count toward the size column
+            # width even though they are printed blank.
+            rows = []
             for entry in entries:
-                is_dir = entry["type"].lower() == "dir"
-                name = entry["name"]
-                date = entry["datestamp"]
-
+                rows.append((
+                    entry["name"],
+                    _format_protection(entry["protection"]),
+                    format_size(entry["size"]),
+                    entry["datestamp"],
+                    entry["type"].lower() == "dir",
+                ))
+            max_name = max(len(r[0]) for r in rows)
+            max_prot = max(len(r[1]) for r in rows)
+            max_size = max(len(r[2]) for r in rows)
+
+            dir_tag = self.cw.directory("  DIR")
+            out = []
+            for name, prot_str, size_str, date, is_dir in rows:
                 if is_dir:
-                    tag = self.cw.directory("  DIR")
+                    tag = dir_tag
+                    size_str = ""
                 else:
                     tag = "     "
-
-                prot_str = _format_protection(entry["protection"])
-                if is_dir:
-                    print("{tag}  {name:<{nw}}  {prot:>{pw}}  "
-                          "{blank:>{sw}}  {date}".format(
-                              tag=tag,
-                              name=name, nw=max_name,
-                              prot=prot_str, pw=max_prot,
-                              blank="", sw=max_size,
-                              date=date))
-                else:
-                    size_str = format_size(entry["size"])
-                    print("{tag}  {name:<{nw}}  {prot:>{pw}}  "
-                          "{size:>{sw}}  {date}".format(
-                              tag=tag,
-                              name=name, nw=max_name,
-                              prot=prot_str, pw=max_prot,
-                              size=size_str, sw=max_size,
-                              date=date))
+                out.append("  ".join((
+                    tag,
+                    name.ljust(max_name),
+                    prot_str.rjust(max_prot),
+                    size_str.rjust(max_size),
+                    date,
+                )))
+            _write_lines(out)
         else:
-            # Multi-column names-only format
-            display_names = []
+            # Multi-column names-only format: (text, visible width)
+            directory = self.cw.directory
+            display = []
             for entry in entries:
-                is_dir = entry["type"].lower() == "dir"
                 name = entry["name"]
-                if is_dir:
-                    display_names.append(
-                        self.cw.directory(name + "/"))
+                if entry["type"].lower() == "dir":
+                    text = directory(name + "/")
+                    display.append((text, _visible_len(text)))
                 else:
-                    display_names.append(name)
+                    display.append((name, len(name)))
 
             # Calculate column layout
             term_width = shutil.get_terminal_size((80, 24)).columns
-            max_vis = max(
-                (_visible_len(n) for n in display_names), default=0)
+            max_vis = max((vis for _, vis in display), default=0)
             col_width = max_vis + 2  # 2-char gutter
             if col_width <= 0:
                 col_width = 1
+            count = len(display)
             num_cols = max(1, term_width // col_width)
-            num_rows = (len(display_names) + num_cols - 1) // num_cols
+            num_rows = (count + num_cols - 1) // num_cols
 
+            out = []
             for row in range(num_rows):
                 parts = []
-                for col in range(num_cols):
-                    idx = row + col * num_rows
-                    if idx < len(display_names):
-                        name = display_names[idx]
-                        vis = _visible_len(name)
-                        if col < num_cols - 1:
-                            padding = col_width - vis
-                            parts.append(name + " " * padding)
-                        else:
-                            parts.append(name)
-                print("".join(parts))
+                for idx in range(row, count, num_rows):
+                    name, vis = display[idx]
+                    # Pad only when another cell follows on this row
+                    if idx + num_rows < count:
+                        parts.append(name + " " * (col_width - vis))
+                    else:
+                        parts.append(name)
+                out.append("".join(parts))
+            _write_lines(out)
 
     def do_dir(self, arg):
         """List directory contents (alias for ls). See: help ls"""
@@ -1088,7 +1551,7 @@ class AmigaShell(cmd.Cmd):
         if not self._check_connected():
             return
         try:
-            parts = shlex.split(arg) if arg.strip() else []
+            parts = _split_args(arg)
         except ValueError as e:
             print("Parse error: {}".format(e))
             return
@@ -1131,8 +1594,19 @@ class AmigaShell(cmd.Cmd):
         if data is None:
             return
 
-        sys.stdout.buffer.write(data)
-        sys.stdout.buffer.flush()
+        try:
+            fd = sys.stdout.fileno()
+        except (AttributeError, OSError, ValueError):
+            # No descriptor (e.g. stdout replaced by an in-memory stream)
+            sys.stdout.buffer.write(data)
+            sys.stdout.buffer.flush()
+            return
+        # Hand the kernel the whole file at once rather than going
+        # through the BufferedWriter; flush earlier text output first.
+        sys.stdout.flush()
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
 
     # -- File transfer -----------------------------------------------------
 
@@ -1151,7 +1625,7 @@ class AmigaShell(cmd.Cmd):
         if not self._check_connected():
             return
         try:
-            parts = shlex.split(arg)
+            parts = _split_args(arg)
         except ValueError as e:
             print("Parse error: {}".format(e))
             return
@@ -1169,19 +1643,19 @@ class AmigaShell(cmd.Cmd):
             print("Usage: get REMOTE [LOCAL]")
             return
 
-        data = self._run(self.conn.read, remote)
-        if data is None:
-            return
-
         try:
-            with open(local, "wb") as f:
-                f.write(data)
+            f = open(local, "wb")
         except IOError as e:
             print(self.cw.error("Local write error: {}".format(e)))
             return
 
+        with f:
+            received = self._run(self.conn.read_stream, remote, f)
+        if received is None:
+            return
+
         print(self.cw.success(
-            "Downloaded {} bytes to {}".format(len(data), local)))
+            "Downloaded {} bytes to {}".format(received, local)))
 
     def do_put(self, arg):
         """Upload a file to the Amiga.
@@ -1198,7 +1672,7 @@ class AmigaShell(cmd.Cmd):
         if not self._check_connected():
             return
         try:
-            parts = shlex.split(arg)
+            parts = _split_args(arg)
         except ValueError as e:
             print("Parse error: {}".format(e))
             return
@@ -1217,17 +1691,22 @@ class AmigaShell(cmd.Cmd):
             return
 
         try:
-            with open(local, "rb") as f:
-                data = f.read()
+            f = open(local, "rb")
         except IOError as e:
             print(self.cw.error("Local read error: {}".format(e)))
             return
 
-        written = self._run(self.conn.write, remote, data)
+        def upload():
+            # Rewind in case _run retries after a reconnect
+            f.seek(0)
+            return self.conn.write_stream(remote, f)
+
+        with f:
+            written = self._run(upload)
         if written is None:
             return
 
-        self._dir_cache.invalidate()
+        self._invalidate(remote)
         print(self.cw.success(
             "Uploaded {} bytes to {}".format(written, remote)))
 
@@ -1244,7 +1723,7 @@ class AmigaShell(cmd.Cmd):
         if not self._check_connected():
             return
         try:
-            parts = shlex.split(arg)
+            parts = _split_args(arg)
         except ValueError as e:
             print("Parse error: {}".format(e))
             return
@@ -1258,19 +1737,24 @@ class AmigaShell(cmd.Cmd):
             return
 
         try:
-            with open(local, "rb") as f:
-                data = f.read()
+            f = open(local, "rb")
         except IOError as e:
             print(self.cw.error("Local read error: {}".format(e)))
             return
 
-        written = self._run(self.conn.append, remote, data)
+        def upload():
+            # Rewind in case _run retries after a reconnect
+            f.seek(0)
+            return self.conn.append_stream(remote, f)
+
+        with f:
+            written = self._run(upload)
         if written is None:
             return
 
         print(self.cw.success(
             "Appended {} bytes to {}".format(written, remote)))
-        self._dir_cache.invalidate()
+        self._invalidate(remote)
 
     def complete_append(self, text, line, begidx, endidx):
         """Complete append: first arg is local, second is Amiga path."""
@@ -1296,9 +1780,6 @@ class AmigaShell(cmd.Cmd):
     Examples:
         edit SYS:S/User-Startup
         edit Startup-Sequence"""
-        import subprocess
-        import tempfile
-
         path = arg.strip()
         if not path:
             print("Usage: edit PATH")
@@ -1309,21 +1790,12 @@ class AmigaShell(cmd.Cmd):
         if path is None:
             return
 
-        # 1. Get remote datestamp
+        # 1-2. Get remote datestamp and download in one round trip
         original_datestamp = None
-        try:
-            info = self.conn.stat(path)
-            original_datestamp = info.get("datestamp", "")
-        except NotFoundError:
-            pass  # New file
-        except (AmigactlError, ProtocolError, OSError) as e:
-            print(self.cw.error("Error checking file: {}".format(e)))
-            return
-
-        # 2. Download
         original_data = b""
         try:
-            original_data = self.conn.read(path)
+            info, original_data = self.conn.read_with_stat(path)
+            original_datestamp = info.get("datestamp", "")
         except NotFoundError:
             print("File does not exist. Creating new file.")
         except AmigactlError as e:
@@ -1339,14 +1811,17 @@ class AmigaShell(cmd.Cmd):
             return
 
         # 3. Write to temp file
+        # The filename goes last so editors still pick its extension.
         filename = _amiga_basename(path)
-        tmpdir = tempfile.mkdtemp(prefix="amigactl_edit_")
-        tmpfile = os.path.join(tmpdir, filename)
+        tmpfile = None
         try:
-            with open(tmpfile, "wb") as f:
+            with tempfile.NamedTemporaryFile(
+                    prefix="amigactl_edit_", suffix="_" + filename,
+                    delete=False) as f:
+                tmpfile = f.name
                 f.write(original_data)
 
-            saved_mtime = os.path.getmtime(tmpfile)
+            saved_mtime = os.stat(tmpfile).st_mtime_ns
 
             # 5. Launch editor
             if sys.platform == "win32":
@@ -1361,11 +1836,10 @@ class AmigaShell(cmd.Cmd):
             subprocess.call(editor_cmd)
 
             # 6. Check for local modifications
-            if os.path.getmtime(tmpfile) == saved_mtime:
+            if os.stat(tmpfile).st_mtime_ns == saved_mtime:
                 print("No changes detected.")
                 try:
                     os.remove(tmpfile)
-                    os.rmdir(tmpdir)
                 except OSError:
                     pass
                 return
@@ -1373,6 +1847,17 @@ class AmigaShell(cmd.Cmd):
             with open(tmpfile, "rb") as f:
                 new_data = f.read()
 
+            # Editors often rewrite the file on save even when nothing
+            # changed; skip the upload if the bytes are identical.  A
+            # new file is still created even when saved empty.
+            if original_datestamp is not None and new_data == original_data:
+                print("No changes detected.")
+                try:
+                    os.remove(tmpfile)
+                except OSError:
+                    pass
+                return
+
             old_size = len(original_data)
             new_size = len(new_data)
             print("File changed: {} -> {} bytes".format(old_size, new_size))
@@ -1403,7 +1888,7 @@ class AmigaShell(cmd.Cmd):
                         if answer != "y":
                             print("Upload cancelled.")
                             print("Local copy saved at: {}".format(tmpfile))
-                            return  # Don't clean up tmpdir
+                            return  # Don't clean up tmpfile
                 else:
                     # New file -- but it now exists (created by another
                     # process)
@@ -1420,7 +1905,7 @@ class AmigaShell(cmd.Cmd):
                     if answer != "y":
                         print("Upload cancelled.")
                         print("Local copy saved at: {}".format(tmpfile))
-                        return  # Don't clean up tmpdir
+                        return  # Don't clean up tmpfile
             except NotFoundError:
                 pass  # File still doesn't exist (new file) -- safe to upload
             except (AmigactlError, ProtocolError):
@@ -1437,13 +1922,15 @@ class AmigaShell(cmd.Cmd):
                 written = self.conn.write(path, new_data)
                 print(self.cw.success(
                     "Uploaded {} bytes to {}".format(written, path)))
-                self._dir_cache.invalidate()
+                self._invalidate(path)
             except AmigactlError as e:
                 print(self.cw.error(
                     "Upload failed: {}".format(e.message)))
                 print("Local copy preserved at: {}".format(tmpfile))
                 return
             except (ProtocolError, OSError) as e:
+                # The DATA/END framing may be out of step; don't reuse
+                # the connection
                 print(self.cw.error("Upload failed: {}".format(e)))
                 self.conn = None
                 self._update_prompt()
@@ -1452,14 +1939,13 @@ class AmigaShell(cmd.Cmd):
 
         except Exception as e:
             print(self.cw.error("Error: {}".format(e)))
-            if os.path.exists(tmpfile):
+            if tmpfile is not None and os.path.exists(tmpfile):
                 print("Local copy preserved at: {}".format(tmpfile))
             return  # Don't clean up on error
 
         # 12. Clean up
         try:
             os.remove(tmpfile)
-            os.rmdir(tmpdir)
         except OSError:
             pass
 
@@ -1488,7 +1974,7 @@ class AmigaShell(cmd.Cmd):
 
         result = self._run(self.conn.delete, path)
         if result is not None:
-            self._dir_cache.invalidate()
+            self._invalidate(path)
             print(self.cw.success("Deleted: {}".format(path)))
 
     def do_mv(self, arg):
@@ -1504,7 +1990,7 @@ class AmigaShell(cmd.Cmd):
         if not self._check_connected():
             return
         try:
-            parts = shlex.split(arg)
+            parts = _split_args(arg)
         except ValueError as e:
             print("Parse error: {}".format(e))
             return
@@ -1521,7 +2007,8 @@ class AmigaShell(cmd.Cmd):
 
         result = self._run(self.conn.rename, old, new)
         if result is not None:
-            self._dir_cache.invalidate()
+            self._invalidate(old)
+            self._invalidate(new)
             print(self.cw.success("Renamed: {} -> {}".format(old, new)))
 
     def do_mkdir(self, arg):
@@ -1546,7 +2033,7 @@ class AmigaShell(cmd.Cmd):
 
         result = self._run(self.conn.makedir, path)
         if result is not None:
-            self._dir_cache.invalidate()
+            self._invalidate(path)
             print(self.cw.success("Created: {}".format(path)))
 
     def do_cp(self, arg):
@@ -1565,7 +2052,7 @@ class AmigaShell(cmd.Cmd):
         if not self._check_connected():
             return
         try:
-            parts = shlex.split(arg) if arg.strip() else []
+            parts = _split_args(arg)
         except ValueError as e:
             print("Parse error: {}".format(e))
             return
@@ -1599,7 +2086,7 @@ class AmigaShell(cmd.Cmd):
         result = self._run(self.conn.copy, src, dst,
                            noclone=noclone, noreplace=noreplace)
         if result is not None:
-            self._dir_cache.invalidate()
+            self._invalidate(dst)
             print(self.cw.success("Copied: {} -> {}".format(src, dst)))
 
     do_copy = do_cp
@@ -1626,7 +2113,7 @@ class AmigaShell(cmd.Cmd):
         if not self._check_connected():
             return
         try:
-            parts = shlex.split(arg)
+            parts = _split_args(arg)
         except ValueError as e:
             print("Parse error: {}".format(e))
             return
@@ -1641,7 +2128,7 @@ class AmigaShell(cmd.Cmd):
 
         result = self._run(self.conn.protect, path, value)
         if result is not None:
-            self._dir_cache.invalidate()
+            self._invalidate(path)
             display = _format_protection(result)
             print("{}={}".format(
                 self.cw.key("protection"), display))
@@ -1664,7 +2151,7 @@ class AmigaShell(cmd.Cmd):
         if not self._check_connected():
             return
         try:
-            parts = shlex.split(arg)
+            parts = _split_args(arg)
         except ValueError as e:
             print("Parse error: {}".format(e))
             return
@@ -1682,54 +2169,23 @@ class AmigaShell(cmd.Cmd):
             print("Usage: touch PATH [DATE TIME]")
             return
 
-        try:
-            result = self.conn.setdate(path, datestamp)
-        except NotFoundError:
-            # File doesn't exist -- create it (Unix touch semantics)
+        def touch():
             try:
+                return self.conn.setdate(path, datestamp)
+            except NotFoundError:
+                # File doesn't exist -- create it (Unix touch semantics)
                 self.conn.write(path, b"")
-            except AmigactlError as e:
-                print(self.cw.error("Error: {}".format(e.message)))
-                return
-            except ProtocolError as e:
-                print(self.cw.error("Protocol error: {}".format(e)))
-                return
-            except OSError as e:
-                print(self.cw.error("Connection error: {}".format(e)))
-                self.conn = None
-                self._update_prompt()
-                return
-            if datestamp is not None:
-                # User specified a datestamp -- apply it to the new file
-                try:
-                    result = self.conn.setdate(path, datestamp)
-                except AmigactlError as e:
-                    print(self.cw.error("Error: {}".format(e.message)))
-                    return
-                except ProtocolError as e:
-                    print(self.cw.error("Protocol error: {}".format(e)))
-                    return
-                except OSError as e:
-                    print(self.cw.error("Connection error: {}".format(e)))
-                    self.conn = None
-                    self._update_prompt()
-                    return
-            else:
-                result = None
-        except AmigactlError as e:
-            print(self.cw.error("Error: {}".format(e.message)))
-            return
-        except ProtocolError as e:
-            print(self.cw.error("Protocol error: {}".format(e)))
-            return
-        except OSError as e:
-            print(self.cw.error("Connection error: {}".format(e)))
-            self.conn = None
-            self._update_prompt()
+                if datestamp is not None:
+                    # User specified a datestamp -- apply it to the new file
+                    return self.conn.setdate(path, datestamp)
+                return None
+
+        result = self._run(touch)
+        if result is None:
             return
 
-        self._dir_cache.invalidate()
-        if result is not None:
+        self._invalidate(path)
+        if result != "ok":
             print("{}={}".format(
                 self.cw.key("datestamp"), result))
         else:
@@ -1781,7 +2237,7 @@ class AmigaShell(cmd.Cmd):
         if not self._check_connected():
             return
         try:
-            parts = shlex.split(arg)
+            parts = _split_args(arg)
         except ValueError as e:
             print("Parse error: {}".format(e))
             return
@@ -1797,7 +2253,7 @@ class AmigaShell(cmd.Cmd):
         result = self._run(self.conn.setcomment, path, comment)
         if result is not None:
             print(self.cw.success("Comment set on {}".format(path)))
-            self._dir_cache.invalidate()
+            self._invalidate(path)
 
     do_comment = do_setcomment
 
@@ -1829,6 +2285,7 @@ class AmigaShell(cmd.Cmd):
             return
 
         result = self._run(self.conn.execute, self._prepend_cd(command))
+        self._cmd_cache.clear()
         if result is None:
             return
 
@@ -1860,6 +2317,7 @@ class AmigaShell(cmd.Cmd):
             return
 
         proc_id = self._run(self.conn.execute_async, self._prepend_cd(command))
+        self._cmd_cache.clear()
         if proc_id is None:
             return
 
@@ -1876,7 +2334,7 @@ class AmigaShell(cmd.Cmd):
         if not self._check_connected():
             return
 
-        procs = self._run(self.conn.proclist)
+        procs = self._cached_run("proclist")
         if procs is None:
             return
 
@@ -1884,35 +2342,24 @@ class AmigaShell(cmd.Cmd):
             print("No tracked processes.")
             return
 
-        # Calculate column widths
-        max_id = len("ID")
-        max_cmd = len("COMMAND")
-        max_status = len("STATUS")
-        max_rc = len("RC")
-        for p in procs:
-            id_len = len(str(p["id"]))
-            if id_len > max_id:
-                max_id = id_len
-            cmd_len = len(p["command"])
-            if cmd_len > max_cmd:
-                max_cmd = cmd_len
-            status_len = len(p["status"])
-            if status_len > max_status:
-                max_status = status_len
-            rc_str = str(p["rc"]) if p["rc"] is not None else "-"
-            rc_len = len(rc_str)
-            if rc_len > max_rc:
-                max_rc = rc_len
-
-        header = "{:<{}}  {:<{}}  {:<{}}  {:<{}}".format(
-            "ID", max_id, "COMMAND", max_cmd,
-            "STATUS", max_status, "RC", max_rc)
-        print(self.cw.bold(header))
-        for p in procs:
-            rc_str = str(p["rc"]) if p["rc"] is not None else "-"
-            print("{:<{}}  {:<{}}  {:<{}}  {:<{}}".format(
-                p["id"], max_id, p["command"], max_cmd,
-                p["status"], max_status, rc_str, max_rc))
+        # Convert numbers once, then calculate column widths
+        rows = [(str(p["id"]), p["command"], p["status"],
+                 str(p["rc"]) if p["rc"] is not None else "-")
+                for p in procs]
+        max_id = max(len("ID"), max(len(r[0]) for r in rows))
+        max_cmd = max(len("COMMAND"), max(len(r[1]) for r in rows))
+        max_status = max(len("STATUS"), max(len(r[2]) for r in rows))
+        max_rc = max(len("RC"), max(len(r[3]) for r in rows))
+
+        header = "  ".join((
+            "ID".ljust(max_id), "COMMAND".ljust(max_cmd),
+            "STATUS".ljust(max_status), "RC".ljust(max_rc)))
+        out = [self.cw.bold(header)]
+        for id_str, command, status, rc_str in rows:
+            out.append("  ".join((
+                id_str.ljust(max_id), command.ljust(max_cmd),
+                status.ljust(max_status), rc_str.ljust(max_rc))))
+        _write_lines(out)
 
     def do_status(self, arg):
         """Show the status of a tracked background process.
@@ -1943,75 +2390,121 @@ class AmigaShell(cmd.Cmd):
         if info is None:
             return
 
+        key_style = self.cw.key
         for key in ("id", "command", "status", "rc"):
-            if key in info:
-                val = info[key]
-                if val is None:
-                    val = "-"
-                print("{}={}".format(self.cw.key(key), val))
+            val = info.get(key, _MISSING)
+            if val is _MISSING:
+                continue
+            if val is None:
+                val = "-"
+            print("{}={}".format(key_style(key), val))
 
     def do_signal(self, arg):
-        """Send a break signal to a background process.
+        """Send a break signal to background processes.
 
-    Usage: signal ID [SIG]
+    Usage: signal ID [ID...] [SIG]
 
     ID      Process ID returned by 'run'.
     SIG     Signal name (default: CTRL_C). Also: CTRL_D, CTRL_E,
             CTRL_F.
 
+    Several IDs are signalled in a single round trip.
+
     Examples:
         signal 1
-        signal 1 CTRL_D"""
+        signal 1 CTRL_D
+        signal 1 2 3"""
         if not self._check_connected():
             return
         try:
-            parts = shlex.split(arg)
+            parts = _split_args(arg)
         except ValueError as e:
             print("Parse error: {}".format(e))
             return
-        if len(parts) < 1 or len(parts) > 2:
-            print("Usage: signal ID [SIG]")
+        sig = "CTRL_C"
+        if len(parts) > 1 and not parts[-1].lstrip("-").isdigit():
+            sig = parts.pop()
+        if not parts:
+            print("Usage: signal ID [ID...] [SIG]")
             return
 
-        try:
-            proc_id = int(parts[0])
-        except ValueError:
-            print("Error: ID must be an integer")
+        proc_ids = self._parse_proc_ids(parts)
+        if proc_ids is None:
             return
-        sig = parts[1] if len(parts) == 2 else "CTRL_C"
 
-        result = self._run(self.conn.signal, proc_id, sig)
-        if result is not None:
-            print(self.cw.success("Signal sent."))
+        if len(proc_ids) == 1:
+            result = self._run(self.conn.signal, proc_ids[0], sig)
+            self._cmd_cache.clear()
+            if result is not None:
+                print(self.cw.success("Signal sent."))
+            return
+
+        errors = self._run(self.conn.signal_many, proc_ids, sig)
+        self._cmd_cache.clear()
+        if errors is not None:
+            self._report_batch(proc_ids, errors, "Signal sent to {}.")
 
     def do_kill(self, arg):
-        """Force-terminate a background process.
+        """Force-terminate background processes.
 
-    Usage: kill ID
+    Usage: kill ID [ID...]
 
     ID      Process ID returned by 'run'.
 
     Forcibly removes the process from the daemon's tracking. Use
-    'signal' first for a graceful shutdown.
+    'signal' first for a graceful shutdown. Several IDs are killed
+    in a single round trip.
 
     Examples:
-        kill 1"""
-        arg = arg.strip()
-        if not arg:
-            print("Usage: kill ID")
+        kill 1
+        kill 1 2 3"""
+        try:
+            parts = _split_args(arg)
+        except ValueError as e:
+            print("Parse error: {}".format(e))
+            return
+        if not parts:
+            print("Usage: kill ID [ID...]")
             return
         if not self._check_connected():
             return
 
+        proc_ids = self._parse_proc_ids(parts)
+        if proc_ids is None:
+            return
+
+        if len(proc_ids) == 1:
+            result = self._run(self.conn.kill, proc_ids[0])
+            self._cmd_cache.clear()
+            if result is not None:
+                print(self.cw.success("Process terminated."))
+            return
+
+        errors = self._run(self.conn.kill_many, proc_ids)
+        self._cmd_cache.clear()
+        if errors is not None:
+            self._report_batch(proc_ids, errors, "Process {} terminated.")
+
+    @staticmethod
+    def _parse_proc_ids(parts):
+        """Convert process ID arguments to ints, or print an error.
+
+        Returns the list of IDs, or None if any argument is not an integer.
+        """
         try:
-            proc_id = int(arg)
+            return [int(part) for part in parts]
         except ValueError:
             print("Error: ID must be an integer")
-            return
+            return None
 
-        result = self._run(self.conn.kill, proc_id)
-        if result is not None:
-            print(self.cw.success("Process terminated."))
+    def _report_batch(self, proc_ids, errors, done_fmt):
+        """Print the per-process outcome of a batched signal or kill."""
+        for proc_id, err in zip(proc_ids, errors):
+            if err is None:
+                print(self.cw.success(done_fmt.format(proc_id)))
+            else:
+                print(self.cw.error("Error: {}: {}".format(
+                    proc_id, err.message)))
 
     # -- System information ------------------------------------------------
 
@@ -2022,7 +2515,7 @@ class AmigaShell(cmd.Cmd):
         if not self._check_connected():
             return
 
-        ver = self._run(self.conn.version)
+        ver = self._cached_run("version")
         if ver is not None:
             print(ver)
 
@@ -2052,12 +2545,9 @@ class AmigaShell(cmd.Cmd):
         if seconds is None:
             return
 
-        days = seconds // 86400
-        seconds %= 86400
-        hours = seconds // 3600
-        seconds %= 3600
-        minutes = seconds // 60
-        secs = seconds % 60
+        days, seconds = divmod(seconds, 86400)
+        hours, seconds = divmod(seconds, 3600)
+        minutes, secs = divmod(seconds, 60)
         parts = []
         if days:
             parts.append("{}d".format(days))
@@ -2080,12 +2570,13 @@ class AmigaShell(cmd.Cmd):
         if not self._check_connected():
             return
 
-        info = self._run(self.conn.sysinfo)
+        info = self._cached_run("sysinfo")
         if info is None:
             return
 
+        key_style = self.cw.key
         for key, value in info.items():
-            print("{}={}".format(self.cw.key(key), value))
+            print("{}={}".format(key_style(key), value))
 
     def do_libver(self, arg):
         """Get the version of an Amiga library or device.
@@ -2158,7 +2649,7 @@ class AmigaShell(cmd.Cmd):
         if not self._check_connected():
             return
         try:
-            parts = shlex.split(arg) if arg.strip() else []
+            parts = _split_args(arg)
         except ValueError as e:
             print("Parse error: {}".format(e))
             return
@@ -2186,6 +2677,7 @@ class AmigaShell(cmd.Cmd):
 
         result = self._run(self.conn.setenv, name, value=value,
                            volatile=volatile)
+        self._cmd_cache.clear()
         if result is not None:
             if value is not None:
                 print(self.cw.success("Set: {}={}".format(name, value)))
@@ -2211,13 +2703,10 @@ class AmigaShell(cmd.Cmd):
             return
 
         # Calculate column widths
-        max_name = 0
-        for name in assigns:
-            if len(name) > max_name:
-                max_name = len(name)
+        max_name = max(map(len, assigns))
 
-        for name, path in assigns.items():
-            print("{:<{}}  {}".format(name, max_name, path))
+        _write_lines(["  ".join((name.ljust(max_name), path))
+                      for name, path in assigns.items()])
 
     def do_assign(self, arg):
         """Create, modify, or remove a logical assign.
@@ -2234,7 +2723,7 @@ class AmigaShell(cmd.Cmd):
         if not self._check_connected():
             return
         try:
-            parts = shlex.split(arg)
+            parts = _split_args(arg)
         except ValueError as e:
             print("Parse error: {}".format(e))
             return
@@ -2264,6 +2753,7 @@ class AmigaShell(cmd.Cmd):
             path = parts[idx]
 
         result = self._run(self.conn.assign, name, path, mode)
+        self._cmd_cache.clear()
         if result is not None:
             if path is not None:
                 print(self.cw.success("Assigned: {} -> {}".format(
@@ -2304,7 +2794,7 @@ class AmigaShell(cmd.Cmd):
         if not self._check_connected():
             return
 
-        vols = self._run(self.conn.volumes)
+        vols = self._cached_run("volumes")
         if vols is None:
             return
 
@@ -2312,41 +2802,27 @@ class AmigaShell(cmd.Cmd):
             print("No volumes.")
             return
 
-        # Calculate column widths for name
-        max_name = len("NAME")
-        for v in vols:
-            if len(v["name"]) > max_name:
-                max_name = len(v["name"])
-
-        # Format sizes
-        rows = []
-        max_used = len("USED")
-        max_free = len("FREE")
-        max_cap = len("CAPACITY")
-        for v in vols:
-            used = format_size(v["used"])
-            free = format_size(v["free"])
-            cap = format_size(v["capacity"])
-            if len(used) > max_used:
-                max_used = len(used)
-            if len(free) > max_free:
-                max_free = len(free)
-            if len(cap) > max_cap:
-                max_cap = len(cap)
-            rows.append((v["name"], used, free, cap))
-
-        header = "{:<{}}  {:>{}}  {:>{}}  {:>{}}".format(
-            "NAME", max_name,
-            "USED", max_used,
-            "FREE", max_free,
-            "CAPACITY", max_cap)
-        print(self.cw.bold(header))
+        # Format sizes, then calculate column widths
+        rows = [(v["name"], format_size(v["used"]), format_size(v["free"]),
+                 format_size(v["capacity"])) for v in vols]
+        max_name = max(len("NAME"), max(len(r[0]) for r in rows))
+        max_used = max(len("USED"), max(len(r[1]) for r in rows))
+        max_free = max(len("FREE"), max(len(r[2]) for r in rows))
+        max_cap = max(len("CAPACITY"), max(len(r[3]) for r in rows))
+
+        header = "  ".join((
+            "NAME".ljust(max_name),
+            "USED".rjust(max_used),
+            "FREE".rjust(max_free),
+            "CAPACITY".rjust(max_cap)))
+        out = [self.cw.bold(header)]
         for name, used, free, cap in rows:
-            print("{:<{}}  {:>{}}  {:>{}}  {:>{}}".format(
-                name, max_name,
-                used, max_used,
-                free, max_free,
-                cap, max_cap))
+            out.append("  ".join((
+                name.ljust(max_name),
+                used.rjust(max_used),
+                free.rjust(max_free),
+                cap.rjust(max_cap))))
+        _write_lines(out)
 
     def do_tasks(self, arg):
         """List all running tasks and processes on the Amiga.
@@ -2358,7 +2834,7 @@ class AmigaShell(cmd.Cmd):
         if not self._check_connected():
             return
 
-        tasks = self._run(self.conn.tasks)
+        tasks = self._cached_run("tasks")
         if tasks is None:
             return
 
@@ -2366,40 +2842,30 @@ class AmigaShell(cmd.Cmd):
             print("No tasks.")
             return
 
-        # Calculate column widths
-        max_name = len("NAME")
-        max_type = len("TYPE")
-        max_pri = len("PRI")
-        max_state = len("STATE")
-        max_stack = len("STACK")
-        for t in tasks:
-            if len(t["name"]) > max_name:
-                max_name = len(t["name"])
-            if len(t["type"]) > max_type:
-                max_type = len(t["type"])
-            pri_str = str(t["priority"])
-            if len(pri_str) > max_pri:
-                max_pri = len(pri_str)
-            if len(t["state"]) > max_state:
-                max_state = len(t["state"])
-            stack_str = str(t["stacksize"])
-            if len(stack_str) > max_stack:
-                max_stack = len(stack_str)
-
-        header = "{:<{}}  {:<{}}  {:>{}}  {:<{}}  {:>{}}".format(
-            "NAME", max_name,
-            "TYPE", max_type,
-            "PRI", max_pri,
-            "STATE", max_state,
-            "STACK", max_stack)
-        print(self.cw.bold(header))
-        for t in tasks:
-            print("{:<{}}  {:<{}}  {:>{}}  {:<{}}  {:>{}}".format(
-                t["name"], max_name,
-                t["type"], max_type,
-                t["priority"], max_pri,
-                t["state"], max_state,
-                t["stacksize"], max_stack))
+        # Convert numbers once, then calculate column widths
+        rows = [(t["name"], t["type"], str(t["priority"]), t["state"],
+                 str(t["stacksize"])) for t in tasks]
+        max_name = max(len("NAME"), max(len(r[0]) for r in rows))
+        max_type = max(len("TYPE"), max(len(r[1]) for r in rows))
+        max_pri = max(len("PRI"), max(len(r[2]) for r in rows))
+        max_state = max(len("STATE"), max(len(r[3]) for r in rows))
+        max_stack = max(len("STACK"), max(len(r[4]) for r in rows))
+
+        header = "  ".join((
+            "NAME".ljust(max_name),
+            "TYPE".ljust(max_type),
+            "PRI".rjust(max_pri),
+            "STATE".ljust(max_state),
+            "STACK".rjust(max_stack)))
+        out = [self.cw.bold(header)]
+        for name, type_, pri, state, stack in rows:
+            out.append("  ".join((
+                name.ljust(max_name),
+                type_.ljust(max_type),
+                pri.rjust(max_pri),
+                state.ljust(max_state),
+                stack.rjust(max_stack))))
+        _write_lines(out)
 
     def do_devices(self, arg):
         """List Exec devices on the Amiga.
@@ -2411,7 +2877,7 @@ class AmigaShell(cmd.Cmd):
         if not self._check_connected():
             return
 
-        devs = self._run(self.conn.devices)
+        devs = self._cached_run("devices")
         if devs is None:
             return
 
@@ -2420,21 +2886,16 @@ class AmigaShell(cmd.Cmd):
             return
 
         # Calculate column widths
-        max_name = len("NAME")
-        max_ver = len("VERSION")
-        for d in devs:
-            if len(d["name"]) > max_name:
-                max_name = len(d["name"])
-            if len(d["version"]) > max_ver:
-                max_ver = len(d["version"])
-
-        header = "{:<{}}  {:>{}}".format(
-            "NAME", max_name, "VERSION", max_ver)
-        print(self.cw.bold(header))
+        max_name = max(len("NAME"), max(len(d["name"]) for d in devs))
+        max_ver = max(len("VERSION"), max(len(d["version"]) for d in devs))
+
+        header = "  ".join((
+            "NAME".ljust(max_name), "VERSION".rjust(max_ver)))
+        out = [self.cw.bold(header)]
         for d in devs:
-            print("{:<{}}  {:>{}}".format(
-                d["name"], max_name,
-                d["version"], max_ver))
+            out.append("  ".join((
+                d["name"].ljust(max_name), d["version"].rjust(max_ver))))
+        _write_lines(out)
 
     def do_capabilities(self, arg):
         """Show daemon capabilities and supported commands.
@@ -2446,19 +2907,21 @@ class AmigaShell(cmd.Cmd):
         if not self._check_connected():
             return
 
-        caps = self._run(self.conn.capabilities)
+        caps = self._cached_run("capabilities")
         if caps is None:
             return
 
+        key_style = self.cw.key
+        out = []
         for key, value in caps.items():
             if key == "commands":
                 # Format command list in columns
-                print("{}=".format(self.cw.key(key)))
-                commands = value.split(",")
-                for cmd in commands:
-                    print("  {}".format(cmd))
+                out.append("{}=".format(key_style(key)))
+                for cmd in value.split(","):
+                    out.append("  " + cmd)
             else:
-                print("{}={}".format(self.cw.key(key), value))
+                out.append("{}={}".format(key_style(key), value))
+        _write_lines(out)
 
     do_caps = do_capabilities
 
@@ -2525,7 +2988,7 @@ class AmigaShell(cmd.Cmd):
         if not self._check_connected():
             return
         try:
-            parts = shlex.split(arg) if arg.strip() else []
+            parts = _split_args(arg)
         except ValueError as e:
             print("Parse error: {}".format(e))
             return
@@ -2576,17 +3039,20 @@ class AmigaShell(cmd.Cmd):
         if path is None:
             return
 
-        entries = self._run(self.conn.dir, path, recursive=True)
-        if entries is None:
-            return
+        def search():
+            # Filter the listing as it streams in; matches are printed
+            # without waiting for the rest of the tree
+            directory = self.cw.directory
+            for entry in _iter_find_filter(
+                    self.conn.iter_dir(path, recursive=True),
+                    pattern, type_filter):
+                name = entry["name"]
+                if entry["type"].lower() == "dir":
+                    print(directory(name))
+                else:
+                    print(name)
 
-        matches = _find_filter(entries, pattern, type_filter)
-        for entry in matches:
-            name = entry["name"]
-            if entry["type"].lower() == "dir":
-                print(self.cw.directory(name))
-            else:
-                print(name)
+        self._run(search)
 
     complete_find = _complete_path
 
@@ -2609,7 +3075,7 @@ class AmigaShell(cmd.Cmd):
         if not self._check_connected():
             return
         try:
-            parts = shlex.split(arg) if arg.strip() else []
+            parts = _split_args(arg)
         except ValueError as e:
             print("Parse error: {}".format(e))
             return
@@ -2650,10 +3116,9 @@ class AmigaShell(cmd.Cmd):
         lines, dir_count, file_count = _format_tree(
             path, tree, dirs_only=dirs_only, ascii_mode=ascii_mode)
 
-        for line in lines:
-            print(line)
-
-        print("\n{} directories, {} files".format(dir_count, file_count))
+        lines.append("")
+        lines.append("{} directories, {} files".format(dir_count, file_count))
+        _write_lines(lines)
 
     complete_tree = _complete_path
 
@@ -2687,7 +3152,7 @@ class AmigaShell(cmd.Cmd):
         if not self._check_connected():
             return
         try:
-            parts = shlex.split(arg) if arg.strip() else []
+            parts = _split_args(arg)
         except ValueError as e:
             print("Parse error: {}".format(e))
             return
@@ -2695,36 +3160,27 @@ class AmigaShell(cmd.Cmd):
             print("Usage: grep PATTERN FILE")
             return
 
-        is_regex = False
-        ignore_case = False
-        recursive = False
-        show_lines = False
-        count_only = False
-        list_only = False
+        options = set()
         positional = []
 
         for part in parts:
             if part.startswith("-") and len(part) > 1:
                 for ch in part[1:]:
-                    if ch == "E":
-                        is_regex = True
-                    elif ch == "i":
-                        ignore_case = True
-                    elif ch == "r":
-                        recursive = True
-                    elif ch == "n":
-                        show_lines = True
-                    elif ch == "c":
-                        count_only = True
-                    elif ch == "l":
-                        list_only = True
-                        recursive = True
-                    else:
+                    implied = _GREP_FLAGS.get(ch)
+                    if implied is None:
                         print("Unknown flag: -{}".format(ch))
                         return
+                    options.update(implied)
             else:
                 positional.append(part)
 
+        is_regex = "regex" in options
+        ignore_case = "ignore_case" in options
+        recursive = "recursive" in options
+        show_lines = "show_lines" in options
+        count_only = "count_only" in options
+        list_only = "list_only" in options
+
         if len(positional) < 2:
             print("Usage: grep PATTERN FILE")
             return
@@ -2736,11 +3192,7 @@ class AmigaShell(cmd.Cmd):
 
         # Validate pattern compiles
         try:
-            flags = re.IGNORECASE if ignore_case else 0
-            if is_regex:
-                re.compile(pattern, flags)
-            else:
-                re.compile(re.escape(pattern), flags)
+            _compile_grep(pattern, is_regex, ignore_case)
         except re.error as e:
             print(self.cw.error("Invalid pattern: {}".format(e)))
             return
@@ -2750,51 +3202,64 @@ class AmigaShell(cmd.Cmd):
             if entries is None:
                 return
 
-            files = [e for e in entries if e["type"].lower() != "dir"]
-            for entry in files:
-                full_path = _join_amiga_path(target, entry["name"])
-                data = self._run(self.conn.read, full_path)
-                if data is None:
-                    continue
-                text = data.decode("iso-8859-1")
-                matches = _grep_lines(text, pattern,
-                                      is_regex=is_regex,
-                                      ignore_case=ignore_case)
-                if not matches:
-                    continue
-
-                if list_only:
-                    print(entry["name"])
-                    continue
-
-                if count_only:
-                    print("{}:{}".format(entry["name"], len(matches)))
-                    continue
-
-                for lineno, line in matches:
+            names = {}
+            for e in entries:
+                if e["type"].lower() != "dir":
+                    names[_join_amiga_path(target, e["name"])] = e["name"]
+
+            def search_files():
+                # Reads are pipelined; results arrive in directory order
+                for full_path, data in self.conn.read_many(names):
+                    if isinstance(data, AmigactlError):
+                        print(self.cw.error("Error: {}".format(data.message)))
+                        continue
+                    name = names[full_path]
+                    matches = _iter_grep_lines(data, pattern,
+                                               is_regex=is_regex,
+                                               ignore_case=ignore_case)
+                    if list_only:
+                        # The first match is enough to list the file
+                        if next(matches, None) is not None:
+                            print(name)
+                        continue
+
+                    if count_only:
+                        count = sum(1 for _ in matches)
+                        if count:
+                            print("{}:{}".format(name, count))
+                        continue
+
+                    # One write per file keeps read errors in order
                     if show_lines:
-                        print("{}:{}:{}".format(
-                            entry["name"], lineno, line))
+                        _write_lines(["{}:{}:{}".format(name, lineno, line)
+                                      for lineno, line in matches])
                     else:
-                        print("{}:{}".format(entry["name"], line))
+                        _write_lines([name + ":" + line
+                                      for _, line in matches])
+
+            self._run(search_files)
+            if self.conn is not None and self.conn.peer_closed():
+                # read_many() closes the connection when a protocol error
+                # leaves queued READs unanswered
+                self.conn = None
+                self._update_prompt()
         else:
             data = self._run(self.conn.read, target)
             if data is None:
                 return
-            text = data.decode("iso-8859-1")
-            matches = _grep_lines(text, pattern,
-                                  is_regex=is_regex,
-                                  ignore_case=ignore_case)
+            matches = _iter_grep_lines(data, pattern,
+                                       is_regex=is_regex,
+                                       ignore_case=ignore_case)
 
             if count_only:
-                print(len(matches))
+                print(sum(1 for _ in matches))
                 return
 
-            for lineno, line in matches:
-                if show_lines:
-                    print("{}:{}".format(lineno, line))
-                else:
-                    print(line)
+            if show_lines:
+                _write_lines(["{}:{}".format(lineno, line)
+                              for lineno, line in matches])
+            else:
+                _write_lines([line for _, line in matches])
 
     complete_grep = _complete_path
 
@@ -2816,7 +3281,7 @@ class AmigaShell(cmd.Cmd):
         if not self._check_connected():
             return
         try:
-            parts = shlex.split(arg)
+            parts = _split_args(arg)
         except ValueError as e:
             print("Parse error: {}".format(e))
             return
@@ -2846,6 +3311,11 @@ class AmigaShell(cmd.Cmd):
                 print("Binary files differ")
             return
 
+        # Identical files need no decode, split or diff at all
+        if data1 == data2:
+            print("Files are identical")
+            return
+
         text1 = data1.decode("iso-8859-1")
         text2 = data2.decode("iso-8859-1")
         lines1 = text1.splitlines(True)
@@ -2854,22 +3324,26 @@ class AmigaShell(cmd.Cmd):
         diff_lines = difflib.unified_diff(
             lines1, lines2, fromfile=path1, tofile=path2)
 
-        has_output = False
+        bold = self.cw.bold
+        added = self.cw.success
+        removed = self.cw.error
+        out = []
         for line in diff_lines:
-            has_output = True
-            # Strip trailing newline for print
+            # Strip trailing newline; _write_lines adds it back
             display = line.rstrip("\n")
             if line.startswith("@@"):
-                print(self.cw.bold(display))
+                out.append(bold(display))
             elif line.startswith("+"):
-                print(self.cw.success(display))
+                out.append(added(display))
             elif line.startswith("-"):
-                print(self.cw.error(display))
+                out.append(removed(display))
             else:
-                print(display)
+                out.append(display)
 
-        if not has_output:
+        if not out:
             print("Files are identical")
+            return
+        _write_lines(out)
 
     complete_diff = _complete_path
 
@@ -2893,7 +3367,7 @@ class AmigaShell(cmd.Cmd):
         if not self._check_connected():
             return
         try:
-            parts = shlex.split(arg) if arg.strip() else []
+            parts = _split_args(arg)
         except ValueError as e:
             print("Parse error: {}".format(e))
             return
@@ -2997,14 +3471,35 @@ class AmigaShell(cmd.Cmd):
             print("Usage: watch [-n SECONDS] COMMAND")
             return
 
+        # Resolve the handler once, as onecmd() would on every tick
+        name, cmd_arg, line = self.parseline(command)
+        func = getattr(self, "do_" + name, None) if name else None
+        if func is None:
+            func, cmd_arg = self.default, line
+
+        stdout = sys.stdout
+        encoding = stdout.encoding or "utf-8"
+        # Clear screen and move cursor to top-left, then the title
+        header = "\033[2J\033[HEvery {:.1f}s: {}\n\n".format(
+            interval, command).encode(encoding, "replace")
         try:
             while True:
-                # Clear screen and move cursor to top-left
-                sys.stdout.write("\033[2J\033[H")
-                sys.stdout.flush()
-                print("Every {:.1f}s: {}".format(interval, command))
-                print()
-                self.onecmd(command)
+                # Render the frame off-screen, then clear and draw it in
+                # one write so the screen is never left blank mid-refresh
+                frame = io.TextIOWrapper(io.BytesIO(), encoding=encoding,
+                                         errors="replace")
+                sys.stdout = frame
+                # Every frame must show fresh data, however short the
+                # interval
+                self._cmd_cache.clear()
+                try:
+                    func(cmd_arg)
+                    frame.flush()
+                finally:
+                    sys.stdout = stdout
+                stdout.flush()
+                stdout.buffer.write(header + frame.buffer.getvalue())
+                stdout.buffer.flush()
                 if self.conn is None:
                     return
                 time.sleep(interval)
@@ -25,7 +25,10 @@ except ImportError:
     tty = None
     termios = None  # Windows -- not supported for interactive viewer
 
-from .colors import RESET, format_trace_event, get_lib_color, strip_ansi
+from .colors import (
+    RESET, REVERSE, combine_codes, format_trace_event, get_lib_color,
+    strip_ansi,
+)
 from .protocol import ProtocolError, send_command
 
 # Shell variables suppressed by the noise filter grid items.
@@ -44,6 +47,9 @@ _SHELL_INIT_VARS = frozenset({
 # Used to build the default noise_suppressed set.
 _ALL_NOISE_NAMES = frozenset(_SHELL_INIT_VARS | {"LV_ALIAS"})
 
+# Reset-then-reverse as one escape sequence, for the highlighted row.
+_RESET_REVERSE = combine_codes(RESET, REVERSE)
+
 
 class TerminalState:
     """Manage raw terminal mode with guaranteed cleanup.
@@ -2358,8 +2364,8 @@ class TraceViewer:
                 pad = max(0, self.term.cols - vis_len)
                 # Re-apply reverse video after every RESET in the formatted string
                 # so the highlight bar spans the full row width
-                highlighted = formatted.replace("\033[0m", "\033[0m\033[7m")
-                formatted = "\033[7m" + highlighted + " " * pad + "\033[0m"
+                highlighted = formatted.replace(RESET, _RESET_REVERSE)
+                formatted = REVERSE + highlighted + " " * pad + RESET
 
             self.term.write_at(row, formatted)
             prev_time = event.get("time", "")
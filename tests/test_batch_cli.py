@@ -0,0 +1,76 @@
+"""Tests for the CLI batch subcommand in __main__.py.
+
+These are unit tests that feed a script to _run_batch() over a mocked
+AmigaConnection and the real top-level parser, checking which handlers
+run and how bad lines are reported.
+"""
+
+from unittest import mock
+
+import pytest
+
+from amigactl.__main__ import _build_parser, _run_batch
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _run_script(tmp_path, text, conn=None):
+    """Run *text* as a batch script; return the mock connection used."""
+    script = tmp_path / "script.txt"
+    script.write_text(text)
+    if conn is None:
+        conn = mock.MagicMock()
+        conn.version.return_value = "amigactld 1.0"
+    parser = _build_parser("localhost", 6800, ["batch"])
+    _run_batch(conn, parser, str(script))
+    return conn
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+class TestRunBatch:
+    """Tests for _run_batch()."""
+
+    def test_runs_each_line(self, tmp_path, capsys):
+        conn = _run_script(tmp_path, "version\nping\n")
+        conn.version.assert_called_once_with()
+        conn.ping.assert_called_once_with()
+        assert "amigactld 1.0" in capsys.readouterr().out
+
+    def test_skips_comments_and_blank_lines(self, tmp_path, capsys):
+        conn = _run_script(tmp_path, "# header\n\n   \n  # indented\nversion\n")
+        conn.version.assert_called_once_with()
+        assert capsys.readouterr().out == "amigactld 1.0\n"
+
+    def test_command_without_handler_rejected(self, tmp_path, capsys):
+        with pytest.raises(SystemExit) as exc:
+            _run_script(tmp_path, "shell\nversion\n")
+        assert exc.value.code == 1
+        assert "'shell' cannot be used in a batch" in capsys.readouterr().err
+
+    def test_shlex_error_reported(self, tmp_path, capsys):
+        conn = mock.MagicMock()
+        with pytest.raises(SystemExit) as exc:
+            _run_script(tmp_path, 'cat "RAM:unterminated\nversion\n', conn)
+        assert exc.value.code == 1
+        err = capsys.readouterr().err
+        assert "No closing quotation" in err
+        assert 'cat "RAM:unterminated' in err
+        conn.version.assert_not_called()
+
+    @pytest.mark.parametrize("line", [
+        "--host 10.0.0.1 version",
+        "--port 6801 version",
+        "--config other.conf version",
+    ])
+    def test_global_options_rejected(self, tmp_path, capsys, line):
+        conn = mock.MagicMock()
+        with pytest.raises(SystemExit) as exc:
+            _run_script(tmp_path, line + "\n", conn)
+        assert exc.value.code == 1
+        assert "cannot be used in a batch" in capsys.readouterr().err
+        conn.version.assert_not_called()
@@ -10,6 +10,7 @@ The daemon must be running on the target machine before these tests are
 executed.
 """
 
+import os
 import re
 import socket
 import time
@@ -17,6 +18,7 @@ import zlib
 
 import pytest
 
+from amigactl import NotFoundError
 from conftest import (
     _read_line,
     _recv_exact,
@@ -575,6 +577,65 @@ class TestRead:
         assert payload == []
 
 
+class TestReadMany:
+    """Tests for pipelined READs via AmigaConnection.read_many()."""
+
+    def test_read_many_in_order(self, conn, cleanup_paths):
+        """Results come back in request order, errors in place."""
+        paths = ["RAM:act_many_{}.bin".format(i) for i in range(12)]
+        for i, path in enumerate(paths):
+            cleanup_paths.add(path)
+            conn.write(path, bytes([i]) * (i * 1000))
+        missing = "RAM:act_many_missing.bin"
+
+        results = list(conn.read_many(paths + [missing], window=4))
+        assert [p for p, _ in results] == paths + [missing]
+        for i, (_path, data) in enumerate(results[:-1]):
+            assert data == bytes([i]) * (i * 1000)
+        assert isinstance(results[-1][1], NotFoundError)
+
+    def test_read_many_closed_early(self, conn, cleanup_paths):
+        """Abandoning the iterator leaves the connection usable."""
+        paths = ["RAM:act_many_{}.bin".format(i) for i in range(6)]
+        for path in paths:
+            cleanup_paths.add(path)
+            conn.write(path, b"x" * 5000)
+
+        it = conn.read_many(paths)
+        assert next(it) == (paths[0], b"x" * 5000)
+        it.close()
+        assert conn.read(paths[1]) == b"x" * 5000
+
+
+class TestWriteStream:
+    """Tests for streamed uploads via AmigaConnection.write_stream()."""
+
+    def test_write_stream_regular_file(self, conn, cleanup_paths, tmp_path):
+        """A regular file is sent from its current offset to EOF."""
+        path = "RAM:act_stream.bin"
+        local = tmp_path / "local.bin"
+        local.write_bytes(b"skip" + bytes(range(256)) * 40)
+        cleanup_paths.add(path)
+
+        with open(str(local), "rb") as f:
+            f.seek(4)
+            assert conn.write_stream(path, f) == 256 * 40
+        assert conn.read(path) == bytes(range(256)) * 40
+
+    def test_write_stream_pipe(self, conn, cleanup_paths):
+        """A pipe, which can't be sized or seeked, is read to EOF first."""
+        path = "RAM:act_stream_pipe.bin"
+        content = b"piped " * 1000
+        cleanup_paths.add(path)
+
+        rfd, wfd = os.pipe()
+        with os.fdopen(rfd, "rb") as r:
+            with os.fdopen(wfd, "wb") as w:
+                w.write(content)
+            assert conn.write_stream(path, r) == len(content)
+        assert conn.read(path) == content
+
+
 # ---------------------------------------------------------------------------
 # WRITE
 # ---------------------------------------------------------------------------
@@ -6,13 +6,17 @@ by the interactive shell.
 """
 
 import cmd
+import collections
 import io
 import os
+import shlex
+import sys
 import tempfile
 from unittest import mock
 
 import pytest
 
+from amigactl import ConnectionLostError, NotFoundError, ProtocolError
 from amigactl.shell import (
     format_size,
     _amiga_basename,
@@ -24,11 +28,15 @@ from amigactl.shell import (
     _build_tree,
     _format_tree,
     _grep_lines,
+    _iter_grep_lines,
     _du_accumulate,
+    _split_args,
     AmigaShell,
     _DirCache,
 )
-from amigactl.colors import ColorWriter, _supports_color
+from amigactl.colors import (
+    BOLD, RED, ColorWriter, _supports_color, refresh_color_support,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -159,6 +167,11 @@ class TestNormalizeDotdot:
     def test_no_dots(self):
         assert _normalize_dotdot("no_dots_here") == "no_dots_here"
 
+    def test_amiga_parent_untouched(self):
+        # No . or .. segment -- Amiga / navigation passes through as-is
+        assert _normalize_dotdot("/foo") == "/foo"
+        assert _normalize_dotdot("//foo/bar") == "//foo/bar"
+
 
 # ---------------------------------------------------------------------------
 # _format_protection()
@@ -222,6 +235,23 @@ class TestColorWriter:
         cw = ColorWriter(force_color=True)
         assert cw.write("plain") == "plain"
 
+    def test_toggling_enabled_rebinds_styles(self):
+        cw = ColorWriter(force_color=False)
+        assert cw.error("x") == "x"
+        cw.enabled = True
+        assert cw.error("x") == "\033[31mx\033[0m"
+        cw.enabled = False
+        assert cw.dim("x") == "x"
+
+    def test_style_combines_codes(self):
+        cw = ColorWriter(force_color=True)
+        assert cw.style("x", BOLD, RED) == "\033[1;31mx\033[0m"
+        assert cw.style("x") == "x"
+
+    def test_style_disabled(self):
+        cw = ColorWriter(force_color=False)
+        assert cw.style("x", BOLD, RED) == "x"
+
 
 # ---------------------------------------------------------------------------
 # _visible_len()
@@ -239,6 +269,10 @@ class TestVisibleLen:
     def test_empty(self):
         assert _visible_len("") == 0
 
+    def test_escape_without_sgr(self):
+        # A bare ESC that is not a color sequence still counts
+        assert _visible_len("a\033b") == 3
+
 
 # ---------------------------------------------------------------------------
 # _supports_color() — Windows VT processing
@@ -346,6 +380,54 @@ class TestEditorFallback:
             assert parts == ["code", "--wait"]
 
 
+class TestDoEditUnchanged:
+    """do_edit skips the upload when the saved bytes are unchanged."""
+
+    def test_rewrite_same_content_skips_upload(self, capsys):
+        shell = _make_shell()
+        shell._editor = "true"
+        shell.conn.read_with_stat.return_value = (
+            {"datestamp": "2026-01-01 12:00:00"}, b"line\n")
+
+        def editor(cmd_args):
+            path = cmd_args[-1]
+            with open(path, "wb") as f:
+                f.write(b"line\n")
+            st = os.stat(path)
+            os.utime(path, (st.st_atime, st.st_mtime + 10))
+            return 0
+
+        with mock.patch("subprocess.call", side_effect=editor):
+            shell.do_edit("SYS:S/User-Startup")
+        assert "No changes detected." in capsys.readouterr().out
+        shell.conn.write.assert_not_called()
+
+    def test_upload_protocol_error_drops_connection(self, capsys):
+        shell = _make_shell()
+        shell._editor = "true"
+        shell.conn.read_with_stat.return_value = (
+            {"datestamp": "2026-01-01 12:00:00"}, b"line\n")
+        shell.conn.stat.return_value = {"datestamp": "2026-01-01 12:00:00"}
+        shell.conn.write.side_effect = ProtocolError("Expected END")
+
+        def editor(cmd_args):
+            with open(cmd_args[-1], "wb") as f:
+                f.write(b"changed\n")
+            return 0
+
+        with mock.patch("subprocess.call", side_effect=editor):
+            shell.do_edit("SYS:S/User-Startup")
+        out = capsys.readouterr().out
+        assert "Upload failed: Expected END" in out
+        assert shell.conn is None
+        tmpfile = out.split("Local copy preserved at: ")[1].strip()
+        try:
+            with open(tmpfile, "rb") as f:
+                assert f.read() == b"changed\n"
+        finally:
+            os.remove(tmpfile)
+
+
 # ---------------------------------------------------------------------------
 # Helper for dir entry construction
 # ---------------------------------------------------------------------------
@@ -438,6 +520,28 @@ class TestTree:
         assert file_count == 0
         assert dir_count == 2
 
+    def test_unsorted_entries(self):
+        entries = [
+            _entry("S/Startup-Sequence", size=200),
+            _entry("c", "DIR", 0),
+            _entry("S", "DIR", 0),
+            _entry("c/Dir", size=567),
+            _entry("c/copy", size=1234),
+        ]
+        tree = _build_tree(entries)
+        lines, dir_count, file_count = _format_tree("ROOT:", tree,
+                                                     ascii_mode=True)
+        assert lines == [
+            "ROOT:",
+            "|-- c",
+            "|   |-- copy",
+            "|   `-- Dir",
+            "`-- S",
+            "    `-- Startup-Sequence",
+        ]
+        assert dir_count == 2
+        assert file_count == 3
+
     def test_empty_tree(self):
         tree = _build_tree([])
         lines, dir_count, file_count = _format_tree("ROOT:", tree)
@@ -489,6 +593,35 @@ class TestGrep:
         assert len(result) == 1
         assert result[0][1] == "foo.bar"
 
+    def test_anchors_apply_per_line(self):
+        text = "beta\nalpha beta\nbeta end\n"
+        assert _grep_lines(text, "^beta", is_regex=True) == [
+            (1, "beta"), (3, "beta end")]
+        assert _grep_lines(text, "^$", is_regex=True) == []
+
+    def test_match_does_not_span_lines(self):
+        text = "one\ntwo\nthree"
+        assert _grep_lines(text, "one\\stwo", is_regex=True) == []
+        assert _grep_lines(text, "[^x]+", is_regex=True) == [
+            (1, "one"), (2, "two"), (3, "three")]
+
+    def test_crlf_text(self):
+        text = "hello\r\nworld\r\nhello again\r\n"
+        assert _grep_lines(text, "hello$", is_regex=True) == [(1, "hello")]
+
+    def test_bytes_input(self):
+        data = b"caf\xe9\nCAF\xc9 au lait\ntea\n"
+        assert _grep_lines(data, "caf\xe9") == [(1, "caf\xe9")]
+        assert _grep_lines(data, "caf", ignore_case=True) == [
+            (1, "caf\xe9"), (2, "CAF\xc9 au lait")]
+        assert _grep_lines(data, "t.a", is_regex=True) == [(3, "tea")]
+        assert _grep_lines(data, "\u20ac") == []
+
+    def test_iter_is_lazy(self):
+        matches = _iter_grep_lines("a\nb\na\n", "a")
+        assert next(matches) == (1, "a")
+        assert list(matches) == [(3, "a")]
+
 
 # ---------------------------------------------------------------------------
 # _du_accumulate()
@@ -532,6 +665,151 @@ class TestDu:
         assert total == 350
 
 
+# ---------------------------------------------------------------------------
+# _split_args()
+# ---------------------------------------------------------------------------
+
+class TestSplitArgs:
+    """Tests for the shell argument splitter."""
+
+    def test_plain_whitespace(self):
+        assert _split_args("  -l  SYS:S ") == ["-l", "SYS:S"]
+
+    def test_empty(self):
+        assert _split_args("") == []
+
+    def test_quoted_path(self):
+        assert _split_args('"Work:My Dir" -l') == ["Work:My Dir", "-l"]
+        assert _split_args("'Work:My Dir'") == ["Work:My Dir"]
+
+    @pytest.mark.parametrize("arg", [
+        "Work:My\xa0Dir -l", "Work:a\x0bb -l", "Work:a\x0cb -l",
+        "\t-l\r\nSYS:S\n", "   ",
+    ])
+    def test_matches_shlex(self, arg):
+        """Only the characters shlex treats as whitespace separate args."""
+        assert _split_args(arg) == shlex.split(arg)
+
+
+# ---------------------------------------------------------------------------
+# _DirCache
+# ---------------------------------------------------------------------------
+
+class TestDirCache:
+    """Tests for the DIR result cache used by tab completion."""
+
+    def test_hit_skips_round_trip(self):
+        cache = _DirCache()
+        conn = mock.MagicMock()
+        conn.dir.return_value = [_entry("a")]
+        assert cache.get(conn, "SYS:") == [_entry("a")]
+        assert cache.get(conn, "SYS:") == [_entry("a")]
+        conn.dir.assert_called_once_with("SYS:")
+
+    def test_evicts_least_recently_used(self):
+        cache = _DirCache(max_entries=2)
+        conn = mock.MagicMock()
+        conn.dir.return_value = []
+        cache.get(conn, "A:")
+        cache.get(conn, "B:")
+        cache.get(conn, "A:")  # hit -- B: is now least recently used
+        cache.get(conn, "C:")
+        conn.dir.reset_mock()
+        cache.get(conn, "A:")
+        conn.dir.assert_not_called()
+        cache.get(conn, "B:")
+        conn.dir.assert_called_once_with("B:")
+
+    def test_get_names_reused_until_refresh(self):
+        cache = _DirCache()
+        conn = mock.MagicMock()
+        conn.dir.return_value = [_entry("Foo"), _entry("Bar", "DIR")]
+        names = cache.get_names(conn, "SYS:")
+        assert names == [("Foo", "foo", False), ("Bar", "bar", True)]
+        assert cache.get_names(conn, "SYS:") is names
+        cache.invalidate()
+        assert cache.get_names(conn, "SYS:") is not names
+
+    def test_invalidate_path_is_scoped(self):
+        cache = _DirCache()
+        cache.volumes = {"workbench", "ram disk"}
+        conn = mock.MagicMock()
+        conn.dir.return_value = []
+        for path in ("Workbench:", "Workbench:S", "Workbench:S/Sub",
+                     "Workbench:C", "Ram Disk:"):
+            cache.get(conn, path)
+        cache.invalidate("workbench:s")
+        conn.dir.reset_mock()
+        for path in ("Workbench:C", "Ram Disk:"):
+            cache.get(conn, path)
+        conn.dir.assert_not_called()
+        for path in ("Workbench:", "Workbench:S", "Workbench:S/Sub"):
+            cache.get(conn, path)
+        assert conn.dir.call_count == 3
+
+    def test_invalidate_through_assign_clears_all(self):
+        """rm C:foo must not leave a cached SYS:C listing behind."""
+        cache = _DirCache()
+        cache.volumes = {"workbench"}
+        conn = mock.MagicMock()
+        conn.dir.return_value = []
+        for path in ("SYS:C", "Workbench:S"):
+            cache.get(conn, path)
+        cache.invalidate("C:foo")
+        conn.dir.reset_mock()
+        for path in ("SYS:C", "Workbench:S"):
+            cache.get(conn, path)
+        assert conn.dir.call_count == 2
+
+    def test_invalidate_drops_assign_listings(self):
+        """A change through a volume name drops listings cached by assign."""
+        cache = _DirCache()
+        cache.volumes = {"workbench"}
+        conn = mock.MagicMock()
+        conn.dir.return_value = []
+        for path in ("C:", "Workbench:S"):
+            cache.get(conn, path)
+        cache.invalidate("Workbench:C/foo")
+        conn.dir.reset_mock()
+        for path in ("C:", "Workbench:S"):
+            cache.get(conn, path)
+        conn.dir.assert_called_once_with("C:")
+
+    def test_invalidate_unknown_volumes_clears_all(self):
+        cache = _DirCache()
+        conn = mock.MagicMock()
+        conn.dir.return_value = []
+        cache.get(conn, "Workbench:S")
+        cache.invalidate("Workbench:C/foo")
+        conn.dir.reset_mock()
+        cache.get(conn, "Workbench:S")
+        conn.dir.assert_called_once_with("Workbench:S")
+
+
+class TestCompletePath:
+    """Tests for Amiga path tab completion."""
+
+    def test_case_insensitive_prefix(self):
+        shell = _make_shell()
+        shell.conn.dir.return_value = [
+            _entry("Startup-Sequence"), _entry("Storage", "DIR"),
+            _entry("User-Startup"),
+        ]
+        assert shell._complete_path("s:st", "", 0, 0) == [
+            "s:Startup-Sequence", "s:Storage/"]
+        shell.conn.dir.assert_called_once_with("s:")
+
+    def test_repeat_reuses_matches(self):
+        shell = _make_shell()
+        shell.conn.dir.return_value = [_entry("Startup-Sequence")]
+        first = shell._dir_cache.get_matches(shell.conn, "S:", "st")
+        assert first == [("Startup-Sequence", False)]
+        assert shell._dir_cache.get_matches(shell.conn, "S:", "st") is first
+        shell._dir_cache.invalidate()
+        assert shell._dir_cache.get_matches(
+            shell.conn, "S:", "st") is not first
+
+
 # ---------------------------------------------------------------------------
 # Shell command tests (mock-based)
 # ---------------------------------------------------------------------------
@@ -544,10 +822,15 @@ def _make_shell():
     shell.port = 6800
     shell.timeout = 30
     shell.conn = mock.MagicMock()
+    shell.conn.peer_closed.return_value = False
     shell.cw = ColorWriter(force_color=False)
     shell.cwd = "SYS:"
     shell._dir_cache = _DirCache()
     shell._editor = None
+    shell._sys_verified = None
+    shell._cmd_cache = {}
+    shell._readline = None
+    shell._paste_echo = collections.deque()
     return shell
 
 
@@ -611,12 +894,12 @@ class TestDoFind:
 
     def test_find_name_pattern(self, capsys):
         shell = _make_shell()
-        shell.conn.dir.return_value = [
+        shell.conn.iter_dir.return_value = iter([
             _entry("readme.txt"),
             _entry("icon.info"),
             _entry("notes.txt"),
             _entry("sub", "DIR", 0),
-        ]
+        ])
         shell.do_find("SYS: *.info")
         out = capsys.readouterr().out
         assert "icon.info" in out
@@ -624,11 +907,11 @@ class TestDoFind:
 
     def test_find_type_file(self, capsys):
         shell = _make_shell()
-        shell.conn.dir.return_value = [
+        shell.conn.iter_dir.return_value = iter([
             _entry("readme.txt"),
             _entry("sub", "DIR", 0),
             _entry("sub/note.txt"),
-        ]
+        ])
         shell.do_find("SYS: -type f *")
         out = capsys.readouterr().out
         assert "readme.txt" in out
@@ -640,11 +923,11 @@ class TestDoFind:
 
     def test_find_type_dir(self, capsys):
         shell = _make_shell()
-        shell.conn.dir.return_value = [
+        shell.conn.iter_dir.return_value = iter([
             _entry("readme.txt"),
             _entry("sub", "DIR", 0),
             _entry("sub/note.txt"),
-        ]
+        ])
         shell.do_find("SYS: -type d *")
         out = capsys.readouterr().out
         assert "sub" in out
@@ -652,14 +935,20 @@ class TestDoFind:
 
     def test_find_no_matches(self, capsys):
         shell = _make_shell()
-        shell.conn.dir.return_value = [
+        shell.conn.iter_dir.return_value = iter([
             _entry("readme.txt"),
             _entry("notes.txt"),
-        ]
+        ])
         shell.do_find("SYS: *.nonexistent")
         out = capsys.readouterr().out
         assert out.strip() == ""
 
+    def test_find_dir_error(self, capsys):
+        shell = _make_shell()
+        shell.conn.iter_dir.side_effect = NotFoundError("Object not found")
+        shell.do_find("NoSuch: *")
+        assert "Object not found" in capsys.readouterr().out
+
 
 class TestDoDu:
     """Tests for do_du shell command."""
@@ -703,6 +992,11 @@ class TestDoDu:
         assert "M" in out or "K" in out
 
 
+def _serve_reads(shell, *datas):
+    """Make conn.read_many yield datas in turn for the paths asked for."""
+    shell.conn.read_many.side_effect = lambda paths: zip(paths, datas)
+
+
 class TestDoGrep:
     """Tests for do_grep shell command."""
 
@@ -712,10 +1006,8 @@ class TestDoGrep:
             _entry("file1.txt"),
             _entry("file2.txt"),
         ]
-        shell.conn.read.side_effect = [
-            b"hello world\ngoodbye\n",
-            b"nothing here\nhello again\n",
-        ]
+        _serve_reads(shell, b"hello world\ngoodbye\n",
+                     b"nothing here\nhello again\n")
         shell.do_grep("-r hello SYS:")
         out = capsys.readouterr().out
         assert "hello world" in out
@@ -726,7 +1018,7 @@ class TestDoGrep:
         shell.conn.dir.return_value = [
             _entry("test.txt"),
         ]
-        shell.conn.read.return_value = b"Hello World\nhello world\nHELLO\n"
+        _serve_reads(shell, b"Hello World\nhello world\nHELLO\n")
         shell.do_grep("-ri HELLO SYS:")
         out = capsys.readouterr().out
         assert out.count("\n") >= 3  # all 3 lines match
@@ -736,7 +1028,7 @@ class TestDoGrep:
         shell.conn.dir.return_value = [
             _entry("test.txt"),
         ]
-        shell.conn.read.return_value = b"alpha\nbeta\ngamma\nbeta again\n"
+        _serve_reads(shell, b"alpha\nbeta\ngamma\nbeta again\n")
         shell.do_grep("-rn beta SYS:")
         out = capsys.readouterr().out
         assert "2:" in out
@@ -747,7 +1039,7 @@ class TestDoGrep:
         shell.conn.dir.return_value = [
             _entry("test.txt"),
         ]
-        shell.conn.read.return_value = b"hello\nworld\nhello again\n"
+        _serve_reads(shell, b"hello\nworld\nhello again\n")
         shell.do_grep("-rc hello SYS:")
         out = capsys.readouterr().out
         assert "2" in out
@@ -758,10 +1050,7 @@ class TestDoGrep:
             _entry("match.txt"),
             _entry("nomatch.txt"),
         ]
-        shell.conn.read.side_effect = [
-            b"hello world\n",
-            b"nothing here\n",
-        ]
+        _serve_reads(shell, b"hello world\n", b"nothing here\n")
         shell.do_grep("-rl hello SYS:")
         out = capsys.readouterr().out
         assert "match.txt" in out
@@ -772,12 +1061,42 @@ class TestDoGrep:
         shell.conn.dir.return_value = [
             _entry("test.txt"),
         ]
-        shell.conn.read.return_value = b"error: broke\nwarning: check\ninfo: ok\n"
+        _serve_reads(shell, b"error: broke\nwarning: check\ninfo: ok\n")
         shell.do_grep("-rE 'error|warn' SYS:")
         out = capsys.readouterr().out
         assert "error" in out
         assert "warn" in out
 
+    def test_grep_recursive_read_error(self, capsys):
+        shell = _make_shell()
+        shell.conn.dir.return_value = [
+            _entry("locked.txt"),
+            _entry("open.txt"),
+        ]
+        _serve_reads(shell, NotFoundError("Object not found"),
+                     b"hello\n")
+        shell.do_grep("-r hello SYS:")
+        out = capsys.readouterr().out
+        assert "Object not found" in out
+        assert "open.txt:hello" in out
+
+    def test_grep_recursive_protocol_error_drops_connection(self, capsys):
+        shell = _make_shell()
+        shell.conn.dir.return_value = [_entry("a.txt"), _entry("b.txt")]
+
+        def read_many(paths):
+            yield "SYS:a.txt", b"hello\n"
+            # read_many() has closed the connection with READs queued
+            shell.conn.peer_closed.return_value = True
+            raise ProtocolError("Expected OK, got: 'GARBAGE'")
+
+        shell.conn.read_many.side_effect = read_many
+        shell.do_grep("-r hello SYS:")
+        out = capsys.readouterr().out
+        assert "a.txt:hello" in out
+        assert "Protocol error" in out
+        assert shell.conn is None
+
     def test_grep_single_file(self, capsys):
         shell = _make_shell()
         shell.conn.read.return_value = b"hello world\ngoodbye\n"
@@ -813,6 +1132,16 @@ class TestDoLs:
         assert "file1.txt" in out
         assert "1234" in out or "rwed" in out
 
+    def test_ls_columns_no_trailing_padding(self, capsys):
+        shell = _make_shell()
+        shell.conn.dir.return_value = [
+            _entry(name) for name in ("a", "bb", "ccc", "dddd", "e")]
+        with mock.patch("shutil.get_terminal_size",
+                        return_value=os.terminal_size((20, 24))):
+            shell.do_ls("SYS:")
+        lines = capsys.readouterr().out.splitlines()
+        assert lines == ["a     ccc   e", "bb    dddd"]
+
     def test_ls_recursive(self, capsys):
         shell = _make_shell()
         shell.conn.dir.return_value = [
@@ -890,6 +1219,24 @@ class TestDoCd:
         shell.do_cd("")
         assert shell.cwd == "SYS:"
 
+    def test_cd_no_args_stats_sys_once(self, capsys):
+        shell = _make_shell()
+        shell.conn.stat.return_value = {
+            "type": "DIR", "name": "SYS", "size": 0,
+            "protection": "00", "datestamp": "2026-01-01 12:00:00",
+        }
+        shell.do_cd("")
+        shell.cwd = "Work:"
+        shell.do_cd("")
+        assert shell.cwd == "SYS:"
+        shell.conn.stat.assert_called_once_with("SYS:")
+        # A new connection has to confirm SYS: again
+        shell.conn = mock.MagicMock()
+        shell.conn.peer_closed.return_value = False
+        shell.conn.stat.return_value = {"type": "DIR"}
+        shell.do_cd("")
+        shell.conn.stat.assert_called_once_with("SYS:")
+
 
 class TestDoCp:
     """Tests for do_cp shell command."""
@@ -919,6 +1266,211 @@ class TestDoCp:
             "RAM:a.txt", "RAM:b.txt", noclone=True, noreplace=True)
 
 
+class TestTableCommands:
+    """Tests for the column layout of the system listing commands."""
+
+    def test_tasks_columns(self, capsys):
+        shell = _make_shell()
+        shell.conn.tasks.return_value = [
+            {"name": "input.device", "type": "TASK", "priority": 20,
+             "state": "waiting", "stacksize": 4096},
+            {"name": "Shell", "type": "PROCESS", "priority": -1,
+             "state": "ready", "stacksize": 65536},
+        ]
+        shell.do_tasks("")
+        assert capsys.readouterr().out.splitlines() == [
+            "NAME          TYPE     PRI  STATE    STACK",
+            "input.device  TASK      20  waiting   4096",
+            "Shell         PROCESS   -1  ready    65536",
+        ]
+
+    def test_ps_columns(self, capsys):
+        shell = _make_shell()
+        shell.conn.proclist.return_value = [
+            {"id": 1, "command": "wait 5", "status": "running",
+             "rc": None},
+            {"id": 12, "command": "list", "status": "exited", "rc": 0},
+        ]
+        shell.do_ps("")
+        assert capsys.readouterr().out.splitlines() == [
+            "ID  COMMAND  STATUS   RC",
+            "1   wait 5   running  - ",
+            "12  list     exited   0 ",
+        ]
+
+    def test_repeat_query_reuses_result(self, capsys):
+        shell = _make_shell()
+        shell.conn.devices.return_value = [
+            {"name": "timer.device", "version": "40.1"}]
+        shell.do_devices("")
+        shell.do_devices("")
+        shell.conn.devices.assert_called_once()
+        first, second = capsys.readouterr().out.split("NAME")[1:]
+        assert first == second
+
+    def test_file_change_clears_volume_cache(self):
+        shell = _make_shell()
+        shell.conn.volumes.return_value = []
+        shell.do_volumes("")
+        shell.do_rm("RAM:old.txt")
+        shell.do_volumes("")
+        assert shell.conn.volumes.call_count == 2
+
+    def test_rm_through_assign_clears_dir_cache(self):
+        shell = _make_shell()
+        shell.conn.volumes.return_value = [{"name": "Workbench"}]
+        shell.conn.dir.return_value = []
+        shell._dir_cache.get(shell.conn, "Workbench:S")
+        shell.do_rm("Workbench:C/old")
+        shell._dir_cache.get(shell.conn, "Workbench:S")
+        assert shell.conn.dir.call_count == 1
+        shell.do_rm("C:old")
+        shell._dir_cache.get(shell.conn, "Workbench:S")
+        assert shell.conn.dir.call_count == 2
+        shell.conn.volumes.assert_called_once_with()
+
+    def test_state_change_clears_query_cache(self):
+        shell = _make_shell()
+        shell.conn.proclist.return_value = []
+        shell.do_ps("")
+        shell.do_kill("1")
+        shell.do_ps("")
+        assert shell.conn.proclist.call_count == 2
+
+
+class TestPaste:
+    """Tests for splitting pasted input in precmd."""
+
+    def test_multiline_input_is_queued(self, capsys):
+        shell = _make_shell()
+        assert shell.precmd("ls\ncd RAM:\n") == "ls"
+        assert shell.cmdqueue == ["cd RAM:"]
+        # Already displayed by readline, so not echoed again
+        assert shell.precmd(shell.cmdqueue.pop(0)) == "cd RAM:"
+        assert capsys.readouterr().out == ""
+
+    def test_pending_terminal_input_is_drained(self, capsys):
+        shell = _make_shell()
+        shell.prompt = "amiga> "
+        shell._readline = mock.MagicMock()
+        stdin = mock.MagicMock()
+        stdin.isatty.return_value = True
+        stdin.fileno.return_value = 0
+        stdin.encoding = "utf-8"
+        with mock.patch("sys.stdin", stdin), \
+                mock.patch("amigactl.shell.select.select",
+                           side_effect=[([0], [], []), ([], [], [])]), \
+                mock.patch("amigactl.shell.os.read",
+                           return_value=b"cd RAM:\rdir\rpar") as read:
+            assert shell.precmd("ls") == "ls"
+        read.assert_called_once_with(0, 1024)
+        assert shell.cmdqueue == ["cd RAM:", "dir"]
+        shell._readline.set_pre_input_hook.assert_called_once()
+
+        shell._readline = None
+        assert shell.precmd(shell.cmdqueue.pop(0)) == "cd RAM:"
+        assert capsys.readouterr().out == "amiga> cd RAM:\n"
+
+    def test_eof_passes_through(self):
+        shell = _make_shell()
+        assert shell.precmd("EOF") == "EOF"
+        assert shell.cmdqueue == []
+
+
+class TestDoWatch:
+    """Tests for do_watch shell command."""
+
+    def test_frame_written_at_once(self, capsys):
+        shell = _make_shell()
+        shell.conn.version.return_value = "amigactld 1.0"
+        with mock.patch("amigactl.shell.time.sleep",
+                        side_effect=KeyboardInterrupt):
+            shell.do_watch("-n 0.5 version")
+        out = capsys.readouterr().out
+        assert out == ("\033[2J\033[HEvery 0.5s: version\n\n"
+                       "amigactld 1.0\n\n")
+
+    def test_stdout_restored_on_interrupt(self):
+        shell = _make_shell()
+        stdout = sys.stdout
+        with mock.patch.object(shell, "do_ps",
+                               side_effect=KeyboardInterrupt) as do_ps:
+            shell.do_watch("ps -x")
+        do_ps.assert_called_once_with("-x")
+        assert sys.stdout is stdout
+
+    def test_frames_not_served_from_query_cache(self):
+        shell = _make_shell()
+        shell.conn.tasks.return_value = [
+            {"name": "input.device", "type": "task", "priority": 20,
+             "state": "waiting", "stacksize": 4096}]
+        with mock.patch("amigactl.shell.time.sleep",
+                        side_effect=[None, KeyboardInterrupt]):
+            shell.do_watch("-n 0.5 tasks")
+        assert shell.conn.tasks.call_count == 2
+
+    def test_unknown_command_goes_to_default(self):
+        shell = _make_shell()
+        with mock.patch.object(shell, "default",
+                               side_effect=KeyboardInterrupt) as default:
+            shell.do_watch("nosuch arg")
+        default.assert_called_once_with("nosuch arg")
+
+
+class TestProcessControl:
+    """Tests for do_signal and do_kill."""
+
+    def test_signal_single_id(self, capsys):
+        shell = _make_shell()
+        shell.do_signal("3 CTRL_D")
+        shell.conn.signal.assert_called_once_with(3, "CTRL_D")
+        assert "Signal sent." in capsys.readouterr().out
+
+    def test_signal_batches_ids(self, capsys):
+        shell = _make_shell()
+        shell.conn.signal_many.return_value = [None, None]
+        shell.do_signal("1 2 CTRL_E")
+        shell.conn.signal_many.assert_called_once_with([1, 2], "CTRL_E")
+        shell.conn.signal.assert_not_called()
+        out = capsys.readouterr().out
+        assert "Signal sent to 1." in out
+        assert "Signal sent to 2." in out
+
+    def test_kill_batch_reports_each_id(self, capsys):
+        shell = _make_shell()
+        shell.conn.kill_many.return_value = [
+            None, NotFoundError("Process not found")]
+        shell.do_kill("4 9")
+        shell.conn.kill_many.assert_called_once_with([4, 9])
+        out = capsys.readouterr().out
+        assert "Process 4 terminated." in out
+        assert "Error: 9: Process not found" in out
+
+    def test_kill_rejects_non_integer(self, capsys):
+        shell = _make_shell()
+        shell.do_kill("1 x")
+        shell.conn.kill_many.assert_not_called()
+        assert "ID must be an integer" in capsys.readouterr().out
+
+
+class TestDoDiff:
+    """Tests for do_diff shell command."""
+
+    def test_identical_files(self, capsys):
+        shell = _make_shell()
+        shell.conn.read.side_effect = [b"a\nb\n", b"a\nb\n"]
+        shell.do_diff("RAM:one RAM:two")
+        assert capsys.readouterr().out == "Files are identical\n"
+
+    def test_changed_line(self, capsys):
+        shell = _make_shell()
+        shell.conn.read.side_effect = [b"a\nb\n", b"a\nc\n"]
+        shell.do_diff("RAM:one RAM:two")
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[:2] == ["--- RAM:one", "+++ RAM:two"]
+        assert lines[3:] == [" a", "-b", "+c"]
+
+
 class TestDoCat:
     """Tests for do_cat shell command."""
 
@@ -927,6 +1479,7 @@ class TestDoCat:
         shell.conn.read.return_value = b"hello"
         with mock.patch("sys.stdout") as mock_stdout:
             mock_stdout.buffer = mock.MagicMock()
+            mock_stdout.fileno.side_effect = io.UnsupportedOperation
             shell.do_cat("SYS:test.txt")
         shell.conn.read.assert_called_once()
         args, kwargs = shell.conn.read.call_args
@@ -937,6 +1490,7 @@ class TestDoCat:
         shell.conn.read.return_value = b"data"
         with mock.patch("sys.stdout") as mock_stdout:
             mock_stdout.buffer = mock.MagicMock()
+            mock_stdout.fileno.side_effect = io.UnsupportedOperation
             shell.do_cat("--offset 10 SYS:test.txt")
         args, kwargs = shell.conn.read.call_args
         assert kwargs.get("offset") == 10 or (len(args) > 1 and args[1] == 10)
@@ -946,6 +1500,7 @@ class TestDoCat:
         shell.conn.read.return_value = b"data"
         with mock.patch("sys.stdout") as mock_stdout:
             mock_stdout.buffer = mock.MagicMock()
+            mock_stdout.fileno.side_effect = io.UnsupportedOperation
             shell.do_cat("--length 5 SYS:test.txt")
         args, kwargs = shell.conn.read.call_args
         assert kwargs.get("length") == 5 or (len(args) > 2 and args[2] == 5)
@@ -955,11 +1510,53 @@ class TestDoCat:
         shell.conn.read.return_value = b"data"
         with mock.patch("sys.stdout") as mock_stdout:
             mock_stdout.buffer = mock.MagicMock()
+            mock_stdout.fileno.side_effect = io.UnsupportedOperation
             shell.do_cat("--offset 10 --length 5 SYS:test.txt")
         args, kwargs = shell.conn.read.call_args
         assert kwargs.get("offset") == 10 or (len(args) > 1 and args[1] == 10)
         assert kwargs.get("length") == 5 or (len(args) > 2 and args[2] == 5)
 
+    def test_cat_writes_to_stdout_fd(self):
+        shell = _make_shell()
+        shell.conn.read.return_value = b"\x00binary\xff"
+        rfd, wfd = os.pipe()
+        try:
+            with mock.patch("sys.stdout") as mock_stdout:
+                mock_stdout.fileno.return_value = wfd
+                shell.do_cat("SYS:test.bin")
+            mock_stdout.flush.assert_called_once()
+            mock_stdout.buffer.write.assert_not_called()
+            assert os.read(rfd, 100) == b"\x00binary\xff"
+        finally:
+            os.close(rfd)
+            os.close(wfd)
+
+
+class TestDoTouch:
+    """Tests for do_touch shell command."""
+
+    def test_touch_existing_sets_date(self, capsys):
+        shell = _make_shell()
+        shell.conn.setdate.return_value = "2026-02-19 12:00:00"
+        shell.do_touch("RAM:test.txt")
+        assert "datestamp=2026-02-19 12:00:00" in capsys.readouterr().out
+        shell.conn.write.assert_not_called()
+
+    def test_touch_missing_creates_file(self, capsys):
+        shell = _make_shell()
+        shell.conn.setdate.side_effect = NotFoundError("not found")
+        shell.do_touch("RAM:new.txt")
+        shell.conn.write.assert_called_once_with("RAM:new.txt", b"")
+        assert "Created RAM:new.txt" in capsys.readouterr().out
+
+    def test_touch_create_failure_reports_error(self, capsys):
+        shell = _make_shell()
+        shell.conn.setdate.side_effect = NotFoundError("not found")
+        shell.conn.write.side_effect = OSError("link down")
+        shell.do_touch("RAM:new.txt")
+        assert "Connection error: link down" in capsys.readouterr().out
+        assert shell.conn is None
+
 
 # ---------------------------------------------------------------------------
 # _complete_local_path()
@@ -1158,13 +1755,48 @@ class TestCompleteAppendDelegation:
 # Tilde expansion in file transfer commands
 # ---------------------------------------------------------------------------
 
+def _stream_bytes(data):
+    """Return a read_stream side effect that writes data to the file."""
+    def read_stream(path, fileobj):
+        fileobj.write(data)
+        return len(data)
+    return read_stream
+
+
+class TestDoGet:
+    """Tests for do_get streaming download."""
+
+    def test_get_streams_to_file(self, tmp_path, capsys):
+        shell = _make_shell()
+        shell.conn.read_stream.side_effect = _stream_bytes(b"abc")
+        dest = tmp_path / "out.bin"
+        shell.do_get("SYS:file.bin {}".format(dest))
+        assert dest.read_bytes() == b"abc"
+        assert "Downloaded 3 bytes" in capsys.readouterr().out
+
+    def test_get_error_not_reported_as_download(self, tmp_path, capsys):
+        shell = _make_shell()
+        shell.conn.read_stream.side_effect = OSError("link down")
+        dest = tmp_path / "out.bin"
+        shell.do_get("SYS:missing {}".format(dest))
+        assert "Downloaded" not in capsys.readouterr().out
+
+    def test_get_to_device(self, capsys):
+        """LOCAL is opened in place, so /dev/null works as a sink."""
+        shell = _make_shell()
+        shell.conn.read_stream.side_effect = _stream_bytes(b"abc")
+        shell.do_get("SYS:file.bin {}".format(os.devnull))
+        assert "Downloaded 3 bytes to {}".format(os.devnull) in \
+            capsys.readouterr().out
+
+
 class TestTildeExpansion:
     """Verify that ~/ in local paths is expanded before open() is called."""
 
     def test_get_expands_tilde_in_local_path(self, tmp_path):
         """get REMOTE ~/local should expand ~ before writing."""
         shell = _make_shell()
-        shell.conn.read.return_value = b"file data"
+        shell.conn.read_stream.side_effect = _stream_bytes(b"file data")
         dest = tmp_path / "downloaded.txt"
         with mock.patch("os.path.expanduser",
                          return_value=str(dest)) as exp:
@@ -1175,7 +1807,7 @@ class TestTildeExpansion:
     def test_get_one_arg_no_tilde_expansion(self):
         """get REMOTE (1-arg form) derives local name from remote; no tilde."""
         shell = _make_shell()
-        shell.conn.read.return_value = b"data"
+        shell.conn.read_stream.side_effect = _stream_bytes(b"data")
         with mock.patch("os.path.expanduser") as exp, \
              mock.patch("builtins.open", mock.mock_open()):
             shell.do_get("SYS:file.txt")
@@ -1186,37 +1818,152 @@ class TestTildeExpansion:
         shell = _make_shell()
         src = tmp_path / "upload.txt"
         src.write_bytes(b"upload data")
-        shell.conn.write.return_value = 11
+        sent = []
+
+        def write_stream(path, fileobj):
+            sent.append((path, fileobj.read()))
+            return len(sent[-1][1])
+
+        shell.conn.write_stream.side_effect = write_stream
         with mock.patch("os.path.expanduser",
                          return_value=str(src)) as exp:
             shell.do_put("~/upload.txt")
             exp.assert_called_once_with("~/upload.txt")
-        shell.conn.write.assert_called_once()
-        args = shell.conn.write.call_args[0]
         # Remote name should be derived from expanded basename
-        assert args[0] == "SYS:upload.txt"
-        assert args[1] == b"upload data"
+        assert sent == [("SYS:upload.txt", b"upload data")]
 
     def test_put_expands_tilde_two_args(self, tmp_path):
         """put ~/file.txt REMOTE should expand ~ before reading."""
         shell = _make_shell()
         src = tmp_path / "upload.txt"
         src.write_bytes(b"upload data")
-        shell.conn.write.return_value = 11
+        shell.conn.write_stream.return_value = 11
         with mock.patch("os.path.expanduser",
                          return_value=str(src)) as exp:
             shell.do_put("~/upload.txt RAM:dest.txt")
             exp.assert_called_once_with("~/upload.txt")
-        shell.conn.write.assert_called_once()
+        shell.conn.write_stream.assert_called_once()
 
     def test_append_expands_tilde(self, tmp_path):
         """append ~/file.txt REMOTE should expand ~ before reading."""
         shell = _make_shell()
         src = tmp_path / "extra.txt"
         src.write_bytes(b"extra data")
-        shell.conn.append.return_value = 10
+        shell.conn.append_stream.return_value = 10
         with mock.patch("os.path.expanduser",
                          return_value=str(src)) as exp:
             shell.do_append("~/extra.txt RAM:log.txt")
             exp.assert_called_once_with("~/extra.txt")
-        shell.conn.append.assert_called_once()
+        shell.conn.append_stream.assert_called_once()
+
+
+class TestRunReconnect:
+    """Tests for _run's silent reconnect after a dropped connection."""
+
+    def test_retries_once_on_new_connection(self):
+        class _DeadConn:
+            _sock = mock.MagicMock()
+
+            def peer_closed(self):
+                return False
+
+            def stat(self, path):
+                raise ConnectionLostError("Connection closed by server")
+
+        shell = _make_shell()
+        old_conn = shell.conn = _DeadConn()
+        old_sock = old_conn._sock
+        new_conn = mock.MagicMock()
+        new_conn.stat.return_value = {"type": "dir"}
+        with mock.patch("amigactl.shell.AmigaConnection",
+                        return_value=new_conn):
+            result = shell._run(old_conn.stat, "SYS:")
+        assert result == {"type": "dir"}
+        assert shell.conn is new_conn
+        new_conn.connect.assert_called_once()
+        new_conn.stat.assert_called_once_with("SYS:")
+        # Closed directly, without a QUIT round trip
+        old_sock.close.assert_called_once_with()
+        assert old_conn._sock is None
+
+    def test_closed_peer_reconnects_before_sending(self):
+        class _ClosedConn:
+            _sock = None
+
+            def peer_closed(self):
+                return True
+
+            def append(self, path, data):
+                raise AssertionError("sent on a closed connection")
+
+        shell = _make_shell()
+        old_conn = shell.conn = _ClosedConn()
+        new_conn = mock.MagicMock()
+        with mock.patch("amigactl.shell.AmigaConnection",
+                        return_value=new_conn):
+            shell._run(old_conn.append, "RAM:log", b"x")
+        new_conn.append.assert_called_once_with("RAM:log", b"x")
+
+    def test_mutating_command_not_retried(self, capsys):
+        shell = _make_shell()
+        shell.conn.append.side_effect = ConnectionLostError(
+            "Connection closed by server")
+        with mock.patch("amigactl.shell.AmigaConnection") as new_conn:
+            result = shell._run(shell.conn.append, "RAM:log", b"x")
+        new_conn.assert_not_called()
+        assert result is None
+        assert shell.conn is None
+        assert "Connection error" in capsys.readouterr().out
+
+    def test_closure_not_retried(self):
+        shell = _make_shell()
+        calls = []
+
+        def search():
+            calls.append(1)
+            print("match")
+            raise ConnectionLostError("Connection closed by server")
+
+        with mock.patch("amigactl.shell.AmigaConnection") as new_conn:
+            shell._run(search)
+        new_conn.assert_not_called()
+        assert calls == [1]
+
+    def test_reconnect_failure_marks_disconnected(self, capsys):
+        shell = _make_shell()
+        shell.conn.stat.side_effect = BrokenPipeError("pipe")
+        new_conn = mock.MagicMock()
+        new_conn.connect.side_effect = ConnectionRefusedError("refused")
+        with mock.patch("amigactl.shell.AmigaConnection",
+                        return_value=new_conn):
+            result = shell._run(shell.conn.stat, "SYS:")
+        assert result is None
+        assert shell.conn is None
+        assert "Connection error" in capsys.readouterr().out
+
+
+class TestColorDefaultCache:
+    """Tests for the cached default color detection."""
+
+    def test_detection_runs_once(self):
+        with mock.patch("amigactl.colors._color_supported", None), \
+             mock.patch("amigactl.colors._supports_color",
+                        return_value=True) as detect:
+            assert ColorWriter().enabled is True
+            assert ColorWriter().enabled is True
+        detect.assert_called_once_with()
+
+    def test_force_color_skips_detection(self):
+        with mock.patch("amigactl.colors._color_supported", None), \
+             mock.patch("amigactl.colors._supports_color") as detect:
+            assert ColorWriter(force_color=False).enabled is False
+        detect.assert_not_called()
+
+    def test_refresh_redetects(self):
+        with mock.patch("amigactl.colors._color_supported", None), \
+             mock.patch("amigactl.colors._supports_color",
+                        side_effect=[True, False]) as detect:
+            assert ColorWriter().enabled is True
+            assert refresh_color_support() is False
+            assert ColorWriter().enabled is False
+        assert detect.call_count == 2
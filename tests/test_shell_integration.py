@@ -9,6 +9,7 @@ Usage:
 """
 
 import cmd
+import collections
 import socket
 
 import pytest
@@ -48,6 +49,10 @@ def shell(conn):
     s.cwd = None
     s._dir_cache = _DirCache()
     s._editor = None
+    s._sys_verified = None
+    s._cmd_cache = {}
+    s._readline = None
+    s._paste_echo = collections.deque()
     return s
 
 
@@ -7,6 +7,7 @@ feature.
 """
 
 import cmd
+import collections
 from unittest import mock
 
 import pytest
@@ -47,10 +48,15 @@ def _make_shell():
     shell.port = 6800
     shell.timeout = 30
     shell.conn = mock.MagicMock()
+    shell.conn.peer_closed.return_value = False
     shell.cw = ColorWriter(force_color=False)
     shell.cwd = "SYS:"
     shell._dir_cache = _DirCache()
     shell._editor = None
+    shell._sys_verified = None
+    shell._cmd_cache = {}
+    shell._readline = None
+    shell._paste_echo = collections.deque()
     return shell
 
 